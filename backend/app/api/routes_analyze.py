@@ -1,13 +1,22 @@
 # backend/app/api/routes_analyze.py
 # api routes for disclosure analysis (transparency scoring endpoints)
-from fastapi import APIRouter
+import hashlib
+
+from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel, Field
 from typing import Optional, Literal
 
-from app.services.scoring_service import score_disclosure
+from app.core.metrics import request_mode
+from app.services.admission import admit
+from app.services.scoring_service import score_disclosure, uses_ml_model
+from app.services.single_flight import SingleFlight
+from app.services.upload_service import UploadError, analyze_upload
 
 router = APIRouter()
 
+# concurrent requests with the same text / claim / mode share one computation
+ANALYZE_FLIGHT = SingleFlight("analyze_text")
+
 class AnalyzeRequest(BaseModel):
     # input text to analyze
     text: str
@@ -21,9 +30,45 @@ class AnalyzeRequest(BaseModel):
 @router.post("/analyze_text")
 def analyze_text(req: AnalyzeRequest):
     # endpoint: score a free-text disclosure and return structured result
-    result = score_disclosure(
-        text=req.text,
-        claimed_impact_co2_tons=req.claimed_impact_co2_tons,
-        mode=req.mode,
+    # the transparency model is loaded once per process, so the inputs
+    # alone identify the computation
+    key = (
+        hashlib.sha256(req.text.encode("utf-8", "surrogatepass")).hexdigest(),
+        req.claimed_impact_co2_tons,
+        req.mode,
     )
-    return result
+    with request_mode(req.mode):
+        return ANALYZE_FLIGHT.do(key, lambda: _analyze_text(req))
+
+
+def _analyze_text(req: AnalyzeRequest):
+    # ml / blend go through admission control and may be downgraded
+    with admit("analyze_text", req.mode, uses_ml_model(req.mode)) as admission:
+        result = score_disclosure(
+            text=req.text,
+            claimed_impact_co2_tons=req.claimed_impact_co2_tons,
+            mode=admission.mode,
+        )
+    return admission.annotate(result)
+
+
+@router.post("/analyze_file")
+async def analyze_file(
+    request: Request,
+    claimed_impact_co2_tons: Optional[float] = None,
+    amount_issued_usd: Optional[float] = None,
+    mode: Literal["rule", "ml", "blend"] = Query("rule", description="Transparency scoring mode"),
+):
+    # endpoint: score an uploaded disclosure (raw body, text/plain or
+    # application/pdf, chunked transfer ok) without buffering it as one string
+    try:
+        with request_mode(mode):
+            return await analyze_upload(
+                request.stream(),
+                request.headers.get("content-type"),
+                claimed_impact_co2_tons=claimed_impact_co2_tons,
+                amount_issued_usd=amount_issued_usd,
+                mode=mode,
+            )
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
@@ -1,43 +1,91 @@
-from typing import List, Dict, Any
-from fastapi import APIRouter, HTTPException
-
-from app.data.load_bonds import list_bonds, get_bond
-from app.services.scoring_service import score_disclosure
-from app.services.impact_ml_service import predict_ml_impact_for_bond
+from typing import List, Dict, Any, Literal
+from fastapi import APIRouter, HTTPException, Request
+
+from app.core.metrics import request_mode
+from app.data.disclosure_features import BOND_DISCLOSURES_CSV, FEATURES_PATH
+from app.data.load_bonds import BONDS_CSV, list_bonds_frame, get_bond
+from app.services.disclosure_service import bond_disclosure
+from app.services.fast_json import columns_body, dumps, encoded_response, records_body
+from app.services.admission import admit
+from app.services.scoring_service import score_disclosure, uses_ml_model
+from app.services.impact_ml_service import ml_impact_available, predict_ml_impact_for_bond
+from app.services.single_flight import SingleFlight, file_versions
 from app.ml.impact_gap_model import predict_impact_gap
 
 router = APIRouter()
 
+# concurrent requests for the same bond detail share one computation
+BOND_DETAIL_FLIGHT = SingleFlight("bond_detail")
+
 # bonds endpoints: list and detail, with computed scores and predictions
 
 @router.get("/bonds", response_model=List[Dict[str, Any]])
-def get_bonds(limit: int = 100):
-    return list_bonds(limit=limit)
+def get_bonds(
+    request: Request,
+    limit: int = 100,
+    format: Literal["records", "columnar"] = "records",
+):
+    # encoded straight from the dataframe columns (NaN -> null), compressed
+    # per Accept-Encoding; `format=columnar` returns {"columns", "data"}
+    df = list_bonds_frame(limit=limit)
+    body = columns_body(df) if format == "columnar" else records_body(df)
+    return encoded_response(body, request)
 
 
 @router.get("/bonds/{bond_id}", response_model=Dict[str, Any])
-def get_bond_detail(bond_id: str):
+def get_bond_detail(
+    bond_id: str, request: Request, mode: Literal["rule", "ml", "blend"] = "rule"
+):
+    # keyed by data file versions too, so a rebuilt bonds.csv / feature store
+    # / mapping never joins a computation started before it. model artifacts
+    # are loaded once per process, so their files are not part of the key
+    key = (bond_id, mode, file_versions(BONDS_CSV, FEATURES_PATH, BOND_DISCLOSURES_CSV))
+    with request_mode(mode):
+        detail = BOND_DETAIL_FLIGHT.do(key, lambda: _bond_detail(bond_id, mode))
+        # encoded here so serialization shows up as its own stage in /metrics
+        return encoded_response(dumps(detail), request)
+
+
+def _bond_detail(bond_id: str, mode: str) -> Dict[str, Any]:
     bond = get_bond(bond_id)
     if not bond:
         raise HTTPException(status_code=404, detail="Bond not found")
 
-    # for phase 1, just use the use_of_proceeds text as the "disclosure"
+    # score the bond's mapped disclosure from precomputed features (feature
+    # store); bonds without one fall back to the use_of_proceeds text
+    disclosure = bond_disclosure(bond_id)
     disclosure_text = str(bond.get("use_of_proceeds") or "")
     claimed = bond.get("claimed_impact_co2_tons")
 
-    # score_disclosure currently accepts: text, claimed_impact_co2_tons, mode
-    # pass only supported args to avoid unexpected keyword errors
-    scores = score_disclosure(
-        text=disclosure_text,
-        claimed_impact_co2_tons=claimed,
-        amount_issued_usd=bond.get("amount_issued_usd"),
-    )
-
-    ml_impact = predict_ml_impact_for_bond(
-        text=str(bond.get("disclosure_text") or bond.get("use_of_proceeds") or ""),
-        amount_issued_usd=bond.get("amount_issued_usd"),
-        project_category=bond.get("project_category"),
-    )
+    # the ml impact model runs in every mode, so any request may queue for a
+    # model slot; under overload it is answered from the rule models only
+    uses_ml = uses_ml_model(mode) or ml_impact_available()
+    with admit("bond_detail", mode, uses_ml) as admission:
+        scores = score_disclosure(
+            text=disclosure_text,
+            claimed_impact_co2_tons=claimed,
+            amount_issued_usd=bond.get("amount_issued_usd"),
+            mode=admission.mode,
+            precomputed=disclosure.features if disclosure is not None else None,
+        )
+        ml_impact = None
+        if not admission.degraded:
+            ml_impact = predict_ml_impact_for_bond(
+                text=str(bond.get("disclosure_text") or bond.get("use_of_proceeds") or ""),
+                amount_issued_usd=bond.get("amount_issued_usd"),
+                project_category=bond.get("project_category"),
+                embedding=disclosure.features.impact_embedding if disclosure is not None else None,
+                embedding_model=(
+                    disclosure.features.impact_text_model if disclosure is not None else None
+                ),
+            )
+    admission.annotate(scores)
+    if disclosure is not None:
+        scores["disclosure"] = {
+            "doc_id": disclosure.doc_id,
+            "match_method": disclosure.method,
+            "issuer_match": disclosure.issuer_match,
+        }
 
     # map ML impact output to the UI-friendly shape expected by frontend
     if ml_impact is not None:
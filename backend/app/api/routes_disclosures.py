@@ -0,0 +1,71 @@
+# backend/app/api/routes_disclosures.py
+# api routes for stored disclosures: section index, section text, section scoring
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+
+from app.data.disclosure_index import SECTION_NAMES, list_documents, read_sections
+from app.ml.sections import DEFAULT_SECTIONS
+from app.services.admission import admit
+from app.services.disclosure_service import NoSectionsError, document_summary, score_sections
+from app.services.scoring_service import uses_ml_model
+
+router = APIRouter()
+
+
+class SectionScoreRequest(BaseModel):
+    # sections to score (default: use_of_proceeds, reporting, external_review)
+    sections: Optional[List[str]] = Field(None, min_length=1)
+    # scoring mode: rule | ml | blend
+    mode: Literal["rule", "ml", "blend"] = "rule"
+    claimed_impact_co2_tons: Optional[float] = None
+    amount_issued_usd: Optional[float] = None
+
+
+def _check_sections(names: Optional[List[str]]) -> None:
+    unknown = sorted(set(names or []) - set(SECTION_NAMES))
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown sections: {', '.join(unknown)} (known: {', '.join(SECTION_NAMES)})",
+        )
+
+
+@router.get("/disclosures")
+def get_disclosures():
+    """stored disclosures with their page count and detected sections."""
+    return [document_summary(doc_id) for doc_id in list_documents()]
+
+
+@router.get("/disclosures/{doc_id}/sections")
+def get_disclosure_sections(
+    doc_id: str,
+    names: Optional[List[str]] = Query(None, description="Sections to return (default: all)"),
+):
+    """text of the requested sections only, read by byte offset from the index."""
+    _check_sections(names)
+    sections = read_sections(doc_id, names)
+    if sections is None:
+        raise HTTPException(status_code=404, detail="Disclosure not found")
+    return {"doc_id": doc_id, "sections": sections}
+
+
+@router.post("/disclosures/{doc_id}/score")
+def post_disclosure_score(doc_id: str, req: SectionScoreRequest):
+    """transparency / impact scoring restricted to the selected sections."""
+    _check_sections(req.sections)
+    try:
+        with admit("disclosure_score", req.mode, uses_ml_model(req.mode)) as admission:
+            result = score_sections(
+                doc_id,
+                names=req.sections or list(DEFAULT_SECTIONS),
+                mode=admission.mode,
+                claimed_impact_co2_tons=req.claimed_impact_co2_tons,
+                amount_issued_usd=req.amount_issued_usd,
+            )
+    except NoSectionsError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Disclosure not found")
+    return admission.annotate(result)
@@ -1,30 +1,170 @@
-from fastapi import APIRouter, HTTPException
-from app.services.market_data_csv import get_price_series, get_series_summary
+from datetime import date
+from email.utils import parsedate_to_datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from app.services.fast_json import dumps, encoded_etag, encoded_response, response_encoding
+from app.services.market_analytics import DEFAULT_ROLLING_WINDOW, get_series_analytics
+from app.services.market_data_csv import get_aligned_series, get_series_summary
+from app.services.market_payloads import SeriesPayload, arrow_available, get_series_payload
 
 router = APIRouter()
 
+DEFAULT_DAYS = 365
+
+
+def _resolve_days(
+    days: Optional[int], start: Optional[date], end: Optional[date]
+) -> Optional[int]:
+    # keep the one-year default only when no explicit date window is given
+    if days is None and start is None and end is None:
+        return DEFAULT_DAYS
+    return days
+
+
+@router.get("/market")
+def get_market_aligned(
+    request: Request,
+    symbols: str = Query(..., description="Comma-separated symbols"),
+    days: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    ffill: bool = True,
+    rebase: bool = False,
+):
+    """
+    Return several symbols on a single date axis, one column per symbol,
+    optionally forward-filled and rebased to 100.
+    """
+    requested = [s.strip() for s in symbols.split(",") if s.strip()]
+    if not requested:
+        raise HTTPException(status_code=422, detail="No symbols given")
+
+    days = _resolve_days(days, start, end)
+    aligned = get_aligned_series(
+        requested, days=days, start=start, end=end, ffill=ffill, rebase=rebase, as_arrays=True
+    )
+    if not aligned["symbols"]:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No market data found for symbols {requested}",
+        )
+    return encoded_response(dumps(aligned), request)
+
+
+def _not_modified(request: Request, payload: SeriesPayload) -> bool:
+    # If-None-Match wins over If-Modified-Since (RFC 9110)
+    inm = request.headers.get("if-none-match")
+    if inm is not None:
+        tags = [t.strip() for t in inm.split(",")]
+        # any encoding of the body validates (gzip / zstd etags are suffixed)
+        etags = {encoded_etag(payload.etag, enc) for enc in (None, "gzip", "zstd")}
+        return "*" in tags or any(t.removeprefix("W/") in etags for t in tags)
+    ims = request.headers.get("if-modified-since")
+    if ims is not None:
+        try:
+            return parsedate_to_datetime(payload.last_modified) <= parsedate_to_datetime(ims)
+        except (TypeError, ValueError):
+            return False
+    return False
+
 
 @router.get("/market/{symbol}")
-def get_market_prices(symbol: str, days: int = 365):
+def get_market_prices(
+    symbol: str,
+    request: Request,
+    days: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    max_points: Optional[int] = Query(None, ge=4),
+    method: Literal["lttb", "minmax"] = "lttb",
+    format: Literal["records", "columnar", "f64", "arrow"] = "records",
+):
     """
     Return price series for a symbol from market_series.csv,
-    in lightweight-charts format.
+    in lightweight-charts format. `max_points` downsamples long windows
+    server-side (lttb or min/max buckets).
+
+    `format=columnar` returns {"time": [...], "value": [...]}, `format=f64`
+    returns little-endian float64 times followed by values (length in
+    X-Series-Length) and `format=arrow` an Arrow IPC stream. bodies are
+    pre-serialized and served with ETag / Last-Modified for 304s.
+    """
+    if format == "arrow" and not arrow_available():
+        raise HTTPException(status_code=406, detail="Arrow format requires pyarrow")
+
+    days = _resolve_days(days, start, end)
+    payload = get_series_payload(
+        symbol,
+        days=days,
+        start=start,
+        end=end,
+        max_points=max_points,
+        method=method,
+        fmt=format,
+    )
+    if payload is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No market data found for symbol '{symbol}'",
+        )
+
+    headers = {
+        "ETag": payload.etag,
+        "Last-Modified": payload.last_modified,
+        "Cache-Control": "no-cache",
+        "X-Series-Length": str(payload.n_points),
+        "Vary": "Accept-Encoding",
+    }
+    if _not_modified(request, payload):
+        # same validator the client got with the 200 for this encoding
+        headers["ETag"] = encoded_etag(payload.etag, response_encoding(payload.body, request))
+        return Response(status_code=304, headers=headers)
+    return encoded_response(payload.body, request, media_type=payload.media_type, headers=headers)
+
+
+@router.get("/market/{symbol}/analytics")
+def get_market_analytics(
+    symbol: str,
+    days: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    rolling_window: int = Query(DEFAULT_ROLLING_WINDOW, ge=2, le=252),
+    include_rolling_series: bool = False,
+):
+    """
+    Return window returns, volatility, max drawdown and ytm-ytw spread,
+    answered from precomputed prefix sums / drawdown tree.
     """
-    series = get_price_series(symbol, days=days)
-    if not series:
+    days = _resolve_days(days, start, end)
+    analytics = get_series_analytics(
+        symbol,
+        days=days,
+        start=start,
+        end=end,
+        rolling_window=rolling_window,
+        include_rolling_series=include_rolling_series,
+    )
+    if analytics is None:
         raise HTTPException(
             status_code=404,
             detail=f"No market data found for symbol '{symbol}'",
         )
-    return series
+    return analytics
 
 
 @router.get("/market/series/{symbol}")
-def get_market_series_summary(symbol: str, days: int = 365):
+def get_market_series_summary(
+    symbol: str,
+    days: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+):
     """
     Return a small summary including latest price and yields.
     """
-    summary = get_series_summary(symbol, days=days)
+    days = _resolve_days(days, start, end)
+    summary = get_series_summary(symbol, days=days, start=start, end=end)
     if summary["latest"] is None:
         raise HTTPException(
             status_code=404,
@@ -0,0 +1,13 @@
+# backend/app/api/routes_metrics.py
+# prometheus scrape endpoint (mounted at the root, not under /api)
+from fastapi import APIRouter, Response
+
+from app.services.metrics_service import CONTENT_TYPE, render_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """per-stage latency histograms, model / cache counters and data gauges."""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
@@ -0,0 +1,113 @@
+# backend/app/api/routes_portfolio.py
+# api routes for portfolio-level aggregation over many bonds
+import math
+from typing import Dict, List, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel, Field
+
+from app.core.metrics import request_mode
+from app.services.fast_json import dumps, encoded_response
+from app.services.portfolio_service import (
+    DEFAULT_N_SAMPLES,
+    DEFAULT_TIME_BUDGET_MS,
+    MAX_N_SAMPLES,
+    analyze_portfolio,
+    optimize_portfolio,
+)
+
+router = APIRouter()
+
+
+class PortfolioAnalyzeRequest(BaseModel):
+    # bond ids as returned by /api/bonds
+    bond_ids: List[str] = Field(..., min_length=1)
+    # relative holding weights (same order as bond_ids); >= 0, one positive
+    weights: Optional[List[float]] = None
+    # holding notionals in USD (>= 0, one positive); takes precedence over weights
+    notionals_usd: Optional[List[float]] = None
+    # impact estimator: rule | ml (ml falls back to rule when unavailable)
+    mode: Literal["rule", "ml"] = "rule"
+    # monte-carlo draws and latency budget for the simulation
+    n_samples: int = Field(DEFAULT_N_SAMPLES, ge=1, le=MAX_N_SAMPLES)
+    time_budget_ms: float = Field(DEFAULT_TIME_BUDGET_MS, gt=0)
+    seed: Optional[int] = None
+
+
+class PortfolioOptimizeRequest(BaseModel):
+    # total amount to allocate (USD)
+    budget_usd: float = Field(..., gt=0)
+    # impact estimator: rule | ml (ml falls back to rule when unavailable)
+    mode: Literal["rule", "ml"] = "rule"
+    # candidate universe filter
+    countries: Optional[List[str]] = None
+    source_datasets: Optional[List[str]] = None
+    min_transparency_score: Optional[float] = Field(None, ge=0, le=100)
+    # constraints (shares are fractions of the budget)
+    max_country_share: Optional[float] = Field(None, gt=0, le=1)
+    country_caps: Optional[Dict[str, float]] = None
+    max_source_share: Optional[float] = Field(None, gt=0, le=1)
+    max_position_usd: Optional[float] = Field(None, gt=0)
+    max_share_of_issue: float = Field(1.0, gt=0, le=1)
+
+
+@router.post("/portfolio/analyze")
+def post_portfolio_analyze(req: PortfolioAnalyzeRequest, request: Request):
+    """
+    Holdings-weighted transparency and total expected tCO2 with
+    monte-carlo confidence bands for a list of bonds.
+    """
+    for name in ("weights", "notionals_usd"):
+        values = getattr(req, name)
+        if values is None:
+            continue
+        if len(values) != len(req.bond_ids):
+            raise HTTPException(
+                status_code=422,
+                detail=f"'{name}' must have the same length as 'bond_ids'",
+            )
+        if not all(math.isfinite(v) and v >= 0 for v in values):
+            raise HTTPException(
+                status_code=422,
+                detail=f"'{name}' must be finite and >= 0",
+            )
+        if not any(v > 0 for v in values):
+            raise HTTPException(
+                status_code=422,
+                detail=f"'{name}' must contain at least one positive value",
+            )
+
+    with request_mode(req.mode):
+        result = analyze_portfolio(
+            bond_ids=req.bond_ids,
+            weights=req.weights,
+            notionals_usd=req.notionals_usd,
+            mode=req.mode,
+            n_samples=req.n_samples,
+            time_budget_ms=req.time_budget_ms,
+            seed=req.seed,
+        )
+        return encoded_response(dumps(result), request)
+
+
+@router.post("/portfolio/optimize")
+def post_portfolio_optimize(req: PortfolioOptimizeRequest, request: Request):
+    """
+    Budget-constrained allocation that maximizes expected avoided tCO2
+    over the filtered bond universe.
+    """
+    with request_mode(req.mode):
+        result = optimize_portfolio(
+            budget_usd=req.budget_usd,
+            mode=req.mode,
+            countries=req.countries,
+            source_datasets=req.source_datasets,
+            min_transparency_score=req.min_transparency_score,
+            max_country_share=req.max_country_share,
+            country_caps=req.country_caps,
+            max_source_share=req.max_source_share,
+            max_position_usd=req.max_position_usd,
+            max_share_of_issue=req.max_share_of_issue,
+        )
+        # one row per holding: encoded with fast_json, compressed when accepted
+        return encoded_response(dumps(result), request)
@@ -0,0 +1,249 @@
+# backend/app/core/metrics.py
+"""
+In-process metrics in the Prometheus text format (no client library, works
+offline).
+
+    STAGE_SECONDS   histogram per pipeline stage and scoring mode, fed by
+                    `stage(...)` / `@timed(...)` on the hot path
+    MODEL_LOADS     counter per loaded model artifact / encoder
+    DATA_ROWS       gauge of rows per loaded data snapshot, set by loaders
+
+the mode label comes from `request_mode(mode)`, which routes enter once per
+request; stages outside one are labelled "none". recording is a
+perf_counter pair plus a bisect under a lock. values only derived at scrape
+time (cache info, admission stats, file sizes) are added by collectors, see
+app/services/metrics_service.py.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# seconds; covers sub-ms feature extraction up to multi-second encoder runs
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# (labels, value) samples of one metric family
+Samples = List[Tuple[Dict[str, str], float]]
+# (name, type, help, samples) from a scrape-time collector
+Family = Tuple[str, str, str, Samples]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+    return "{" + inner + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if value != value:
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def format_family(name: str, kind: str, help_text: str, samples: Samples) -> List[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines.extend(f"{name}{_labels(labels)} {_number(v)}" for labels, v in samples)
+    return lines
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        samples = [(dict(zip(self.labelnames, k)), v) for k, v in items]
+        return format_family(self.name, self.kind, self.help, samples)
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][i] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, (list(s[0]), s[1])) for k, s in self._series.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total) in items:
+            labels = dict(zip(self.labelnames, key))
+            running = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                running += n
+                le = _labels({**labels, "le": _number(bound)})
+                lines.append(f"{self.name}_bucket{le} {running}")
+            lines.append(f"{self.name}_sum{_labels(labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(labels)} {running}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(name, help_text, labelnames, buckets))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        """`collector()` yields (name, type, help, samples) at every scrape."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, kind, help_text, samples in collector():
+                lines.extend(format_family(name, kind, help_text, samples))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "green_prism_stage_seconds",
+    "Time spent in a scoring / data pipeline stage.",
+    ("stage", "mode"),
+)
+MODEL_LOADS = REGISTRY.counter(
+    "green_prism_model_loads_total",
+    "Model artifacts and encoders loaded into the process.",
+    ("model",),
+)
+DATA_ROWS = REGISTRY.gauge(
+    "green_prism_data_rows",
+    "Rows in the most recently loaded snapshot of a dataset.",
+    ("dataset",),
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "green_prism_request_seconds",
+    "HTTP request latency by route template and status code.",
+    ("route", "method", "status"),
+)
+
+_MODE: ContextVar[str] = ContextVar("green_prism_mode", default="none")
+
+
+@contextmanager
+def request_mode(mode: Optional[str]) -> Iterator[None]:
+    """label stages recorded inside the block with scoring `mode`."""
+    token = _MODE.set(mode or "none")
+    try:
+        yield
+    finally:
+        _MODE.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """record the block's wall time under stage `name` and the current mode."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - t0, stage=name, mode=_MODE.get())
+
+
+def timed(name: str):
+    """decorator form of `stage(name)`."""
+
+    def wrap(fn):
+        @wraps(fn)
+        def inner(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                STAGE_SECONDS.observe(time.perf_counter() - t0, stage=name, mode=_MODE.get())
+
+        return inner
+
+    return wrap
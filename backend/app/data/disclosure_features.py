@@ -0,0 +1,213 @@
+# backend/app/data/disclosure_features.py
+"""
+Precomputed disclosure feature store and bond -> disclosure mapping.
+
+both files are written offline by scripts/build_disclosure_features.py (run
+at the end of scripts/extract_disclosure_text.py):
+
+    app/data/disclosure_features.npz
+        doc_ids            (n,)    doc id (= .txt stem)
+        text_sha256        (n,)    hash of the .txt the row was computed from
+        text_features      (n, 9)  TextFeatures fields, TEXT_FEATURE_FIELDS order
+        handcrafted        (n, H)  features.handcrafted_features
+        evidence_bytes     (m,)    utf-8 json of each row's features.Evidence
+                                   (captured by the same extraction pass,
+                                   explanation snippets), concatenated
+        evidence_offsets   (n+1,)  row i is evidence_bytes[off[i]:off[i+1]];
+                                   no fixed-width padding to the longest row
+        transparency_emb   (n, D)  transparency encoder CLS embedding (optional)
+        impact_emb         (n, E)  impact sentence embedding (optional)
+        meta               ()      json: schema + encoder names the embeddings
+                                   were computed with
+
+    app/data/bond_disclosures.csv
+        bond_id, doc_id, rank, method, issuer_match
+
+rank 0 is the bond's primary disclosure. the API only indexes into these
+arrays, so no text is read or processed on the request path.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.metrics import DATA_ROWS
+from app.ml.features import Evidence, TextFeatures
+
+DATA_DIR = Path(__file__).resolve().parent
+FEATURES_PATH = DATA_DIR / "disclosure_features.npz"
+BOND_DISCLOSURES_CSV = DATA_DIR / "bond_disclosures.csv"
+
+FEATURE_STORE_SCHEMA = 3
+TEXT_FEATURE_FIELDS = tuple(f.name for f in fields(TextFeatures))
+_BOOL_FIELDS = {f.name for f in fields(TextFeatures) if f.type in ("bool", bool)}
+_INT_FIELDS = {f.name for f in fields(TextFeatures) if f.type in ("int", int)}
+
+
+@dataclass
+class DisclosureFeatures:
+    doc_id: str
+    text_features: TextFeatures
+    handcrafted: np.ndarray
+    transparency_embedding: Optional[np.ndarray]
+    impact_embedding: Optional[np.ndarray]
+    transparency_model: Optional[str]
+    impact_text_model: Optional[str]
+    evidence: Optional[Evidence] = None
+
+
+def text_features_to_row(feats: TextFeatures) -> List[float]:
+    return [float(getattr(feats, name)) for name in TEXT_FEATURE_FIELDS]
+
+
+def text_features_from_row(row: np.ndarray) -> TextFeatures:
+    values: Dict[str, Any] = {}
+    for name, v in zip(TEXT_FEATURE_FIELDS, row.tolist()):
+        if name in _BOOL_FIELDS:
+            values[name] = bool(v)
+        elif name in _INT_FIELDS:
+            values[name] = int(v)
+        else:
+            values[name] = float(v)
+    return TextFeatures(**values)
+
+
+# ------------------------------
+# feature store
+# ------------------------------
+
+@dataclass
+class FeatureStore:
+    doc_ids: np.ndarray
+    text_sha256: np.ndarray
+    text_features: np.ndarray
+    handcrafted: np.ndarray
+    evidence_bytes: np.ndarray
+    evidence_offsets: np.ndarray
+    transparency_emb: Optional[np.ndarray]
+    impact_emb: Optional[np.ndarray]
+    meta: Dict[str, Any]
+    row_of: Dict[str, int]
+
+    def evidence_json(self, i: int) -> str:
+        lo, hi = self.evidence_offsets[i], self.evidence_offsets[i + 1]
+        return self.evidence_bytes[lo:hi].tobytes().decode("utf-8")
+
+
+@lru_cache(maxsize=2)
+def _load_feature_store_at(mtime_ns: int) -> Optional[FeatureStore]:
+    with np.load(FEATURES_PATH, allow_pickle=False) as data:
+        arrays = {k: data[k] for k in data.files}
+    meta = json.loads(str(arrays.pop("meta")))
+    if meta.get("schema") != FEATURE_STORE_SCHEMA:
+        # written by an older build; rebuilt from scratch on the next run
+        return None
+    doc_ids = arrays["doc_ids"]
+    DATA_ROWS.set(len(doc_ids), dataset="disclosure_features")
+    return FeatureStore(
+        doc_ids=doc_ids,
+        text_sha256=arrays["text_sha256"],
+        text_features=arrays["text_features"],
+        handcrafted=arrays["handcrafted"],
+        evidence_bytes=arrays["evidence_bytes"],
+        evidence_offsets=arrays["evidence_offsets"],
+        transparency_emb=arrays.get("transparency_emb"),
+        impact_emb=arrays.get("impact_emb"),
+        meta=meta,
+        row_of={str(d): i for i, d in enumerate(doc_ids.tolist())},
+    )
+
+
+def load_feature_store() -> Optional[FeatureStore]:
+    """the feature store (cached per file mtime), or None when not built."""
+    try:
+        mtime_ns = FEATURES_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
+    return _load_feature_store_at(mtime_ns)
+
+
+def get_doc_features(doc_id: str) -> Optional[DisclosureFeatures]:
+    store = load_feature_store()
+    if store is None or doc_id not in store.row_of:
+        return None
+    i = store.row_of[doc_id]
+    return DisclosureFeatures(
+        doc_id=doc_id,
+        text_features=text_features_from_row(store.text_features[i]),
+        handcrafted=store.handcrafted[i],
+        transparency_embedding=(
+            store.transparency_emb[i] if store.transparency_emb is not None else None
+        ),
+        impact_embedding=store.impact_emb[i] if store.impact_emb is not None else None,
+        transparency_model=store.meta.get("transparency_model"),
+        impact_text_model=store.meta.get("impact_text_model"),
+        evidence=Evidence.from_dict(json.loads(store.evidence_json(i))),
+    )
+
+
+def save_feature_store(
+    path: Path,
+    doc_ids: List[str],
+    text_sha256: List[str],
+    text_features: np.ndarray,
+    handcrafted: np.ndarray,
+    evidence: List[str],
+    transparency_emb: Optional[np.ndarray],
+    impact_emb: Optional[np.ndarray],
+    meta: Dict[str, Any],
+) -> None:
+    encoded = [e.encode("utf-8") for e in evidence]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    arrays: Dict[str, np.ndarray] = {
+        "doc_ids": np.array(doc_ids, dtype=str),
+        "text_sha256": np.array(text_sha256, dtype=str),
+        "text_features": np.asarray(text_features, dtype=np.float64),
+        "handcrafted": np.asarray(handcrafted, dtype=np.float32),
+        "evidence_bytes": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "evidence_offsets": offsets,
+        "meta": np.array(json.dumps({"schema": FEATURE_STORE_SCHEMA, **meta})),
+    }
+    if transparency_emb is not None:
+        arrays["transparency_emb"] = np.asarray(transparency_emb, dtype=np.float32)
+    if impact_emb is not None:
+        arrays["impact_emb"] = np.asarray(impact_emb, dtype=np.float32)
+    # uncompressed, so loading is a plain read
+    tmp = path.with_name(f".{path.name}.tmp")
+    with tmp.open("wb") as f:
+        np.savez(f, **arrays)
+    tmp.replace(path)
+
+
+# ------------------------------
+# bond -> disclosure mapping
+# ------------------------------
+
+@lru_cache(maxsize=2)
+def _load_bond_disclosures_at(mtime_ns: int) -> Dict[str, List[Dict[str, Any]]]:
+    df = pd.read_csv(BOND_DISCLOSURES_CSV, dtype={"bond_id": str, "doc_id": str})
+    df = df.sort_values(["bond_id", "rank"], kind="stable")
+    DATA_ROWS.set(len(df), dataset="bond_disclosures")
+    out: Dict[str, List[Dict[str, Any]]] = {}
+    for row in df.itertuples(index=False):
+        out.setdefault(row.bond_id, []).append(
+            {"doc_id": row.doc_id, "method": row.method, "issuer_match": row.issuer_match}
+        )
+    return out
+
+
+def disclosures_for_bond(bond_id: str) -> List[Dict[str, Any]]:
+    """mapped disclosures for `bond_id`, primary first ([] when unmapped)."""
+    try:
+        mtime_ns = BOND_DISCLOSURES_CSV.stat().st_mtime_ns
+    except OSError:
+        return []
+    return _load_bond_disclosures_at(mtime_ns).get(bond_id, [])
@@ -0,0 +1,157 @@
+# backend/app/data/disclosure_index.py
+"""
+Page- and section-indexed access to the extracted disclosure texts.
+
+every app/data/disclosures_texts/<doc_id>.txt has a compact sidecar index in
+app/data/disclosures_index/<doc_id>.json, written by
+scripts/extract_disclosure_text.py:
+
+    {
+      "schema": 1,
+      "doc_id": "...",
+      "bytes": 12345,
+      "pages": [0, 1830, ...] | null,      # utf-8 byte offset of each page
+      "sections": [["use_of_proceeds", start, end, page], ...]
+    }
+
+offsets are utf-8 byte offsets into the .txt, so a section is served with a
+seek + read of just its bytes; the rest of the document is never read or
+tokenized. `pages` is null for texts indexed after the fact (no page
+boundaries survive in the .txt).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from bisect import bisect_right
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.ml.sections import SECTION_HEADINGS, detect_sections
+
+DATA_DIR = Path(__file__).resolve().parent
+TEXT_DIR = DATA_DIR / "disclosures_texts"
+INDEX_DIR = DATA_DIR / "disclosures_index"
+
+INDEX_SCHEMA = 1
+SECTION_NAMES = tuple(SECTION_HEADINGS)
+
+
+# ------------------------------
+# building (offline, called by the extractor)
+# ------------------------------
+
+def _byte_offsets(text: str, char_offsets: Iterable[int]) -> Dict[int, int]:
+    """char offset -> utf-8 byte offset, encoding each stretch of text once."""
+    out: Dict[int, int] = {}
+    prev_char = prev_byte = 0
+    for off in sorted(set(char_offsets)):
+        prev_byte += len(text[prev_char:off].encode("utf-8"))
+        prev_char = off
+        out[off] = prev_byte
+    return out
+
+
+def build_index(doc_id: str, text: str, page_starts: Optional[List[int]] = None) -> Dict[str, Any]:
+    """
+    index for `text` (exactly as written to the .txt). `page_starts` are char
+    offsets of each PDF page in `text`, when known.
+    """
+    sections = detect_sections(text)
+    offsets = [len(text)] + (page_starts or [])
+    for s in sections:
+        offsets += [s.start, s.end]
+    to_bytes = _byte_offsets(text, offsets)
+
+    pages = [to_bytes[p] for p in page_starts] if page_starts is not None else None
+    entries = []
+    for s in sections:
+        start = to_bytes[s.start]
+        page = bisect_right(pages, start) if pages else None
+        entries.append([s.name, start, to_bytes[s.end], page])
+
+    return {
+        "schema": INDEX_SCHEMA,
+        "doc_id": doc_id,
+        "bytes": to_bytes[len(text)],
+        "pages": pages,
+        "sections": entries,
+    }
+
+
+def index_path(doc_id: str, index_dir: Path = INDEX_DIR) -> Path:
+    return index_dir / f"{doc_id}.json"
+
+
+def write_index(index: Dict[str, Any], index_dir: Path = INDEX_DIR) -> Path:
+    index_dir.mkdir(parents=True, exist_ok=True)
+    path = index_path(index["doc_id"], index_dir)
+    payload = json.dumps(index, separators=(",", ":"))
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(index_dir))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_name, path)
+    finally:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+    return path
+
+
+# ------------------------------
+# loading
+# ------------------------------
+
+def _valid_doc_id(doc_id: str) -> bool:
+    # doc ids are file stems; refuse anything that could leave the data dirs
+    return bool(doc_id) and not doc_id.startswith(".") and Path(doc_id).name == doc_id
+
+
+def list_documents() -> List[str]:
+    if not INDEX_DIR.exists():
+        return []
+    return sorted(p.stem for p in INDEX_DIR.glob("*.json") if not p.name.startswith("."))
+
+
+@lru_cache(maxsize=256)
+def _load_index_at(doc_id: str, mtime_ns: int) -> Dict[str, Any]:
+    return json.loads(index_path(doc_id).read_text(encoding="utf-8"))
+
+
+def get_index(doc_id: str) -> Optional[Dict[str, Any]]:
+    """parsed index for `doc_id` (cached per index file mtime), or None."""
+    if not _valid_doc_id(doc_id):
+        return None
+    try:
+        mtime_ns = index_path(doc_id).stat().st_mtime_ns
+    except OSError:
+        return None
+    return _load_index_at(doc_id, mtime_ns)
+
+
+def read_sections(doc_id: str, names: Optional[Iterable[str]] = None) -> Optional[Dict[str, str]]:
+    """
+    section name -> text for the requested sections (all spans of a section
+    joined with a blank line). sections the document doesn't have are left
+    out. returns None when the document is unknown or its .txt is gone.
+    """
+    index = get_index(doc_id)
+    if index is None:
+        return None
+    wanted = set(names) if names is not None else set(SECTION_NAMES)
+
+    spans = [(name, start, end) for name, start, end, _ in index["sections"] if name in wanted]
+    parts: Dict[str, List[str]] = {}
+    try:
+        f = open(TEXT_DIR / f"{doc_id}.txt", "rb")
+    except FileNotFoundError:
+        # index left behind by a removed text
+        return None
+    with f:
+        for name, start, end in sorted(spans, key=lambda s: s[1]):
+            f.seek(start)
+            parts.setdefault(name, []).append(f.read(end - start).decode("utf-8"))
+    return {name: "\n\n".join(parts[name]) for name in SECTION_NAMES if name in parts}
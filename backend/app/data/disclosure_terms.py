@@ -0,0 +1,173 @@
+# backend/app/data/disclosure_terms.py
+"""
+Inverted term index over the disclosure texts, used to re-score only the
+documents a keyword rule change can affect.
+
+stored at app/data/.build_cache/disclosures/terms.json (rebuildable, not
+committed):
+
+    docs      doc_id -> sha256 of the .txt the postings were built from
+    vocab     token -> [doc_id, ...]; every \\w+ token of the lowercased,
+              cleaned text
+    rules     keyword_rules() the keyword postings were computed under
+    keywords  "category\\tkeyword" -> [doc_id, ...]; documents with at least
+              one match of the keyword (same substring matching as
+              extract_text_features)
+
+keywords match as substrings, so a document can only contain a keyword if
+every \\w+ piece of it occurs inside one of the document's tokens. for a new
+keyword the vocab gives that (small) candidate set; for a removed keyword the
+exact postings are used.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+DATA_DIR = Path(__file__).resolve().parent
+TERMS_INDEX_PATH = DATA_DIR / ".build_cache" / "disclosures" / "terms.json"
+TERMS_INDEX_SCHEMA = 1
+
+_TOKEN_RE = re.compile(r"\w+")
+
+Term = Tuple[str, str]  # (category, keyword)
+
+
+def _term_key(term: Term) -> str:
+    return f"{term[0]}\t{term[1]}"
+
+
+def rule_terms(rules: Dict[str, List[str]]) -> Set[Term]:
+    return {(name, kw) for name, kws in rules.items() for kw in kws}
+
+
+class TermIndex:
+    def __init__(self, path: Path = TERMS_INDEX_PATH):
+        self.path = path
+        self.docs: Dict[str, str] = {}
+        self.vocab: Dict[str, Set[str]] = {}
+        self.rules: Optional[Dict[str, List[str]]] = None
+        self.keywords: Dict[Term, Set[str]] = {}
+
+    @classmethod
+    def load(cls, path: Path = TERMS_INDEX_PATH) -> "TermIndex":
+        index = cls(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return index
+        if data.get("schema") != TERMS_INDEX_SCHEMA:
+            return index
+        index.docs = data["docs"]
+        index.vocab = {tok: set(ids) for tok, ids in data["vocab"].items()}
+        index.rules = data["rules"]
+        index.keywords = {
+            tuple(key.split("\t", 1)): set(ids) for key, ids in data["keywords"].items()
+        }
+        return index
+
+    def save(self) -> None:
+        data = {
+            "schema": TERMS_INDEX_SCHEMA,
+            "docs": self.docs,
+            "rules": self.rules,
+            "vocab": {tok: sorted(ids) for tok, ids in sorted(self.vocab.items())},
+            "keywords": {
+                _term_key(t): sorted(ids) for t, ids in sorted(self.keywords.items())
+            },
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(self.path)
+
+    # -- maintenance --
+
+    def _drop_doc(self, doc_id: str) -> None:
+        for postings in (self.vocab, self.keywords):
+            empty = []
+            for key, ids in postings.items():
+                ids.discard(doc_id)
+                if not ids:
+                    empty.append(key)
+            for key in empty:
+                del postings[key]
+        self.docs.pop(doc_id, None)
+
+    def stale_docs(self, hashes: Dict[str, str]) -> Set[str]:
+        """documents that are new or changed since they were indexed."""
+        return {d for d, h in hashes.items() if self.docs.get(d) != h}
+
+    def remove_missing(self, doc_ids: Iterable[str]) -> None:
+        keep = set(doc_ids)
+        for d in [d for d in self.docs if d not in keep]:
+            self._drop_doc(d)
+
+    def add_doc(self, doc_id: str, sha256: str, cleaned: str, rules: Dict[str, List[str]]) -> None:
+        """(re)index one document: its tokens and which rule keywords it contains."""
+        self._drop_doc(doc_id)
+        lowered = cleaned.lower()
+        for tok in set(_TOKEN_RE.findall(lowered)):
+            self.vocab.setdefault(tok, set()).add(doc_id)
+        for term in rule_terms(rules):
+            if term[1] in lowered:
+                self.keywords.setdefault(term, set()).add(doc_id)
+        self.docs[doc_id] = sha256
+
+    # -- rule changes --
+
+    def candidates(self, keyword: str) -> Set[str]:
+        """documents that may contain `keyword` (a superset of the true set)."""
+        pieces = _TOKEN_RE.findall(keyword.lower())
+        if not pieces:
+            return set(self.docs)
+        out: Optional[Set[str]] = None
+        for piece in sorted(set(pieces), key=len, reverse=True):
+            docs: Set[str] = set()
+            for tok, ids in self.vocab.items():
+                if piece in tok:
+                    docs |= ids
+            out = docs if out is None else out & docs
+            if not out:
+                break
+        return out or set()
+
+    def affected_docs(self, rules: Dict[str, List[str]]) -> Tuple[Set[str], int, int]:
+        """
+        documents whose keyword hits can differ between the indexed rules and
+        `rules`, plus the number of added and removed terms. every document is
+        affected when the index has no rules recorded yet.
+        """
+        if self.rules is None:
+            return set(self.docs), 0, 0
+        old, new = rule_terms(self.rules), rule_terms(rules)
+        added, removed = new - old, old - new
+        touched: Set[str] = set()
+        for term in removed:
+            touched |= self.keywords.get(term, set())
+        for term in added:
+            touched |= self.candidates(term[1])
+        return touched, len(added), len(removed)
+
+    def apply_rules(self, rules: Dict[str, List[str]], rescored: Dict[str, str]) -> None:
+        """
+        switch the keyword postings to `rules`. `rescored` (doc_id -> cleaned
+        text) must cover affected_docs(rules): only those are re-checked,
+        everyone else cannot contain an added term.
+        """
+        live = rule_terms(rules)
+        for term in [t for t in self.keywords if t not in live]:
+            del self.keywords[term]
+        for doc_id, cleaned in rescored.items():
+            lowered = cleaned.lower()
+            for term in live:
+                ids = self.keywords.setdefault(term, set())
+                if term[1] in lowered:
+                    ids.add(doc_id)
+                else:
+                    ids.discard(doc_id)
+        self.keywords = {t: ids for t, ids in self.keywords.items() if ids}
+        self.rules = rules
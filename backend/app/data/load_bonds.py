@@ -6,6 +6,8 @@ from pathlib import Path
 from typing import List, Dict, Any
 import pandas as pd
 
+from app.core.metrics import DATA_ROWS, stage
+
 # Use the `app/data` directory (same directory as this module) so the
 # API loads `backend/app/data/bonds.csv` rather than the top-level
 # `data/bonds.csv` in the repo root.
@@ -18,7 +20,15 @@ def load_bonds() -> pd.DataFrame:
     # read csv from app/data; return empty DataFrame when missing
     if not BONDS_CSV.exists():
         return pd.DataFrame()
-    return pd.read_csv(BONDS_CSV)
+    with stage("load_bonds"):
+        df = pd.read_csv(BONDS_CSV)
+    DATA_ROWS.set(len(df), dataset="bonds")
+    return df
+
+
+def list_bonds_frame(limit: int = 20) -> pd.DataFrame:
+    """first `limit` bonds as a DataFrame, for encoding straight from columns."""
+    return load_bonds().head(limit)
 
 
 def list_bonds(limit: int = 20) -> List[Dict[str, Any]]:
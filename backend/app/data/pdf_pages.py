@@ -0,0 +1,83 @@
+# backend/app/data/pdf_pages.py
+"""
+Bounded pypdf page extraction, shared by the offline extractor
+(scripts/extract_disclosure_text.py) and uploaded PDFs
+(services/upload_service.py).
+
+pypdf can hang or blow up on hostile / broken PDFs, so page text is pulled
+under a SIGALRM deadline per page, inside a worker process the caller can
+kill when the whole file takes too long. kept free of heavy imports: worker
+processes are spawned and import only this module. pypdf is only imported
+inside the worker, so the api starts without it (PDF uploads are refused).
+"""
+
+from __future__ import annotations
+
+import signal
+from contextlib import contextmanager
+from typing import Optional
+
+
+def pypdf_available() -> bool:
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class PageTimeout(Exception):
+    pass
+
+
+def _raise_page_timeout(signum, frame):
+    raise PageTimeout()
+
+
+@contextmanager
+def page_deadline(seconds: Optional[float]):
+    # SIGALRM based, so only usable in a process's main thread (the workers);
+    # platforms without setitimer just rely on the per-file timeout
+    if not seconds or not hasattr(signal, "setitimer"):
+        yield
+        return
+    previous = signal.signal(signal.SIGALRM, _raise_page_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def send_pages_worker(pdf_path: str, page_timeout: Optional[float], conn) -> None:
+    """
+    child process body: send ("page", text) per page ("" when the page failed
+    or timed out), then ("done", pages, failed, timed_out); ("error", message)
+    when the file can't be opened.
+    """
+    pages = failed = timed_out = 0
+    try:
+        try:
+            from pypdf import PdfReader
+
+            reader = PdfReader(pdf_path)
+            page_list = reader.pages
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+            return
+        for page in page_list:
+            pages += 1
+            try:
+                with page_deadline(page_timeout):
+                    txt = page.extract_text() or ""
+            except PageTimeout:
+                timed_out += 1
+                txt = ""
+            except Exception:
+                failed += 1
+                txt = ""
+            conn.send(("page", txt))
+        conn.send(("done", pages, failed, timed_out))
+    finally:
+        conn.close()
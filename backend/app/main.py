@@ -2,12 +2,20 @@
 FastAPI application entrypoint.
 """
 
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.api.routes_analyze import router as analyze_router
 from app.api.routes_bonds import router as bonds_router
+from app.api.routes_disclosures import router as disclosures_router
 from app.api.routes_market import router as market_router
+from app.api.routes_metrics import router as metrics_router
+from app.api.routes_portfolio import router as portfolio_router
+from app.core.metrics import REQUEST_SECONDS
+from app.services.admission import Overloaded
 
 app = FastAPI(title="Green Prism API", debug=True)
 
@@ -23,6 +31,45 @@ app.add_middleware(
 )
 
 
+def _route_label(request: Request) -> str:
+    # route template with its router prefix (/api/bonds/{bond_id}), never the
+    # raw path, so label cardinality stays bounded
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    path = request.scope.get("path", "")
+    try:
+        concrete = route.path_format.format(**request.scope.get("path_params", {}))
+    except (AttributeError, KeyError, IndexError):
+        return route.path
+    prefix = path[: len(path) - len(concrete)] if path.endswith(concrete) else ""
+    return prefix + route.path
+
+
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    # end-to-end latency per route template, next to the per-stage histograms
+    t0 = time.perf_counter()
+    response = await call_next(request)
+    REQUEST_SECONDS.observe(
+        time.perf_counter() - t0,
+        route=_route_label(request),
+        method=request.method,
+        status=str(response.status_code),
+    )
+    return response
+
+
+@app.exception_handler(Overloaded)
+def overloaded_handler(request: Request, exc: Overloaded):
+    # load shedding from app/services/admission.py: 429 (queue full) or 503
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": f"Server busy ({exc.reason}), retry later"},
+        headers={"Retry-After": str(exc.retry_after_s)},
+    )
+
+
 @app.get("/health")
 def health():
     return {"status": "ok", "app": "Green Prism API"}
@@ -30,3 +77,6 @@ def health():
 
 app.include_router(analyze_router, prefix="/api")
 app.include_router(bonds_router, prefix="/api")
+app.include_router(disclosures_router, prefix="/api")
+app.include_router(portfolio_router, prefix="/api")
+app.include_router(metrics_router)
@@ -2,17 +2,115 @@
 Map model outputs to human-readable explanations for the UI.
 """
 
-from typing import List
+import math
+from typing import List, Optional
+
+from .features import Evidence, TextFeatures
 from .transparency_model import TransparencyComponents
 
+# component -> (label, evidence categories backing it, what is missing when absent)
+COMPONENT_EVIDENCE = [
+    (
+        "use_of_proceeds_clarity",
+        "Use of proceeds clarity",
+        ("use_of_proceeds", "environmental", "numbers"),
+        "no use-of-proceeds language found",
+    ),
+    (
+        "reporting_practices",
+        "Reporting practices",
+        ("reporting", "kpi"),
+        "no reporting or KPI language found",
+    ),
+    (
+        "verification_strength",
+        "Verification strength",
+        ("verification",),
+        "no second-party opinion, external review or assurance found",
+    ),
+]
+
+CATEGORY_LABELS = {
+    "use_of_proceeds": "use of proceeds",
+    "environmental": "environmental focus",
+    "numbers": "quantified",
+    "reporting": "reporting",
+    "kpi": "kpi",
+    "verification": "verification",
+}
+
+# flag on TextFeatures that says a category matched at all
+CATEGORY_FLAGS = {
+    "use_of_proceeds": "has_use_of_proceeds",
+    "reporting": "has_reporting",
+    "kpi": "has_kpi",
+    "verification": "has_verification",
+}
+
+MAX_SNIPPETS_PER_COMPONENT = 2
+
+
+def _evidence_lines(evidence: Evidence, categories) -> List[str]:
+    lines: List[str] = []
+    for category in categories:
+        spans = evidence.for_category(category)
+        if spans:
+            span = spans[0]
+            lines.append(f"{CATEGORY_LABELS[category]}: '{span.snippet}' at char {span.start}")
+        if len(lines) >= MAX_SNIPPETS_PER_COMPONENT:
+            break
+    return lines
+
+
+def _flag_lines(feats: TextFeatures, categories) -> List[str]:
+    # precomputed features keep no offsets, only whether a category matched
+    return [
+        f"{CATEGORY_LABELS[c]} language present"
+        for c in categories
+        if c in CATEGORY_FLAGS and getattr(feats, CATEGORY_FLAGS[c])
+    ]
+
+
+def _value(v) -> Optional[float]:
+    # bond rows carry NaN for missing claims
+    if v is None or (isinstance(v, float) and math.isnan(v)):
+        return None
+    return float(v)
+
+
+def _impact_explanation(impact_result: dict) -> str:
+    claimed = _value(impact_result.get("claimed"))
+    predicted = _value(impact_result.get("predicted"))
+    uncertainty = _value(impact_result.get("uncertainty")) or 0.0
+    if predicted is None:
+        return "No impact estimate: neither a claimed impact nor an issuance amount was given."
+    estimate = f"{predicted:,.0f} ± {uncertainty:,.0f} tCO2"
+    if claimed is None:
+        return f"Predicted impact {estimate} from the issuance amount; no claim to compare."
+    gap = claimed - predicted
+    return f"Claimed {claimed:,.0f} tCO2 vs predicted {estimate} (gap {gap:,.0f} tCO2)."
+
 
 def build_explanations(
     text: str,
     components: TransparencyComponents,
     impact_result: dict,
+    evidence: Optional[Evidence] = None,
 ) -> List[str]:
-    # TODO: refine explanations later
+    """
+    one line per transparency component, citing the matched text (snippet
+    and char offset in the scored text) when `evidence` was captured during
+    feature extraction, plus one line on impact vs claims.
+    """
+    evidence = evidence if evidence is not None else components.evidence
     explanations: List[str] = []
-    explanations.append("Placeholder explanation about transparency.")
-    explanations.append("Placeholder explanation about impact vs claims.")
+    for attr, label, categories, missing in COMPONENT_EVIDENCE:
+        score = getattr(components, attr)
+        if evidence is not None:
+            found = _evidence_lines(evidence, categories)
+        else:
+            found = _flag_lines(components.raw_features, categories)
+        detail = "; ".join(found) if found else missing
+        explanations.append(f"{label} {score:.1f}/100: {detail}.")
+    explanations.append(_impact_explanation(impact_result))
     return explanations
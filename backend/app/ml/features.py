@@ -2,7 +2,11 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.metrics import timed
 
 # text feature extraction utils (keyword counts, simple density scores)
 
@@ -80,48 +84,416 @@ ENVIRONMENTAL_KEYWORDS = [
 ]
 
 
-def _count_occurrences(text: str, keywords: list[str]) -> int:
-    text_l = text.lower()
-    return sum(text_l.count(kw.lower()) for kw in keywords)
+# keyword category -> keyword list, in the order the hit counts are used
+KEYWORD_LISTS: Dict[str, List[str]] = {
+    "use_of_proceeds": USE_OF_PROCEEDS_KEYWORDS,
+    "reporting": REPORTING_KEYWORDS,
+    "verification": VERIFICATION_KEYWORDS,
+    "kpi": KPI_KEYWORDS,
+    "environmental": ENVIRONMENTAL_KEYWORDS,
+}
+
+def keyword_rules() -> Dict[str, List[str]]:
+    """the current rule configuration: category -> lowercased keywords, sorted."""
+    return {name: sorted({kw.lower() for kw in kws}) for name, kws in KEYWORD_LISTS.items()}
+
+
+_WORD_RE = re.compile(r"\w+")
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+# ------------------------------
+# evidence spans
+# ------------------------------
+
+# numbers kept as evidence: quantities with a unit, not years / addresses
+_QUANTITY_UNIT_RE = re.compile(
+    r"\s?(?:%|percent|t\b|tons?\b|tonnes?\b|tco2|mt\b|kt\b|[kmg]wh?\b|m2|m³|m3|km\b|ha\b|"
+    r"hectares?|million|billion|mn\b|bn\b)",
+    re.IGNORECASE,
+)
+
 
+@dataclass
+class EvidenceSpan:
+    category: str  # keyword category, or "numbers"
+    term: str  # the keyword / number matched
+    start: int  # char offset in the (cleaned) text the features were computed on
+    end: int
+    snippet: str  # the match with some surrounding words
+
+
+def snippet_around(text: str, start: int, end: int, context_chars: int) -> str:
+    # `context_chars` either side of the match, cut back to whole words
+    lo = max(0, start - context_chars)
+    hi = min(len(text), end + context_chars)
+    if lo > 0:
+        cut = text.find(" ", lo, start)
+        lo = cut + 1 if cut >= 0 else lo
+    if hi < len(text):
+        cut = text.rfind(" ", end, hi)
+        hi = cut if cut >= 0 else hi
+    return text[lo:hi].strip()
 
-def extract_text_features(text: str) -> TextFeatures:
+
+class Evidence:
+    """
+    capped collector for keyword / number match offsets, filled by
+    extract_text_features and StreamingFeatureExtractor during the same pass
+    that counts the matches. at most `per_term` spans per keyword and
+    `per_category` per category are kept, so capture cost does not grow with
+    the text; once a category is full the remaining matches are only counted.
+    """
+
+    def __init__(self, per_category: int = 3, per_term: int = 1, context_chars: int = 40):
+        self.per_category = per_category
+        self.per_term = per_term
+        self.context_chars = context_chars
+        self.spans: Dict[str, List[EvidenceSpan]] = {}
+        self._term_counts: Dict[tuple, int] = {}
+
+    def wants(self, category: str, term: Optional[str] = None) -> bool:
+        if len(self.spans.get(category, ())) >= self.per_category:
+            return False
+        return term is None or self._term_counts.get((category, term), 0) < self.per_term
+
+    def add(self, category: str, term: str, start: int, end: int, snippet: str) -> None:
+        self.spans.setdefault(category, []).append(
+            EvidenceSpan(category=category, term=term, start=start, end=end, snippet=snippet)
+        )
+        key = (category, term)
+        self._term_counts[key] = self._term_counts.get(key, 0) + 1
+
+    def add_from(self, category: str, term: str, start: int, end: int, text: str, offset: int = 0) -> None:
+        # match at text[start:end]; `offset` is where `text` starts in the scored text
+        self.add(
+            category, term, offset + start, offset + end,
+            snippet_around(text, start, end, self.context_chars),
+        )
+
+    def for_category(self, category: str) -> List[EvidenceSpan]:
+        # spans in document order
+        return sorted(self.spans.get(category, ()), key=lambda s: s.start)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, List[Dict[str, object]]]) -> "Evidence":
+        evidence = cls()
+        for name, spans in data.items():
+            for s in spans:
+                evidence.add(name, s["term"], s["start"], s["end"], s["snippet"])
+        return evidence
+
+    def as_dict(self) -> Dict[str, List[Dict[str, object]]]:
+        return {
+            name: [
+                {"term": s.term, "start": s.start, "end": s.end, "snippet": s.snippet}
+                for s in self.for_category(name)
+            ]
+            for name in self.spans
+        }
+
+
+def _count_occurrences(
+    text: str,
+    keywords: list[str],
+    category: Optional[str] = None,
+    evidence: Optional[Evidence] = None,
+    text_l: Optional[str] = None,
+) -> int:
+    text_l = text.lower() if text_l is None else text_l
+    if evidence is None:
+        return sum(text_l.count(kw.lower()) for kw in keywords)
+    # snippets from the original case when lowering kept the offsets
+    source = text if len(text) == len(text_l) else text_l
+    total = 0
+    for kw in keywords:
+        kw = kw.lower()
+        pos = 0
+        # first matches are located (same non-overlapping scan as str.count),
+        # the rest only counted
+        while evidence.wants(category, kw):
+            j = text_l.find(kw, pos)
+            if j < 0:
+                break
+            evidence.add_from(category, kw, j, j + len(kw), source)
+            total += 1
+            pos = j + len(kw)
+        total += text_l.count(kw, pos)
+    return total
+
+
+def _count_numbers(text: str, evidence: Optional[Evidence] = None, offset: int = 0) -> int:
+    if evidence is None:
+        return len(_NUMBER_RE.findall(text))
+    total = 0
+    pos = 0
+    for m in _NUMBER_RE.finditer(text):
+        if not evidence.wants("numbers"):
+            break
+        total += 1
+        pos = m.end()
+        term = m.group()
+        if evidence.wants("numbers", term) and _QUANTITY_UNIT_RE.match(text, m.end()):
+            evidence.add_from("numbers", term, m.start(), m.end(), text, offset)
+    return total + len(_NUMBER_RE.findall(text, pos))
+
+
+def _features_from_counts(
+    length_chars: int, length_words: int, num_numbers: int, hits: Dict[str, int]
+) -> TextFeatures:
+    # crude scores: normalize by log(length) to avoid bias for very long text
+    length_norm = max(1.0, (length_words ** 0.5))
+
+    environmental_focus_score = min(1.0, hits["environmental"] / length_norm)
+    kpi_density = min(1.0, hits["kpi"] / length_norm)
+
+    return TextFeatures(
+        length_chars=length_chars,
+        length_words=length_words,
+        num_numbers=num_numbers,
+        has_use_of_proceeds=hits["use_of_proceeds"] > 0,
+        has_reporting=hits["reporting"] > 0,
+        has_verification=hits["verification"] > 0,
+        has_kpi=hits["kpi"] > 0,
+        environmental_focus_score=environmental_focus_score,
+        kpi_density=kpi_density,
+    )
+
+
+@timed("extract_text_features")
+def extract_text_features(text: str, evidence: Optional[Evidence] = None) -> TextFeatures:
     """
     very simple feature extraction. this is intentionally lightweight,
     so later you can replace/augment with embeddings, bert outputs, etc.
+    pass an `Evidence` to also record where the keywords / numbers matched.
     """
     if not text:
         text = ""
 
     # basic size metrics
     length_chars = len(text)
-    words = re.findall(r"\w+", text)
+    words = _WORD_RE.findall(text)
     length_words = len(words)
 
     # numbers ~ potential quantitative KPIs or impact claims
-    num_numbers = len(re.findall(r"\d+(?:\.\d+)?", text))
+    num_numbers = _count_numbers(text, evidence)
 
     # keyword hits for various categories
-    use_of_proceeds_hits = _count_occurrences(text, USE_OF_PROCEEDS_KEYWORDS)
-    reporting_hits = _count_occurrences(text, REPORTING_KEYWORDS)
-    verification_hits = _count_occurrences(text, VERIFICATION_KEYWORDS)
-    kpi_hits = _count_occurrences(text, KPI_KEYWORDS)
-    env_hits = _count_occurrences(text, ENVIRONMENTAL_KEYWORDS)
+    text_l = text.lower()
+    hits = {
+        name: _count_occurrences(text, kws, name, evidence, text_l)
+        for name, kws in KEYWORD_LISTS.items()
+    }
 
-    # crude scores: normalize by log(length) to avoid bias for very long text
-    length_norm = max(1.0, (length_words ** 0.5))
+    return _features_from_counts(length_chars, length_words, num_numbers, hits)
 
-    environmental_focus_score = min(1.0, env_hits / length_norm)
-    kpi_density = min(1.0, kpi_hits / length_norm)
 
-    return TextFeatures(
-        length_chars=length_chars,
-        length_words=length_words,
-        num_numbers=num_numbers,
-        has_use_of_proceeds=use_of_proceeds_hits > 0,
-        has_reporting=reporting_hits > 0,
-        has_verification=verification_hits > 0,
-        has_kpi=kpi_hits > 0,
-        environmental_focus_score=environmental_focus_score,
-        kpi_density=kpi_density,
-    )
\ No newline at end of file
+# handcrafted features for the ml transparency regressor
+# same patterns as in the notebook
+PATTERNS = {
+    "has_third_party_review": [
+        r"second[- ]party opinion",
+        r"external review",
+        r"third[- ]party verification",
+        r"assurance",
+        r"spo by",
+        r"sustainalytics",
+        r"cicero",
+        r"vigeo",
+    ],
+    "has_reporting_annual": [
+        r"annual report",
+        r"annual reporting",
+    ],
+    "has_reporting_semi_annual": [
+        r"semi[- ]annual",
+        r"semiannual",
+    ],
+    "has_kpi_co2": [
+        r"\\bco2\\b",
+        r"carbon emissions",
+        r"greenhouse gas",
+        r"\\bghg\\b",
+    ],
+    "has_kpi_energy": [
+        r"mwh",
+        r"kwh",
+        r"kw\\b",
+        r"energy efficiency",
+        r"renewable energy",
+    ],
+}
+
+
+def handcrafted_features(text: str) -> np.ndarray:
+    t = text.lower()
+    feats = []
+
+    for patterns in PATTERNS.values():
+        flag = any(re.search(p, t) for p in patterns)
+        feats.append(1.0 if flag else 0.0)
+
+    num_numbers = len(re.findall(r"\\d+(?:\\.\\d+)?", t))
+    feats.append(float(num_numbers))
+
+    return np.array(feats, dtype=np.float32)
+
+
+# ------------------------------
+# incremental extraction over a text stream
+# ------------------------------
+
+_PATTERN_RES = [[re.compile(p) for p in patterns] for patterns in PATTERNS.values()]
+_HANDCRAFTED_NUMBER_RE = re.compile(r"\\d+(?:\\.\\d+)?")
+
+
+class StreamingFeatureExtractor:
+    """
+    extract_text_features / handcrafted_features over text that arrives in
+    chunks. update() takes raw chunks; the results equal running the batch
+    functions on clean_text(whole text), but only a short tail of the previous
+    chunk is kept between calls, so memory is bounded by the chunk size.
+
+        - whitespace is collapsed on the fly, exactly like clean_text
+        - words / numbers are counted up to the last space; the partial
+          token after it is carried into the next chunk
+        - keywords are counted with str.count semantics (non-overlapping,
+          leftmost first); the last len(longest keyword) - 1 chars are carried
+          so matches spanning a chunk boundary are found once
+        - the first `head_chars` chars of the cleaned text are kept for the
+          encoder (it truncates its input anyway)
+        - with an `evidence` collector, match offsets are recorded as well;
+          snippets only see the carried tail and the current chunk
+    """
+
+    # a "token" without any whitespace is flushed past this size (binary junk)
+    MAX_TOKEN_CARRY = 64 * 1024
+    # carry for the handcrafted regex flags (all match short phrases)
+    PATTERN_CARRY = 64
+
+    def __init__(self, head_chars: int = 0, evidence: Optional[Evidence] = None) -> None:
+        self.head_chars = head_chars
+        self.evidence = evidence
+        self.head = ""
+        self.length_chars = 0
+        self.length_words = 0
+        self.num_numbers = 0
+        self.hits = {name: 0 for name in KEYWORD_LISTS}
+        self._keywords = {name: [kw.lower() for kw in kws] for name, kws in KEYWORD_LISTS.items()}
+        # absolute offset (in the lowercased stream) where each keyword's next
+        # match may start
+        self._keyword_next = {name: [0] * len(kws) for name, kws in self._keywords.items()}
+        self._keyword_keep = max(len(kw) for kws in self._keywords.values() for kw in kws) - 1
+        self._keyword_carry = ""
+        self._keyword_base = 0
+        self._token_carry = ""
+        self._token_pos = 0
+        # original-case tail for evidence snippets; offsets in the lowercased
+        # stream equal cleaned-text offsets as long as lower() kept lengths
+        self._context_carry = ""
+        self._aligned = True
+        self._pattern_flags = [False] * len(_PATTERN_RES)
+        self._pattern_carry = ""
+        self._handcrafted_numbers = 0
+        self._emitted = False
+        self._pending_space = False
+        self._finished = False
+
+    # -- whitespace normalisation (clean_text, incrementally) --
+
+    def _normalize(self, chunk: str) -> str:
+        parts = chunk.split()
+        if not parts:
+            self._pending_space = self._pending_space or bool(chunk)
+            return ""
+        out = " ".join(parts)
+        if self._emitted and (self._pending_space or chunk[0].isspace()):
+            out = " " + out
+        self._emitted = True
+        self._pending_space = chunk[-1].isspace()
+        return out
+
+    # -- counters --
+
+    def _count_tokens(self, segment: str) -> None:
+        self.length_words += len(_WORD_RE.findall(segment))
+        self.num_numbers += _count_numbers(segment, self.evidence, self._token_pos)
+        self._token_pos += len(segment)
+        self._handcrafted_numbers += len(_HANDCRAFTED_NUMBER_RE.findall(segment.lower()))
+
+    def _count_keywords(self, lowered: str, cleaned: str) -> None:
+        buf = self._keyword_carry + lowered
+        base = self._keyword_base
+        evidence = self.evidence
+        if evidence is not None:
+            self._aligned = self._aligned and len(lowered) == len(cleaned)
+            if self._aligned:
+                source = self._context_carry + cleaned
+                source_base = self.length_chars - len(source)
+            else:
+                source, source_base = buf, base
+        for name, keywords in self._keywords.items():
+            next_pos = self._keyword_next[name]
+            for i, kw in enumerate(keywords):
+                pos = max(next_pos[i] - base, 0)
+                while True:
+                    j = buf.find(kw, pos)
+                    if j < 0:
+                        break
+                    self.hits[name] += 1
+                    pos = j + len(kw)
+                    if evidence is not None and evidence.wants(name, kw):
+                        start = base + j - source_base
+                        evidence.add_from(name, kw, start, start + len(kw), source, source_base)
+                next_pos[i] = base + pos
+        keep = min(len(buf), self._keyword_keep)
+        self._keyword_carry = buf[len(buf) - keep:]
+        self._keyword_base = base + len(buf) - keep
+        if evidence is not None:
+            self._context_carry = source[-(keep + evidence.context_chars):]
+
+    def _match_patterns(self, lowered: str) -> None:
+        buf = self._pattern_carry + lowered
+        for k, regexes in enumerate(_PATTERN_RES):
+            if not self._pattern_flags[k] and any(r.search(buf) for r in regexes):
+                self._pattern_flags[k] = True
+        self._pattern_carry = buf[-self.PATTERN_CARRY:]
+
+    def update(self, chunk: str) -> None:
+        if self._finished:
+            raise RuntimeError("update() after finish()")
+        cleaned = self._normalize(chunk)
+        if not cleaned:
+            return
+        self.length_chars += len(cleaned)
+        if len(self.head) < self.head_chars:
+            self.head += cleaned[: self.head_chars - len(self.head)]
+
+        buf = self._token_carry + cleaned
+        cut = buf.rfind(" ") + 1
+        if cut == 0 and len(buf) > self.MAX_TOKEN_CARRY:
+            cut = len(buf)
+        self._count_tokens(buf[:cut])
+        self._token_carry = buf[cut:]
+
+        lowered = cleaned.lower()
+        self._count_keywords(lowered, cleaned)
+        self._match_patterns(lowered)
+
+    def finish(self) -> None:
+        if not self._finished:
+            self._count_tokens(self._token_carry)
+            self._token_carry = ""
+            self._finished = True
+
+    def features(self) -> TextFeatures:
+        self.finish()
+        return _features_from_counts(
+            self.length_chars, self.length_words, self.num_numbers, self.hits
+        )
+
+    def handcrafted(self) -> np.ndarray:
+        self.finish()
+        feats = [1.0 if flag else 0.0 for flag in self._pattern_flags]
+        feats.append(float(self._handcrafted_numbers))
+        return np.array(feats, dtype=np.float32)
@@ -3,6 +3,10 @@ Impact realization gap model.
 Predicts actual vs claimed impact.
 """
 
+from typing import Dict
+
+import numpy as np
+
 
 def predict_impact_gap(
     claimed_impact_co2_tons: float | None,
@@ -58,3 +62,40 @@ def predict_impact_gap(
 
     # Nothing to estimate
     return {"claimed": None, "predicted": None, "uncertainty": None, "gap": None}
+
+
+def predict_impact_gap_batch(
+    claimed_impact_co2_tons: np.ndarray,
+    amount_issued_usd: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized version of `predict_impact_gap` over arrays of bonds.
+
+    Applies the same rules element-wise (amount-based estimate first, then the
+    claimed-fraction fallback) and returns float arrays for `claimed`,
+    `predicted`, `uncertainty` and `gap`, with NaN wherever the scalar version
+    would return None.
+    """
+    claimed = np.asarray(claimed_impact_co2_tons, dtype=np.float64)
+    amount = np.asarray(amount_issued_usd, dtype=np.float64)
+
+    has_amount = np.isfinite(amount) & (amount > 0)
+    has_claim = np.isfinite(claimed) & ~has_amount
+
+    predicted = np.full(amount.shape, np.nan)
+    uncertainty = np.full(amount.shape, np.nan)
+
+    # amount-based rule: default intensity (tCO2 per $1M) * amount in $1M
+    predicted[has_amount] = 5.0 * (amount[has_amount] / 1_000_000.0)
+    uncertainty[has_amount] = np.maximum(0.1 * predicted[has_amount], 1.0)
+
+    # claim-only rule: conservative realized fraction of the claim
+    predicted[has_claim] = 0.65 * claimed[has_claim]
+    uncertainty[has_claim] = 0.15 * claimed[has_claim]
+
+    return {
+        "claimed": claimed,
+        "predicted": predicted,
+        "uncertainty": uncertainty,
+        "gap": claimed - predicted,
+    }
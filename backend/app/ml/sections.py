@@ -0,0 +1,87 @@
+# backend/app/ml/sections.py
+# section boundary detection for green bond disclosures (icma core components)
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+# section name -> heading pattern, matched right after an optional numbering
+# prefix ("3.", "2.1", "IV.", "a)")
+SECTION_HEADINGS = {
+    "use_of_proceeds": r"use[- ]of[- ]proceeds",
+    "project_evaluation": r"(?:process for )?project(?:s)? (?:and asset )?(?:evaluation|selection)",
+    "management_of_proceeds": r"management of (?:the )?proceeds",
+    "reporting": r"(?:impact |allocation |annual )?reporting",
+    "external_review": (
+        r"external review|second[- ]party opinion|"
+        r"independent (?:verification|review|assurance)"
+    ),
+}
+
+# the sections the API scores by default, in transparency component order
+DEFAULT_SECTIONS = ("use_of_proceeds", "reporting", "external_review")
+
+MAX_HEADING_CHARS = 70
+
+_NUMBER_PREFIX = r"^(?:(?:\d+(?:\.\d+)*|[ivxlc]+|[a-z])[.)]?\s+)?"
+_HEADING_RES = [
+    (name, re.compile(_NUMBER_PREFIX + pattern + r"\b", re.IGNORECASE))
+    for name, pattern in SECTION_HEADINGS.items()
+]
+# any other top-level numbered heading ("9. Conclusion") closes the open section
+_OTHER_HEADING_RE = re.compile(r"^(?:\d+|[IVX]+)\.?\s+[A-Z][^.:;]{2,60}$")
+# table of contents lines: dot leaders or a trailing page number
+_TOC_RE = re.compile(r"\.{3,}|…|\s\d{1,3}$")
+
+
+@dataclass
+class Section:
+    name: str
+    heading: str
+    start: int  # char offset of the heading line
+    end: int  # char offset where the next heading starts (exclusive)
+
+
+def _heading_name(line: str) -> Optional[str]:
+    """section name for a heading line, "" for an unrelated heading, else None."""
+    if len(line) > MAX_HEADING_CHARS or _TOC_RE.search(line):
+        return None
+    first_alpha = next((c for c in line if c.isalpha()), "")
+    if not first_alpha.isupper():
+        return None
+    for name, pattern in _HEADING_RES:
+        if pattern.match(line):
+            return name
+    if _OTHER_HEADING_RE.match(line):
+        return ""
+    return None
+
+
+def detect_sections(text: str) -> List[Section]:
+    """
+    split `text` into known sections by scanning for heading lines.
+    a section runs until the next recognised heading; consecutive headings of
+    the same section ("8. Reporting", "8.1 Reporting Approach") are merged and
+    a section name may occur more than once.
+    """
+    sections: List[Section] = []
+    open_name: Optional[str] = None
+    pos = 0
+    for raw_line in text.splitlines(keepends=True):
+        line = raw_line.strip()
+        start = pos
+        pos += len(raw_line)
+        if not line:
+            continue
+        name = _heading_name(line)
+        if name is None or name == open_name:
+            continue
+        if open_name:
+            sections[-1].end = start
+        if name:
+            sections.append(Section(name=name, heading=line, start=start, end=len(text)))
+            open_name = name
+        else:
+            open_name = None
+    return sections
@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional
 
-from app.ml.features import TextFeatures, extract_text_features
+from app.ml.features import Evidence, TextFeatures, extract_text_features
 
 
 @dataclass
@@ -14,6 +14,8 @@ class TransparencyComponents:
     reporting_practices: float
     verification_strength: float
     raw_features: TextFeatures
+    # match offsets / snippets, when requested from score_transparency
+    evidence: Optional[Evidence] = None
 
     @property
     def overall(self) -> float:
@@ -57,9 +59,13 @@ def _score_verification(feats: TextFeatures) -> float:
 
 
 def score_transparency(
-    text: str, *, precomputed_features: Optional[TextFeatures] = None
+    text: str,
+    *,
+    precomputed_features: Optional[TextFeatures] = None,
+    evidence: Optional[Evidence] = None,
 ) -> TransparencyComponents:
-    feats = precomputed_features or extract_text_features(text)
+    # `evidence` is filled by the same extraction pass (not with precomputed features)
+    feats = precomputed_features or extract_text_features(text, evidence)
 
     uop = _score_use_of_proceeds(feats)
     rep = _score_reporting(feats)
@@ -70,4 +76,5 @@ def score_transparency(
         reporting_practices=round(rep, 1),
         verification_strength=round(ver, 1),
         raw_features=feats,
+        evidence=evidence,
     )
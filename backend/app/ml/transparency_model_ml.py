@@ -11,63 +11,16 @@ import torch
 from joblib import load
 from transformers import AutoTokenizer, AutoModel
 
+from app.core.metrics import MODEL_LOADS, stage, timed
+# handcrafted features (notebook patterns) live in app.ml.features so the
+# feature store build can compute them without torch
+from app.ml.features import PATTERNS, handcrafted_features  # noqa: F401
 from app.ml.preprocessing import clean_text
 
 # ---- Paths ----
 BACKEND_ROOT = Path(__file__).resolve().parents[2]
 MODEL_PATH = BACKEND_ROOT / "app" / "models" / "transparency_regressor_from_txt.joblib"
 
-# same patterns as in the notebook
-import re
-
-PATTERNS = {
-    "has_third_party_review": [
-        r"second[- ]party opinion",
-        r"external review",
-        r"third[- ]party verification",
-        r"assurance",
-        r"spo by",
-        r"sustainalytics",
-        r"cicero",
-        r"vigeo",
-    ],
-    "has_reporting_annual": [
-        r"annual report",
-        r"annual reporting",
-    ],
-    "has_reporting_semi_annual": [
-        r"semi[- ]annual",
-        r"semiannual",
-    ],
-    "has_kpi_co2": [
-        r"\\bco2\\b",
-        r"carbon emissions",
-        r"greenhouse gas",
-        r"\\bghg\\b",
-    ],
-    "has_kpi_energy": [
-        r"mwh",
-        r"kwh",
-        r"kw\\b",
-        r"energy efficiency",
-        r"renewable energy",
-    ],
-}
-
-
-def handcrafted_features(text: str) -> np.ndarray:
-    t = text.lower()
-    feats = []
-
-    for patterns in PATTERNS.values():
-        flag = any(re.search(p, t) for p in patterns)
-        feats.append(1.0 if flag else 0.0)
-
-    num_numbers = len(re.findall(r"\\d+(?:\\.\\d+)?", t))
-    feats.append(float(num_numbers))
-
-    return np.array(feats, dtype=np.float32)
-
 
 def clamp_0_100(val: float) -> float:
     return float(max(0.0, min(100.0, val)))
@@ -81,7 +34,9 @@ def _load_artifact() -> Optional[dict]:
         print(f"[transparency_model_ml] WARNING: model file not found at {MODEL_PATH}")
         return None
 
-    artifact = load(MODEL_PATH)
+    with stage("model_load"):
+        artifact = load(MODEL_PATH)
+    MODEL_LOADS.inc(model="transparency_regressor")
     return artifact
 
 
@@ -94,10 +49,12 @@ def _load_encoder():
     model_name = artifact.get("base_nlp_model_name", "ProsusAI/finbert")
     device = "cuda" if torch.cuda.is_available() else "cpu"
 
-    tokenizer = AutoTokenizer.from_pretrained(model_name)
-    model = AutoModel.from_pretrained(model_name)
-    model.to(device)
-    model.eval()
+    with stage("model_load"):
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModel.from_pretrained(model_name)
+        model.to(device)
+        model.eval()
+    MODEL_LOADS.inc(model="finbert")
 
     return tokenizer, model
 
@@ -106,6 +63,7 @@ def ml_model_available() -> bool:
     return _load_artifact() is not None
 
 
+@timed("finbert_embed")
 @torch.no_grad()
 def _embed_texts(texts: List[str]) -> np.ndarray:
     tokenizer, model = _load_encoder()
@@ -135,6 +93,40 @@ def _embed_texts(texts: List[str]) -> np.ndarray:
     return np.vstack(all_embs)
 
 
+def encoder_name() -> Optional[str]:
+    artifact = _load_artifact()
+    if artifact is None:
+        return None
+    return artifact.get("base_nlp_model_name", "ProsusAI/finbert")
+
+
+def transparency_embeddings(texts: List[str]) -> Optional[np.ndarray]:
+    """
+    encoder embeddings for `texts` (cleaned here), or None without the
+    artifact. used to precompute the disclosure feature store.
+    """
+    if _load_artifact() is None:
+        return None
+    return _embed_texts([clean_text(t) for t in texts])
+
+
+def predict_transparency_score_ml_from_features(
+    embedding: np.ndarray, handcrafted: np.ndarray
+) -> Optional[float]:
+    """ml transparency score from a precomputed embedding + handcrafted features."""
+    artifact = _load_artifact()
+    if artifact is None:
+        return None
+
+    feats = np.concatenate(
+        [np.asarray(embedding).reshape(1, -1), np.asarray(handcrafted).reshape(1, -1)], axis=1
+    )                                                         # (1, D)
+    model = artifact["model"]
+    with stage("transparency_predict"):
+        score = model.predict(feats)[0]
+    return clamp_0_100(score)
+
+
 def predict_transparency_score_ml(text: str) -> Optional[float]:
     """
     Returns an ML transparency score in [0, 100], or None if the model
@@ -146,9 +138,5 @@ def predict_transparency_score_ml(text: str) -> Optional[float]:
 
     cleaned = clean_text(text)
     emb = _embed_texts([cleaned])                             # (1, hidden)
-    hand = np.stack([handcrafted_features(cleaned)], axis=0)  # (1, H)
-    feats = np.concatenate([emb, hand], axis=1)               # (1, D)
-
-    model = artifact["model"]
-    score = model.predict(feats)[0]
-    return clamp_0_100(score)
+    hand = handcrafted_features(cleaned)                      # (H,)
+    return predict_transparency_score_ml_from_features(emb[0], hand)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Benchmark the source normalizers in build_bonds_unified.py on scaled
+synthetic inputs.
+
+each source's sample file in app/data is tiled up to --rows rows (with row
+numbers mixed into ids / issuer names so values stay distinct), written to a
+temp dir, and normalized. reports read time, total time and rows/s.
+
+usage (run in backend dir):
+
+    python app/scripts/bench_build_bonds.py --rows 1000000
+    python app/scripts/bench_build_bonds.py --rows 200000 --sources cbi kaggle
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.scripts.build_bonds_unified import (  # noqa: E402
+    normalize_cbi,
+    normalize_kaggle,
+    normalize_kapsarc,
+    normalize_world_bank,
+)
+
+DATA_DIR = BACKEND_ROOT / "app" / "data"
+
+# source -> (sample file, csv separator, column to make unique, normalizer)
+SOURCES: Dict[str, Tuple[str, str, str, Callable[[Path], pd.DataFrame]]] = {
+    "world_bank": (
+        "green_bonds_since_2008_11-28-2025.csv",
+        ",",
+        "isin",
+        normalize_world_bank,
+    ),
+    "kapsarc": ("green-bond-issuances.csv", ";", "Country", normalize_kapsarc),
+    "cbi": ("bonds_export.csv", ",", "Issuer / Applicant", normalize_cbi),
+    "kaggle": (
+        "Global_Sustainable_Bonds_Data.csv",
+        ",",
+        "Issuer Name",
+        normalize_kaggle,
+    ),
+}
+
+
+def make_synthetic(sample: Path, sep: str, unique_col: str, rows: int, out: Path) -> None:
+    """tile `sample` to `rows` rows and suffix `unique_col` with the row number."""
+    df = pd.read_csv(sample, sep=sep)
+    big = df.iloc[np.resize(np.arange(len(df)), rows)].reset_index(drop=True)
+    if unique_col in big.columns:
+        suffix = pd.Series(np.arange(rows), dtype=str)
+        big[unique_col] = big[unique_col].astype(str) + "_" + suffix
+    big.to_csv(out, sep=sep, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark build_bonds_unified normalizers on synthetic inputs."
+    )
+    parser.add_argument("--rows", type=int, default=200_000, help="Rows per source")
+    parser.add_argument(
+        "--sources",
+        nargs="+",
+        choices=sorted(SOURCES),
+        default=sorted(SOURCES),
+        help="Sources to benchmark",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per source (best is kept)")
+    args = parser.parse_args()
+
+    print(f"{'source':<12} {'rows':>10} {'read s':>8} {'total s':>8} {'rows/s':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.sources:
+            sample_name, sep, unique_col, normalize = SOURCES[name]
+            sample = DATA_DIR / sample_name
+            if not sample.exists():
+                print(f"{name:<12} sample {sample} missing – skipping")
+                continue
+
+            path = Path(tmp) / f"{name}.csv"
+            make_synthetic(sample, sep, unique_col, args.rows, path)
+
+            best_read = best_total = float("inf")
+            n_out = 0
+            for _ in range(max(args.repeat, 1)):
+                t0 = time.perf_counter()
+                pd.read_csv(path, sep=sep)
+                best_read = min(best_read, time.perf_counter() - t0)
+
+                t0 = time.perf_counter()
+                n_out = len(normalize(path))
+                best_total = min(best_total, time.perf_counter() - t0)
+
+            print(
+                f"{name:<12} {n_out:>10} {best_read:>8.2f} {best_total:>8.2f} "
+                f"{n_out / best_total:>12,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
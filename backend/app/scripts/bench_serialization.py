@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""
+Benchmark response serialization for the bulk endpoints: the default FastAPI
+path against app/services/fast_json.py.
+
+    default  to_dict(records) / lists of python floats, response_model or
+             jsonable_encoder walk, then json.dumps (what JSONResponse does)
+    fast     fast_json encoding straight from columns / numpy arrays
+
+payloads:
+
+    bonds    GET /api/bonds: bonds.csv tiled to --rows rows
+    market   GET /api/market: every symbol in market_series.csv aligned
+
+reports encode time (best of --repeat), body size and gzip / zstd size and
+compression time for the fast body. exits 1 when the two paths produce
+different documents.
+
+usage (run in backend dir):
+
+    python app/scripts/bench_serialization.py --rows 100000
+    python app/scripts/bench_serialization.py --payloads market --repeat 5
+"""
+
+import argparse
+import json
+import sys
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.data.load_bonds import load_bonds  # noqa: E402
+from app.services import fast_json  # noqa: E402
+from app.services.market_data_csv import get_aligned_series, load_market_arrays  # noqa: E402
+
+
+def _json_response_body(content: Any) -> bytes:
+    # starlette JSONResponse.render
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def bonds_case(rows: int) -> Tuple[Callable[[], bytes], Callable[[], bytes]]:
+    df = load_bonds()
+    if df.empty:
+        raise SystemExit("bonds.csv missing or empty")
+    big = df.iloc[np.resize(np.arange(len(df)), rows)].reset_index(drop=True)
+    adapter = TypeAdapter(List[Dict[str, Any]])
+
+    def default() -> bytes:
+        # route returns records, FastAPI validates / serializes them against
+        # response_model=List[Dict[str, Any]]
+        records = big.to_dict(orient="records")
+        return _json_response_body(adapter.dump_python(adapter.validate_python(records), mode="json"))
+
+    return default, lambda: fast_json.records_body(big)
+
+
+def market_case(rows: int) -> Tuple[Callable[[], bytes], Callable[[], bytes]]:
+    symbols = sorted(load_market_arrays())
+    if not symbols:
+        raise SystemExit("market_series.csv missing or empty")
+
+    def default() -> bytes:
+        aligned = get_aligned_series(symbols, days=None)
+        return _json_response_body(jsonable_encoder(aligned))
+
+    def fast() -> bytes:
+        return fast_json.dumps(get_aligned_series(symbols, days=None, as_arrays=True))
+
+    return default, fast
+
+
+CASES: Dict[str, Callable[[int], Tuple[Callable[[], bytes], Callable[[], bytes]]]] = {
+    "bonds": bonds_case,
+    "market": market_case,
+}
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    best, out = float("inf"), None
+    for _ in range(max(repeat, 1)):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark default vs fast_json serialization of bulk responses."
+    )
+    parser.add_argument("--rows", type=int, default=50_000, help="Rows for the bonds payload")
+    parser.add_argument(
+        "--payloads",
+        nargs="+",
+        choices=sorted(CASES),
+        default=sorted(CASES),
+        help="Payloads to benchmark",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path (best is kept)")
+    args = parser.parse_args()
+
+    encoder = "orjson" if fast_json.orjson_available() else "stdlib json"
+    print(f"fast path encoder: {encoder}; zstd: {'yes' if fast_json.zstd_available() else 'no'}")
+    print(
+        f"{'payload':<8} {'path':<8} {'encode ms':>10} {'MB':>8} "
+        f"{'gzip MB':>8} {'gzip ms':>8} {'zstd MB':>8} {'zstd ms':>8}"
+    )
+    mismatched: List[str] = []
+    for name in args.payloads:
+        default, fast = CASES[name](args.rows)
+        t_default, body_default = best_of(default, args.repeat)
+        t_fast, body_fast = best_of(fast, args.repeat)
+
+        # both paths must produce the same document
+        if json.loads(body_default) != json.loads(body_fast):
+            print(f"{name:<8} ERROR: default and fast bodies differ")
+            mismatched.append(name)
+
+        print(f"{name:<8} {'default':<8} {t_default * 1e3:>10.1f} {len(body_default) / 1e6:>8.2f}")
+        cols = [f"{name:<8} {'fast':<8} {t_fast * 1e3:>10.1f} {len(body_fast) / 1e6:>8.2f}"]
+        for encoding in ("gzip", "zstd"):
+            if encoding == "zstd" and not fast_json.zstd_available():
+                cols.append(f"{'-':>8} {'-':>8}")
+                continue
+            t_c, packed = best_of(partial(fast_json.compress, body_fast, encoding), args.repeat)
+            cols.append(f"{len(packed) / 1e6:>8.2f} {t_c * 1e3:>8.1f}")
+        print(" ".join(cols))
+        print(f"{name:<8} speedup  {t_default / t_fast:>10.1f}x")
+
+    if mismatched:
+        sys.exit(f"serialization mismatch: {', '.join(mismatched)}")
+
+
+if __name__ == "__main__":
+    main()
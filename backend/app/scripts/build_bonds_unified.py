@@ -18,13 +18,31 @@ Can run it with any subset of the inputs; only provided files will be used.
 """
 
 import argparse
+import filecmp
 import math
+import os
+import re
+import resource
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional, List
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
 import numpy as np
 
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.scripts.build_manifest import BuildManifest  # noqa: E402
+from app.scripts.resolve_entities import format_stats, resolve_entities  # noqa: E402
+
+DEFAULT_CACHE_DIR = BACKEND_ROOT / "app" / "data" / ".build_cache" / "bonds"
+
 
 COMMON_COLS = [
     "bond_id",
@@ -45,6 +63,8 @@ COMMON_COLS = [
     "certification",
     "claimed_impact_co2_tons",
     "actual_impact_co2_tons",
+    "claimed_energy_mwh",
+    "actual_energy_mwh",
     "impact_source",
 ]
 
@@ -58,6 +78,38 @@ def safe_parse_date(val: str) -> Optional[pd.Timestamp]:
         return None
 
 
+# ------------------------------
+# vectorized string helpers
+# ------------------------------
+
+def py_str(values: pd.Series) -> pd.Series:
+    """
+    column-wise equivalent of str(v) for every value (object dtype result).
+    nulls become "nan" / "None" exactly like str() of the raw value, so ids
+    built from these strings match the old row-wise code.
+    """
+    arr = values.to_numpy(dtype=object)
+    nulls = pd.isna(arr)
+    out = np.empty(len(arr), dtype=object)
+    if nulls.any():
+        out[nulls] = np.where(arr[nulls] == None, "None", "nan")  # noqa: E711
+    if (~nulls).any():
+        out[~nulls] = arr[~nulls].astype(str).astype(object)
+    return pd.Series(out, index=values.index, dtype=object)
+
+
+def parse_scaled_amounts(tokens: pd.Series) -> pd.Series:
+    """
+    parse lower-cased number tokens with an optional 'bn' / 'm' suffix
+    (e.g. '18.884m', '0.57bn', '250') into floats; unparseable -> NaN.
+    """
+    is_bn = tokens.str.endswith("bn", na=False)
+    is_m = ~is_bn & tokens.str.endswith("m", na=False)
+    number = tokens.mask(is_bn, tokens.str[:-2]).mask(is_m, tokens.str[:-1])
+    scale = np.where(is_bn, 1e9, np.where(is_m, 1e6, 1.0))
+    return pd.to_numeric(number, errors="coerce") * scale
+
+
 # ------------------------------
 # world bank green bonds
 # ------------------------------
@@ -70,11 +122,17 @@ def normalize_world_bank(path: Path) -> pd.DataFrame:
         settlement_date, maturity_date, usd_equivalent, isin,
         final_terms, institution
     """
-    df = pd.read_csv(path)
+    return normalize_world_bank_frame(pd.read_csv(path))
+
+
+def normalize_world_bank_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """normalize an already-loaded World Bank frame or chunk (see normalize_world_bank)."""
 
     # base frame
     # build base output frame with mapped columns
-    out = pd.DataFrame()
+    # same index as the source so scalar assignments (like source_dataset)
+    # broadcast to every row instead of landing in an empty frame
+    out = pd.DataFrame(index=df.index)
     out["source_dataset"] = "world_bank"
     out["isin"] = df.get("isin")
     out["issuer_name"] = df.get("institution", "World Bank")
@@ -103,16 +161,11 @@ def normalize_world_bank(path: Path) -> pd.DataFrame:
     out["actual_impact_co2_tons"] = np.nan
     out["impact_source"] = None
 
-    # bond_id: prefer ISIN if available
     # bond_id: prefer ISIN if available, otherwise fall back to index
-    def mk_id(row):
-        isin = str(row.get("isin", "")).strip()
-        if isin and isin != "nan":
-            return f"WB-{isin}"
-        # fallback: use index
-        return f"WB-{row.name}"
-
-    out["bond_id"] = out.apply(mk_id, axis=1)
+    isin = py_str(out["isin"]).str.strip()
+    has_isin = (isin != "") & (isin != "nan")
+    row_ids = pd.Series(out.index.astype(str), index=out.index, dtype=object)
+    out["bond_id"] = "WB-" + isin.where(has_isin, row_ids)
 
     # reorder / ensure all columns exist
     for col in COMMON_COLS:
@@ -136,10 +189,16 @@ def normalize_kapsarc(path: Path) -> pd.DataFrame:
     NOTE: This dataset is *issuance aggregates*, not single bonds.
     We'll treat each row as a 'synthetic bond bucket' for now.
     """
-    df = pd.read_csv(path, sep=";")
+    return normalize_kapsarc_frame(pd.read_csv(path, sep=";"))
+
+
+def normalize_kapsarc_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """normalize an already-loaded KAPSARC frame or chunk (see normalize_kapsarc)."""
 
     # create output frame mapping kapsarc columns -> common schema
-    out = pd.DataFrame()
+    # same index as the source so scalar assignments (like source_dataset)
+    # broadcast to every row instead of landing in an empty frame
+    out = pd.DataFrame(index=df.index)
     out["source_dataset"] = "kapsarc"
     out["isin"] = None  # not provided
 
@@ -151,20 +210,14 @@ def normalize_kapsarc(path: Path) -> pd.DataFrame:
 
     # Value is e.g. 'Billion US Dollars'
     unit = df["Unit"].fillna("")
-    value = df["Value"]
-    amount_usd = []
+    value = df["Value"].astype(float)
     # convert unit strings (Million/Billion) to numeric USD
-    for u, v in zip(unit, value):
-        if pd.isna(v):
-            amount_usd.append(np.nan)
-            continue
-        if "Billion" in u:
-            amount_usd.append(float(v) * 1e9)
-        elif "Million" in u:
-            amount_usd.append(float(v) * 1e6)
-        else:
-            amount_usd.append(float(v))
-    out["amount_issued_usd"] = amount_usd
+    scale = np.where(
+        unit.str.contains("Billion", regex=False),
+        1e9,
+        np.where(unit.str.contains("Million", regex=False), 1e6, 1.0),
+    )
+    out["amount_issued_usd"] = (value * scale).to_numpy()
 
     out["amount_issued"] = out["amount_issued_usd"]  # no local amount, but ok
 
@@ -184,13 +237,10 @@ def normalize_kapsarc(path: Path) -> pd.DataFrame:
     out["actual_impact_co2_tons"] = np.nan
     out["impact_source"] = None
 
-    def mk_id(row):
-        yr = row.get("issue_year")
-        ctry = str(row.get("country", "")).replace(" ", "_")
-        btype = str(df.loc[row.name, "Bond_Type"]).replace(" ", "_")
-        return f"KAPSARC-{yr}-{ctry}-{btype}"
-
-    out["bond_id"] = out.apply(mk_id, axis=1)
+    yr = py_str(out["issue_year"])
+    ctry = py_str(out["country"]).str.replace(" ", "_", regex=False)
+    btype = py_str(df["Bond_Type"]).str.replace(" ", "_", regex=False)
+    out["bond_id"] = "KAPSARC-" + yr + "-" + ctry + "-" + btype
 
     for col in COMMON_COLS:
         if col not in out.columns:
@@ -212,10 +262,16 @@ def normalize_cbi(path: Path) -> pd.DataFrame:
         'Term', 'Issuer Country', 'Sector Criteria',
         'Approved Verifier', 'Status', 'Certification type', 'Description'
     """
-    df = pd.read_csv(path)
+    return normalize_cbi_frame(pd.read_csv(path))
+
+
+def normalize_cbi_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """normalize an already-loaded CBI frame or chunk (see normalize_cbi)."""
 
     # map cbi export fields into common schema
-    out = pd.DataFrame()
+    # same index as the source so scalar assignments (like source_dataset)
+    # broadcast to every row instead of landing in an empty frame
+    out = pd.DataFrame(index=df.index)
     out["source_dataset"] = "cbi"
     out["isin"] = None  # not present in export (unless in another column)
 
@@ -226,24 +282,10 @@ def normalize_cbi(path: Path) -> pd.DataFrame:
     out["currency"] = None  # 'Size (in issuance currency)' is a text field
 
     # parse 'Size (in issuance currency)' text like 'USD 18.884m'
-    def parse_size_local(val: str) -> Optional[float]:
-        if pd.isna(val):
-            return None
-        # e.g. "AUD 100m" or "USD 18.884m"
-        parts = str(val).split()
-        if len(parts) < 2:
-            return None
-        num_part = parts[1].lower()
-        try:
-            if num_part.endswith("bn"):
-                return float(num_part[:-2]) * 1e9
-            if num_part.endswith("m"):
-                return float(num_part[:-1]) * 1e6
-            return float(num_part)
-        except Exception:
-            return None
-
-    out["amount_issued"] = df["Size (in issuance currency)"].apply(parse_size_local)
+    # (e.g. "AUD 100m" or "USD 18.884m"): second whitespace token, lower-cased
+    size_text = df["Size (in issuance currency)"]
+    tokens = py_str(size_text).where(size_text.notna()).str.split().str[1].astype("str")
+    out["amount_issued"] = parse_scaled_amounts(tokens.str.lower())
     out["amount_issued_usd"] = df["Size (USD equivalent)"]
 
     out["issue_date"] = pd.to_datetime(df["Issue date"], errors="coerce")
@@ -264,14 +306,11 @@ def normalize_cbi(path: Path) -> pd.DataFrame:
     out["actual_impact_co2_tons"] = np.nan
     out["impact_source"] = None
 
-    def mk_id(row):
-        issuer = str(row["issuer_name"]).replace(" ", "_")[:20]
-        date = row["issue_date"]
-        if isinstance(date, pd.Timestamp):
-            return f"CBI-{issuer}-{date.date().isoformat()}"
-        return f"CBI-{issuer}-{row.name}"
-
-    out["bond_id"] = out.apply(mk_id, axis=1)
+    issuer = py_str(out["issuer_name"]).str.replace(" ", "_", regex=False).str[:20]
+    issue_day = out["issue_date"].dt.strftime("%Y-%m-%d").astype(object)
+    row_ids = pd.Series(out.index.astype(str), index=out.index, dtype=object)
+    suffix = issue_day.where(out["issue_date"].notna(), row_ids)
+    out["bond_id"] = "CBI-" + issuer + "-" + suffix
 
     for col in COMMON_COLS:
         if col not in out.columns:
@@ -297,7 +336,11 @@ def normalize_kaggle(path: Path) -> pd.DataFrame:
     If another Kaggle file is passed that does not match this schema
     (e.g. index or ETF NAV), we currently skip it for bonds.csv.
     """
-    df = pd.read_csv(path)
+    return normalize_kaggle_frame(pd.read_csv(path), path=path)
+
+
+def normalize_kaggle_frame(df: pd.DataFrame, path: Optional[Path] = None) -> pd.DataFrame:
+    """normalize an already-loaded Kaggle frame or chunk (see normalize_kaggle)."""
 
     cols = set(df.columns)
     if "Issuer Name" not in cols or "Amount issued (USD bn.)" not in cols:
@@ -308,7 +351,9 @@ def normalize_kaggle(path: Path) -> pd.DataFrame:
         return pd.DataFrame(columns=COMMON_COLS)
 
     # map kaggle global dataset fields into common schema
-    out = pd.DataFrame()
+    # same index as the source so scalar assignments (like source_dataset)
+    # broadcast to every row instead of landing in an empty frame
+    out = pd.DataFrame(index=df.index)
     out["source_dataset"] = "kaggle_global_sustainable"
 
     out["issuer_name"] = df["Issuer Name"]
@@ -319,27 +364,11 @@ def normalize_kaggle(path: Path) -> pd.DataFrame:
     out["use_of_proceeds"] = df["Bond type"]
 
     # Amount issued in USD
-    # parse 'Amount issued (USD bn.)' strings into numeric dollars
-    def parse_amount_usd(val: str) -> Optional[float]:
-        """
-        Convert strings like '0.57bn' to numeric USD amount (0.57 * 1e9).
-        """
-        if pd.isna(val):
-            return None
-        s = str(val).strip().lower()
-        try:
-            if s.endswith("bn"):
-                return float(s[:-2]) * 1e9
-            if s.endswith("m"):
-                # occasionally might show as millions
-                return float(s[:-1]) * 1e6
-            return float(s)
-        except Exception:
-            return None
-
-    out["amount_issued_usd"] = df["Amount issued (USD bn.)"].apply(
-        parse_amount_usd
-    )
+    # parse 'Amount issued (USD bn.)' strings like '0.57bn' into numeric
+    # dollars (0.57 * 1e9); occasionally they show as millions ('m')
+    amount_text = df["Amount issued (USD bn.)"]
+    tokens = py_str(amount_text).where(amount_text.notna()).str.strip().str.lower()
+    out["amount_issued_usd"] = parse_scaled_amounts(tokens)
     out["amount_issued"] = out["amount_issued_usd"]  # no local-currency breakdown
 
     # Dates are not explicit in this dataset; we leave them blank
@@ -354,19 +383,19 @@ def normalize_kaggle(path: Path) -> pd.DataFrame:
     form = df.get(form_col)
     reviewer = df.get(reviewer_col)
 
-    def combine_review(row):
-        f = str(row.get(form_col, "")).strip()
-        r = str(row.get(reviewer_col, "")).strip()
-        if f and r and f != "nan" and r != "nan":
-            return f"{f} by {r}"
-        if r and r != "nan":
-            return r
-        if f and f != "nan":
-            return f
-        return None
-
     if form is not None or reviewer is not None:
-        out["external_review_type"] = df.apply(combine_review, axis=1)
+        # "<form> by <reviewer>", or whichever of the two is present
+        empty = pd.Series("", index=df.index, dtype=object)
+        f = py_str(form).str.strip() if form is not None else empty
+        r = py_str(reviewer).str.strip() if reviewer is not None else empty
+        f_ok = (f != "") & (f != "nan")
+        r_ok = (r != "") & (r != "nan")
+        review = np.select(
+            [f_ok & r_ok, r_ok, f_ok],
+            [(f + " by " + r).to_numpy(), r.to_numpy(), f.to_numpy()],
+            default=None,
+        )
+        out["external_review_type"] = pd.Series(review, index=df.index, dtype=object)
     else:
         out["external_review_type"] = None
 
@@ -382,13 +411,11 @@ def normalize_kaggle(path: Path) -> pd.DataFrame:
     out["isin"] = None
 
     # bond_id synthetic: issuer + row index
-    # synthethic bond id for kaggle rows
-    def mk_id(row):
-        issuer = str(row["issuer_name"]).strip().replace(" ", "_")[:30]
-        idx = row.name
-        return f"KAG-{issuer}-{idx}"
-
-    out["bond_id"] = out.apply(mk_id, axis=1)
+    issuer = (
+        py_str(out["issuer_name"]).str.strip().str.replace(" ", "_", regex=False).str[:30]
+    )
+    row_ids = pd.Series(out.index.astype(str), index=out.index, dtype=object)
+    out["bond_id"] = "KAG-" + issuer + "-" + row_ids
 
     # Make sure all common columns exist
     for col in COMMON_COLS:
@@ -399,22 +426,739 @@ def normalize_kaggle(path: Path) -> pd.DataFrame:
 
 
 # ------------------------------
-# adb placeholder
+# adb impact workbook
 # ------------------------------
 
+ADB_ISSUER = "Asian Development Bank"
+ADB_IMPACT_SOURCE = "ADB Green & Blue Bond Impact Report"
+
+# header cell -> field, checked in order (energy before allocation so that
+# "amount of energy generated (MWh)" is not read as an amount issued)
+ADB_HEADER_FIELDS = [
+    ("bond_id", re.compile(r"\bisin\b|\bbond\b.*\b(id|code|no|number|series)\b")),
+    ("project_id", re.compile(r"\bproject\b.*\b(no|number|id|code)\b")),
+    ("project_name", re.compile(r"\bproject\b.*\b(name|title)\b|^project$")),
+    ("country", re.compile(r"\bcountry\b|\beconomy\b")),
+    ("co2", re.compile(r"ghg|co2|carbon|emission")),
+    ("mwh", re.compile(r"\b[kmgt]wh\b|[kmgt]wh/")),
+    ("allocation", re.compile(r"allocat|disburs|amount|financing")),
+]
+# impact columns whose header says so are ex-post; everything else is the
+# expected (claimed) figure the report publishes
+ADB_ACTUAL_RE = re.compile(r"actual|achieved|reali[sz]ed|ex[- ]?post|to date")
+# total rows carry a whole section's sums; the word can sit anywhere in the
+# label ("Renewable Energy Total", "Total – Water", "Subtotal")
+ADB_SKIP_ROW_RE = re.compile(r"\b(sub)?total\b|^source:|^note")
+
+
+def _adb_scale(field: str, header: str) -> float:
+    """unit multiplier from a header like 'GHG reduction (ktCO2e/yr)' or '($ million)'."""
+    if field == "allocation":
+        if re.search(r"billion|\bbn\b", header):
+            return 1e9
+        if re.search(r"million|\bmn\b|\$\s?m\b|usd\s?m\b", header):
+            return 1e6
+        if re.search(r"thousand|'000|\$\s?k\b", header):
+            return 1e3
+    elif field == "co2":
+        if re.search(r"\bmt\b|mtco2|million", header):
+            return 1e6
+        if re.search(r"\bkt\b|ktco2|thousand|'000", header):
+            return 1e3
+    elif field == "mwh":
+        match = re.search(r"\b([kmgt])wh", header)
+        unit = match.group(1) if match else "m"
+        return {"k": 1e-3, "m": 1.0, "g": 1e3, "t": 1e6}[unit]
+    return 1.0
+
+
+def _adb_header_map(cells: List[str]) -> Dict[int, Tuple[str, float]]:
+    """
+    column index -> (field, unit scale) when the row looks like a table
+    header (an id/name column plus at least one amount or impact column).
+    """
+    mapping: Dict[int, Tuple[str, float]] = {}
+    for col, text in enumerate(cells):
+        if not text:
+            continue
+        for field, pattern in ADB_HEADER_FIELDS:
+            if pattern.search(text):
+                if field in ("co2", "mwh"):
+                    kind = "actual" if ADB_ACTUAL_RE.search(text) else "claimed"
+                    field = f"{field}_{kind}"
+                if field not in (f for f, _ in mapping.values()):
+                    mapping[col] = (field, _adb_scale(field.split("_")[0], text))
+                break
+    fields = {f for f, _ in mapping.values()}
+    has_key = bool(fields & {"bond_id", "project_id", "project_name"})
+    has_value = bool(fields - {"bond_id", "project_id", "project_name", "country"})
+    return mapping if has_key and has_value else {}
+
+
+def _adb_id_field(header: Dict[int, Tuple[str, float]]) -> Optional[str]:
+    """the table's id column (bond id / ISIN before project no.), if it has one."""
+    fields = {f for f, _ in header.values()}
+    for field in ("bond_id", "project_id"):
+        if field in fields:
+            return field
+    return None
+
+
+def _adb_number(value) -> float:
+    if value is None or isinstance(value, bool):
+        return np.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().replace(",", "").replace("$", "")
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+
+class _AdbBond:
+    """running totals for one bond (or project, when the sheet has no bond column)."""
+
+    METRICS = ("allocation", "co2_claimed", "co2_actual", "mwh_claimed", "mwh_actual")
+
+    def __init__(self):
+        self.countries: Dict[str, None] = {}
+        self.sections: Dict[str, None] = {}
+        self.totals = {m: np.nan for m in self.METRICS}
+        self.projects = 0
+
+    def add(self, values: Dict[str, float], country: Optional[str], section: Optional[str]):
+        self.projects += 1
+        if country:
+            self.countries[country] = None
+        if section:
+            self.sections[section] = None
+        for metric, value in values.items():
+            if not np.isnan(value):
+                total = self.totals[metric]
+                self.totals[metric] = value if np.isnan(total) else total + value
+
+
 def normalize_adb(path: Path) -> pd.DataFrame:
     """
-    Placeholder for ADB Green & Blue Bond Impact Report.
-    The Excel layout is complex (multiple sections / headings).
+    Parse the ADB Green & Blue Bond Impact Report workbook.
+
+    the sheets are multi-section tables: a section title row (e.g.
+    'Renewable Energy', 'Blue Bond Projects'), then a header row, then
+    project rows and subtotals. sheets are streamed with openpyxl in
+    read-only mode, so only one row plus the per-bond running totals are
+    held in memory:
+        - header rows are recognized by their column names (project /
+          bond id, country, allocation, GHG, MWh) and give the unit scale
+          of each column ('$ million', 'ktCO2e', 'GWh', ...)
+        - a lone text cell outside a table is a section title and becomes
+          use_of_proceeds for the rows below it
+        - project rows are summed per bond id when the table has one,
+          otherwise per project (ADB reports allocate at project level)
+        - GHG columns map to claimed/actual_impact_co2_tons and energy
+          columns to claimed/actual_energy_mwh (ex-post when the header
+          says actual/achieved, expected otherwise)
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        print("[normalize_adb] openpyxl is not installed – skipping ADB workbook.")
+        return pd.DataFrame(columns=COMMON_COLS)
+
+    t0 = time.perf_counter()
+    bonds: Dict[str, _AdbBond] = {}
+    n_rows = 0
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            # don't trust (or compute) the stored <dimension>; rows come back
+            # with their own lengths
+            sheet.reset_dimensions()
+            header: Dict[int, Tuple[str, float]] = {}
+            id_field: Optional[str] = None
+            section: Optional[str] = None
+            for row in sheet.iter_rows(values_only=True):
+                n_rows += 1
+                cells = ["" if v is None else str(v).strip() for v in row]
+                filled = [c for c in cells if c]
+                if not filled:
+                    continue
+
+                # header rows are all text; only those go through the regexes
+                if not any(isinstance(v, (int, float)) for v in row):
+                    row_header = _adb_header_map([c.lower() for c in cells])
+                    if row_header:
+                        header = row_header
+                        id_field = _adb_id_field(header)
+                        continue
+                if ADB_SKIP_ROW_RE.search(filled[0].lower()):
+                    continue
+                if len(filled) == 1 and np.isnan(_adb_number(filled[0])):
+                    # lone text cell: section title; the next table needs its own header
+                    section = filled[0]
+                    header, id_field = {}, None
+                    continue
+                if not header:
+                    continue
+
+                record: Dict[str, object] = {}
+                values: Dict[str, float] = {}
+                for col, (field, scale) in header.items():
+                    raw = row[col] if col < len(row) else None
+                    if field in _AdbBond.METRICS:
+                        values[field] = _adb_number(raw) * scale
+                    elif raw is not None and str(raw).strip():
+                        record[field] = str(raw).strip()
+
+                # a blank id in a table that has an id column is a total /
+                # summary row, not a project
+                if id_field is not None and id_field not in record:
+                    continue
+                key = record.get("bond_id") or record.get("project_id") or record.get("project_name")
+                if not key:
+                    continue
+                bonds.setdefault(str(key), _AdbBond()).add(
+                    values, record.get("country"), section
+                )
+    finally:
+        workbook.close()
+
+    keys = list(bonds)
+    out = pd.DataFrame(index=pd.RangeIndex(len(keys)))
+    out["source_dataset"] = "adb"
+    out["isin"] = [k if re.fullmatch(r"[A-Z]{2}[A-Z0-9]{9}[0-9]", k) else None for k in keys]
+    out["issuer_name"] = ADB_ISSUER
+    out["issuer_type"] = "Multilateral Dev Bank"
+    out["country"] = [
+        next(iter(b.countries)) if len(b.countries) == 1 else ("Multiple" if b.countries else None)
+        for b in bonds.values()
+    ]
+    out["currency"] = "USD"
+    out["amount_issued_usd"] = [b.totals["allocation"] for b in bonds.values()]
+    out["amount_issued"] = out["amount_issued_usd"]
+    out["issue_date"] = pd.NaT
+    out["issue_year"] = np.nan
+    out["maturity_date"] = pd.NaT
+    out["maturity_year"] = np.nan
+    out["use_of_proceeds"] = ["; ".join(b.sections) or None for b in bonds.values()]
+    out["external_review_type"] = None
+    out["certification"] = None
+    out["claimed_impact_co2_tons"] = [b.totals["co2_claimed"] for b in bonds.values()]
+    out["actual_impact_co2_tons"] = [b.totals["co2_actual"] for b in bonds.values()]
+    out["claimed_energy_mwh"] = [b.totals["mwh_claimed"] for b in bonds.values()]
+    out["actual_energy_mwh"] = [b.totals["mwh_actual"] for b in bonds.values()]
+    out["impact_source"] = ADB_IMPACT_SOURCE
+    out["bond_id"] = ["ADB-" + re.sub(r"\s+", "_", k) for k in keys]
+
+    for col in COMMON_COLS:
+        if col not in out.columns:
+            out[col] = np.nan
+
+    seconds = time.perf_counter() - t0
+    print(
+        f"[normalize_adb] {n_rows} rows in {len(workbook.worksheets)} sheets -> "
+        f"{len(out)} bonds in {seconds:.2f} s ({n_rows / max(seconds, 1e-9):,.0f} rows/s)"
+    )
+    return out[COMMON_COLS]
+
+
+# ------------------------------
+# output + streaming ingestion
+# ------------------------------
+
+NUMERIC_COLS = [
+    "amount_issued",
+    "amount_issued_usd",
+    "issue_year",
+    "maturity_year",
+    "claimed_impact_co2_tons",
+    "actual_impact_co2_tons",
+    "claimed_energy_mwh",
+    "actual_energy_mwh",
+]
+DATE_COLS = ["issue_date", "maturity_date"]
+
+# added after COMMON_COLS when --resolve-entities merges rows: "source:bond_id|..."
+LINEAGE_COL = "source_lineage"
+
+# csv sources: name -> (frame normalizer, read_csv kwargs)
+CSV_SOURCES = {
+    "world_bank": (normalize_world_bank_frame, {}),
+    "kapsarc": (normalize_kapsarc_frame, {"sep": ";"}),
+    "cbi": (normalize_cbi_frame, {}),
+    "kaggle": (normalize_kaggle_frame, {}),
+}
+
+# bump a source's version whenever its normalizer output changes, so
+# cached intermediates from older builds are not reused
+NORMALIZER_VERSIONS = {
+    "world_bank": "3",
+    "kapsarc": "3",
+    "cbi": "3",
+    "kaggle": "3",
+    "adb": "3",
+}
+
+# whole-file loaders, in build order
+SOURCE_LOADERS = {
+    "world_bank": normalize_world_bank,
+    "kapsarc": normalize_kapsarc,
+    "cbi": normalize_cbi,
+    "kaggle": normalize_kaggle,
+    "adb": normalize_adb,
+}
+
+DEFAULT_CHUNKSIZE = 50_000
+
+
+def finalize_output(df: pd.DataFrame, columns: List[str] = COMMON_COLS) -> pd.DataFrame:
+    """
+    fix the on-disk representation of a unified frame so it does not depend
+    on which rows happen to be in it: numeric columns as float64, dates as
+    YYYY-MM-DD strings. used by both batch and streaming writes.
+    """
+    out = df.copy()
+    for col in columns:
+        if col not in out.columns:
+            out[col] = np.nan
+    out = out[columns]
+    for col in NUMERIC_COLS:
+        out[col] = pd.to_numeric(out[col], errors="coerce").astype("float64")
+    for col in DATE_COLS:
+        dates = pd.to_datetime(out[col], errors="coerce")
+        out[col] = dates.dt.strftime("%Y-%m-%d").astype(object).where(dates.notna(), None)
+    return out
+
+
+def dedupe_keys(df: pd.DataFrame) -> np.ndarray:
+    """
+    64-bit hash of (isin, bond_id) per row; nulls share one sentinel so the
+    keys agree with drop_duplicates(subset=["isin", "bond_id"]).
+    """
+    isin = py_str(df["isin"]).where(df["isin"].notna(), "\x00")
+    key = isin + "\x1f" + py_str(df["bond_id"])
+    return pd.util.hash_pandas_object(key, index=False).to_numpy()
+
+
+class SeenKeys:
+    """
+    compact set of uint64 keys: a few sorted runs that are merged when a
+    newer run grows as large as an older one (so inserts stay cheap and
+    lookups are one searchsorted per run). 8 bytes per distinct row.
+    """
+
+    def __init__(self):
+        self._runs: List[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return sum(len(r) for r in self._runs)
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(keys), dtype=bool)
+        for run in self._runs:
+            pos = np.searchsorted(run, keys)
+            pos[pos == len(run)] = 0
+            found |= run[pos] == keys
+        return found
+
+    def add(self, keys: np.ndarray) -> None:
+        if not len(keys):
+            return
+        run = np.unique(keys)
+        while self._runs and len(self._runs[-1]) <= len(run):
+            run = np.union1d(self._runs.pop(), run)
+        self._runs.append(run)
+
+
+def new_rows_mask(df: pd.DataFrame, seen: SeenKeys) -> np.ndarray:
+    """rows whose (isin, bond_id) was not seen before (first occurrence wins)."""
+    keys = dedupe_keys(df)
+    mask = ~pd.Series(keys).duplicated(keep="first").to_numpy()
+    if len(seen):
+        mask &= ~seen.contains(keys)
+    seen.add(keys[mask])
+    return mask
+
+
+def resolve_chunk_dtypes(kinds: Dict[str, set]) -> Dict[str, str]:
+    """
+    dtype a whole-file read_csv gives each column whose inferred kind varied
+    between chunks: int + float -> float64, text + all-blank float -> str.
+    """
+    pinned: Dict[str, str] = {}
+    for col, k in kinds.items():
+        if len(k) < 2:
+            continue
+        if k <= {"i", "f"}:
+            pinned[col] = "float64"
+        elif "O" in k:
+            pinned[col] = "str"
+    return pinned
+
+
+def probe_csv_dtypes(path: Path, read_kwargs: dict, chunksize: int) -> Dict[str, str]:
+    """
+    dtypes a full read_csv would give the columns whose type varies by chunk.
+    chunks are typed independently (an int column turns float only in chunks
+    with blanks, a text column is float in an all-blank chunk), which would
+    leak into string ids like KAPSARC-2015-...; pinning those columns keeps
+    chunked normalization identical to the whole-file read.
+    """
+    kinds: Dict[str, set] = {}
+    for chunk in pd.read_csv(path, chunksize=chunksize, **read_kwargs):
+        for col, dtype in chunk.dtypes.items():
+            kinds.setdefault(col, set()).add(dtype.kind)
+    return resolve_chunk_dtypes(kinds)
+
+
+def normalize_chunk(name: str, chunk: pd.DataFrame, path: Path) -> pd.DataFrame:
+    normalize, _ = CSV_SOURCES[name]
+    return normalize(chunk, path=path) if name == "kaggle" else normalize(chunk)
+
+
+def iter_raw_chunks(name: str, path: Path, chunksize: int) -> Iterator[pd.DataFrame]:
+    """raw csv chunks with dtypes pinned to what a whole-file read gives."""
+    _, read_kwargs = CSV_SOURCES[name]
+    dtypes = probe_csv_dtypes(path, read_kwargs, chunksize)
+    yield from pd.read_csv(path, chunksize=chunksize, dtype=dtypes or None, **read_kwargs)
+
+
+def read_raw_parts(name: str, path: Path, chunksize: int) -> List[pd.DataFrame]:
+    """
+    whole csv read once in chunks (for splitting a large source across
+    workers); columns whose kind differs between chunks are cast afterwards
+    instead of probing the file a second time.
+    """
+    _, read_kwargs = CSV_SOURCES[name]
+    parts = list(pd.read_csv(path, chunksize=chunksize, **read_kwargs))
+    kinds: Dict[str, set] = {}
+    for part in parts:
+        for col, dtype in part.dtypes.items():
+            kinds.setdefault(col, set()).add(dtype.kind)
+    pinned = resolve_chunk_dtypes(kinds)
+    if pinned:
+        parts = [part.astype(pinned) for part in parts]
+    return parts
+
+
+def iter_source_chunks(
+    name: str, path: Path, chunksize: int
+) -> Iterator[pd.DataFrame]:
+    """normalized chunks for one source (ADB is an Excel file and read whole)."""
+    if name == "adb":
+        yield normalize_adb(path)
+        return
+    for chunk in iter_raw_chunks(name, path, chunksize):
+        yield normalize_chunk(name, chunk, path)
+
+
+# ------------------------------
+# parallel normalization
+# ------------------------------
+
+# (source name, path, raw chunk or None for "load the whole file")
+Task = Tuple[str, Path, Optional[pd.DataFrame]]
+
+# large csv sources are split into chunks across workers in batch mode
+DEFAULT_SPLIT_MB = 32
+
+
+def run_task(name: str, path: Path, chunk: Optional[pd.DataFrame]) -> Tuple[pd.DataFrame, float]:
+    """normalize one task (runs in a worker process when --jobs > 1)."""
+    t0 = time.perf_counter()
+    if chunk is None:
+        out = SOURCE_LOADERS[name](path)
+    else:
+        out = normalize_chunk(name, chunk, path)
+    return out, time.perf_counter() - t0
+
+
+class SourceTimings:
+    """
+    per-source parts / rows / main-process read time / worker normalize
+    time, and whether the source came from the build cache.
+    """
+
+    def __init__(self, names: List[str]):
+        self.stats: Dict[str, Dict[str, float]] = {
+            name: {"parts": 0, "rows": 0, "read_s": 0.0, "normalize_s": 0.0, "cached": 0}
+            for name in names
+        }
+        self.t0 = time.perf_counter()
+
+    def add(self, name: str, **values: float) -> None:
+        for key, value in values.items():
+            self.stats[name][key] += value
+
+    def report(self) -> None:
+        print(
+            f"{'source':<12} {'parts':>6} {'rows':>10} {'read s':>8} "
+            f"{'normalize s':>12} {'cached':>7}"
+        )
+        for name, e in self.stats.items():
+            print(
+                f"{name:<12} {int(e['parts']):>6} {int(e['rows']):>10} "
+                f"{e['read_s']:>8.2f} {e['normalize_s']:>12.2f} "
+                f"{'yes' if e['cached'] else 'no':>7}"
+            )
+        print(f"normalization wall time: {time.perf_counter() - self.t0:.2f} s")
+
+
+def iter_tasks(
+    sources: List[Tuple[str, Path]],
+    timings: SourceTimings,
+    stream: bool,
+    chunksize: int,
+    split_bytes: Optional[int],
+) -> Iterator[Task]:
+    """
+    tasks in output order. stream mode always chunks csv sources; batch mode
+    only splits csv files larger than split_bytes (None = never split).
+    """
+    for name, path in sources:
+        chunked = name in CSV_SOURCES and (
+            stream or (split_bytes is not None and path.stat().st_size > split_bytes)
+        )
+        if not chunked:
+            yield name, path, None
+            continue
+
+        t0 = time.perf_counter()
+        parts = (
+            iter_raw_chunks(name, path, chunksize)
+            if stream
+            else iter(read_raw_parts(name, path, chunksize))
+        )
+        for part in parts:
+            timings.add(name, read_s=time.perf_counter() - t0)
+            yield name, path, part
+            t0 = time.perf_counter()
+
+
+def run_tasks(
+    tasks: Iterator[Task], jobs: int, timings: SourceTimings
+) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    normalize tasks and yield (source, frame) in task order. with jobs > 1 they run
+    in a process pool with at most 2 * jobs tasks in flight, so streaming
+    memory stays bounded and the merge order never depends on scheduling.
+    """
 
-    For now, returns an empty frame. Later will:
-        - Identify project rows
-        - Aggregate to bond-level (if there's a bond identifier)
-        - Map CO2/MWh metrics into claimed/actual impact.
+    def record(name: str, result: Tuple[pd.DataFrame, float]) -> Tuple[str, pd.DataFrame]:
+        out, seconds = result
+        timings.add(name, parts=1, rows=len(out), normalize_s=seconds)
+        return name, out
+
+    if jobs <= 1:
+        for name, path, chunk in tasks:
+            yield record(name, run_task(name, path, chunk))
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending: Deque[Tuple[str, Future]] = deque()
+        for name, path, chunk in tasks:
+            pending.append((name, pool.submit(run_task, name, path, chunk)))
+            if len(pending) >= 2 * jobs:
+                done_name, future = pending.popleft()
+                yield record(done_name, future.result())
+        while pending:
+            done_name, future = pending.popleft()
+            yield record(done_name, future.result())
+
+
+class OutputWriter:
     """
-    _ = pd.read_excel(path)
-    # TODO: parse actual impact metrics and map to bonds
-    return pd.DataFrame(columns=COMMON_COLS)
+    append unified rows to csv or parquet; data goes to a temp file next to
+    the target and is moved into place on close().
+    """
+
+    def __init__(self, path: Path, fmt: str = "csv", columns: List[str] = COMMON_COLS):
+        self.path = path
+        self.fmt = fmt
+        self.columns = columns
+        self.rows = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+        os.close(fd)
+        self._tmp = Path(tmp)
+        self._writer = None
+        if fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            fields = [
+                pa.field(col, pa.float64() if col in NUMERIC_COLS else pa.string())
+                for col in columns
+            ]
+            self._schema = pa.schema(fields)
+            self._writer = pq.ParquetWriter(self._tmp, self._schema)
+
+    def write(self, df: pd.DataFrame) -> None:
+        out = finalize_output(df, self.columns)
+        if self.fmt == "parquet":
+            import pyarrow as pa
+
+            for col in self.columns:
+                if col not in NUMERIC_COLS:
+                    out[col] = py_str(out[col]).where(out[col].notna(), None)
+            table = pa.Table.from_pandas(out, schema=self._schema, preserve_index=False)
+            self._writer.write_table(table)
+        else:
+            out.to_csv(self._tmp, mode="a", index=False, header=self.rows == 0)
+        self.rows += len(out)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        elif self.rows == 0:
+            finalize_output(pd.DataFrame(), self.columns).to_csv(self._tmp, index=False)
+        os.replace(self._tmp, self.path)
+
+    def abort(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._tmp.unlink(missing_ok=True)
+
+
+def build_batch(
+    sources: List[Tuple[str, Path]],
+    output: Path,
+    fmt: str = "csv",
+    jobs: int = 1,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    split_mb: float = DEFAULT_SPLIT_MB,
+    cache_dir: Optional[Path] = None,
+    resolve: bool = False,
+) -> int:
+    """
+    load every source, concat, de-dupe, write (the original path). with a
+    cache_dir, sources whose input hash and normalizer version match the
+    build manifest are loaded from their cached intermediate instead. with
+    resolve, cross-source duplicates are collapsed (see resolve_entities.py)
+    and a source_lineage column is added.
+    """
+    manifest = BuildManifest(cache_dir) if cache_dir is not None else None
+    timings = SourceTimings([name for name, _ in sources])
+
+    per_source: Dict[str, List[pd.DataFrame]] = {}
+    todo: List[Tuple[str, Path]] = []
+    for name, path in sources:
+        cached = manifest.load(name, path, NORMALIZER_VERSIONS[name]) if manifest else None
+        if cached is not None:
+            print(f"Using cached {name} dataset for {path}")
+            per_source[name] = [cached]
+            timings.add(name, rows=len(cached), cached=1)
+        else:
+            print(f"Loading {name} dataset from {path}")
+            todo.append((name, path))
+
+    split_bytes = int(split_mb * 1024 * 1024) if jobs > 1 else None
+    tasks = iter_tasks(todo, timings, False, chunksize, split_bytes)
+    for name, out in run_tasks(tasks, jobs, timings):
+        per_source.setdefault(name, []).append(out)
+    timings.report()
+
+    frames: List[pd.DataFrame] = []
+    for name, path in sources:
+        parts = per_source[name]
+        frame = parts[0] if len(parts) == 1 else pd.concat(parts)
+        if manifest is not None and (name, path) in todo:
+            manifest.store(name, path, NORMALIZER_VERSIONS[name], frame)
+        frames.append(frame)
+    if manifest is not None:
+        manifest.save()
+
+    combined = pd.concat(frames, ignore_index=True)
+
+    # Drop obvious duplicates by ISIN when present
+    if "isin" in combined.columns:
+        combined = combined.drop_duplicates(subset=["isin", "bond_id"], keep="first")
+
+    columns = COMMON_COLS
+    if resolve:
+        combined, stats = resolve_entities(combined)
+        print(format_stats(stats))
+        columns = COMMON_COLS + [LINEAGE_COL]
+
+    writer = OutputWriter(output, fmt, columns)
+    try:
+        writer.write(combined)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+    return writer.rows
+
+
+def build_streaming(
+    sources: List[Tuple[str, Path]],
+    output: Path,
+    fmt: str = "csv",
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    jobs: int = 1,
+) -> int:
+    """
+    same output as build_batch, but each source is read, normalized,
+    de-duplicated and appended chunk by chunk; only the seen-key set
+    (8 bytes per distinct row) is kept across chunks.
+    """
+    for name, path in sources:
+        print(f"Streaming {name} dataset from {path} (chunks of {chunksize})")
+
+    timings = SourceTimings([name for name, _ in sources])
+    seen = SeenKeys()
+    writer = OutputWriter(output, fmt)
+    try:
+        tasks = iter_tasks(sources, timings, True, chunksize, None)
+        for _, chunk in run_tasks(tasks, jobs, timings):
+            if len(chunk):
+                writer.write(chunk[new_rows_mask(chunk, seen)])
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+    timings.report()
+    return writer.rows
+
+
+def check_identity(
+    sources: List[Tuple[str, Path]], fmt: str, chunksize: int, jobs: int = 1
+) -> bool:
+    """
+    build serially in batch mode, then with streaming (and the parallel
+    batch path when jobs > 1), and compare the files byte for byte.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = Path(tmp) / f"batch.{fmt}"
+        build_batch(sources, reference, fmt)
+
+        candidates = {"stream": Path(tmp) / f"stream.{fmt}"}
+        build_streaming(sources, candidates["stream"], fmt, chunksize, jobs)
+        if jobs > 1:
+            # split every csv source so the chunked parallel path is exercised
+            candidates["parallel"] = Path(tmp) / f"parallel.{fmt}"
+            build_batch(sources, candidates["parallel"], fmt, jobs, chunksize, split_mb=0)
+
+        same = True
+        for label, path in candidates.items():
+            if fmt == "parquet":
+                # parquet row-group layout differs by design; compare the data
+                ok = pd.read_parquet(reference).equals(pd.read_parquet(path))
+            else:
+                ok = filecmp.cmp(reference, path, shallow=False)
+            print(
+                f"identity check ({label} vs batch, {fmt}, chunksize={chunksize}, "
+                f"jobs={jobs}): {'OK' if ok else 'MISMATCH'}"
+            )
+            same = same and ok
+    return same
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
 
 
 # ------------------------------
@@ -431,50 +1175,96 @@ def main():
     parser.add_argument("--kaggle", type=Path, help="Kaggle green bonds CSV (optional)")
     parser.add_argument("--adb", type=Path, help="ADB Green & Blue Bond Impact Excel (optional)")
     parser.add_argument("--output", type=Path, required=True, help="Output unified CSV path")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read/normalize/de-dupe/write each source in chunks (flat memory)",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=DEFAULT_CHUNKSIZE,
+        help=f"Rows per chunk in --stream mode (default {DEFAULT_CHUNKSIZE})",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="Output format (parquet needs pyarrow)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for normalization (sources and chunks run in parallel)",
+    )
+    parser.add_argument(
+        "--split-mb",
+        type=float,
+        default=DEFAULT_SPLIT_MB,
+        help=f"With --jobs, split csv sources larger than this into --chunksize parts "
+        f"(default {DEFAULT_SPLIT_MB})",
+    )
+    parser.add_argument(
+        "--resolve-entities",
+        action="store_true",
+        help="Merge the same bond across sources into one row with a source_lineage "
+        "column (batch mode)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="Build manifest + per-source intermediates (batch mode)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-normalize every source and leave the build cache untouched",
+    )
+    parser.add_argument(
+        "--check-identity",
+        action="store_true",
+        help="Build with batch and streaming modes and verify identical output",
+    )
 
     args = parser.parse_args()
 
-    frames: List[pd.DataFrame] = []
-
-    if args.world_bank and args.world_bank.exists():
-        print(f"Loading World Bank dataset from {args.world_bank}")
-        frames.append(normalize_world_bank(args.world_bank))
-
-    if args.kapsarc and args.kapsarc.exists():
-        print(f"Loading KAPSARC dataset from {args.kapsarc}")
-        frames.append(normalize_kapsarc(args.kapsarc))
+    sources: List[Tuple[str, Path]] = []
+    for name in SOURCE_LOADERS:
+        path = getattr(args, name)
+        if path and path.exists():
+            sources.append((name, path))
 
-    if args.cbi and args.cbi.exists():
-        print(f"Loading CBI dataset from {args.cbi}")
-        frames.append(normalize_cbi(args.cbi))
-
-    if args.kaggle and args.kaggle.exists():
-        print(f"Loading Kaggle dataset from {args.kaggle}")
-        frames.append(normalize_kaggle(args.kaggle))
-
-    if args.adb and args.adb.exists():
-        print(f"Loading ADB dataset from {args.adb}")
-        frames.append(normalize_adb(args.adb))
-
-    if not frames:
+    if not sources:
         raise SystemExit("No input datasets found. Provide at least one.")
 
-    combined = pd.concat(frames, ignore_index=True)
+    jobs = max(args.jobs, 1)
+    if args.check_identity and not check_identity(
+        sources, args.format, args.chunksize, jobs
+    ):
+        raise SystemExit("Streaming/parallel output differs from batch output.")
 
-    # Drop obvious duplicates by ISIN when present
-    if "isin" in combined.columns:
-        combined = combined.drop_duplicates(subset=["isin", "bond_id"], keep="first")
-
-    # Ensure all common columns present
-    for col in COMMON_COLS:
-        if col not in combined.columns:
-            combined[col] = np.nan
+    if args.stream and args.resolve_entities:
+        raise SystemExit("--resolve-entities needs the whole table; drop --stream.")
 
-    combined = combined[COMMON_COLS]
+    if args.stream:
+        n_rows = build_streaming(sources, args.output, args.format, args.chunksize, jobs)
+    else:
+        cache_dir = None if args.no_cache else args.cache_dir
+        n_rows = build_batch(
+            sources,
+            args.output,
+            args.format,
+            jobs,
+            args.chunksize,
+            args.split_mb,
+            cache_dir,
+            args.resolve_entities,
+        )
 
-    args.output.parent.mkdir(parents=True, exist_ok=True)
-    combined.to_csv(args.output, index=False)
-    print(f"Wrote unified bonds file with {len(combined)} rows to {args.output}")
+    print(f"Wrote unified bonds file with {n_rows} rows to {args.output}")
+    print(f"Peak RSS: {peak_rss_mb():.1f} MB")
 
 
 if __name__ == "__main__":
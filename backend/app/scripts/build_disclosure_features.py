@@ -0,0 +1,371 @@
+#!/usr/bin/env python
+"""
+Build the disclosure feature store and the bond -> disclosure mapping used by
+GET /api/bonds/{bond_id}.
+
+feature store (app/data/disclosure_features.npz, see
+app/data/disclosure_features.py): for every text in disclosures_texts the
+rule-model TextFeatures, the ml handcrafted features and, when the model
+artifacts are installed, the transparency encoder and impact sentence
+embeddings. rows are keyed by the text's sha256 and only recomputed when the
+text changes (or the encoders do); --force recomputes everything. after an
+edit to the keyword lists only the documents containing an added or removed
+keyword are re-scored (inverted term index, app/data/disclosure_terms.py).
+
+bond mapping (app/data/bond_disclosures.csv): issuer names from bonds.csv are
+matched against each disclosure's file name and title page:
+
+    - a name in the file name always matches ("Barclays-220913")
+    - otherwise the name must be on the title page (first HEAD_CHARS chars)
+      and mentioned MIN_TEXT_MENTIONS+ times (MIN_SINGLE_TOKEN_MENTIONS+ for
+      one-word names); the most mentioned name wins, together with longer
+      or shorter multi-word spellings of it
+    - kapsarc rows are country aggregates and never mapped
+
+every bond of a matched issuer gets the document; a bond's documents are
+ranked file-name matches first, then by mentions.
+
+usage (run in backend dir):
+
+    python app/scripts/build_disclosure_features.py
+    python app/scripts/build_disclosure_features.py --force
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.data.disclosure_features import (  # noqa: E402
+    BOND_DISCLOSURES_CSV,
+    FEATURES_PATH,
+    load_feature_store,
+    save_feature_store,
+    text_features_to_row,
+)
+from app.data.disclosure_index import TEXT_DIR  # noqa: E402
+from app.data.disclosure_terms import TermIndex, rule_terms  # noqa: E402
+from app.data.load_bonds import BONDS_CSV  # noqa: E402
+from app.ml.features import (  # noqa: E402
+    PATTERNS,
+    Evidence,
+    extract_text_features,
+    handcrafted_features,
+    keyword_rules,
+)
+from app.ml.preprocessing import clean_text  # noqa: E402
+
+# ------------------------------
+# bond -> disclosure mapping
+# ------------------------------
+
+UNLINKED_SOURCES = {"kapsarc"}
+HEAD_CHARS = 3000
+MIN_TEXT_MENTIONS = 3
+MIN_SINGLE_TOKEN_MENTIONS = 10
+MIN_NAME_CHARS = 4
+
+# legal forms, only stripped from the end of a name so "SA Power Networks"
+# and "de Volksbank" keep their leading token
+LEGAL_SUFFIXES = {
+    "ltd", "limited", "plc", "inc", "incorporated", "corp", "corporation", "co",
+    "company", "sa", "ag", "nv", "bv", "spa", "ab", "asa", "oyj", "as", "se",
+    "llc", "lp", "pty", "gmbh", "sdn", "bhd", "pte", "jsc", "s", "a", "p", "n", "v",
+}
+
+
+def _tokens(text: str) -> List[str]:
+    # fold accents so "Aliança Geração" matches "ALIANCA GERACAO"
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    text = text.lower().replace("&", " and ")
+    return re.sub(r"[^0-9a-z]+", " ", text).split()
+
+
+def _phrase_text(text: str) -> str:
+    # space-padded token string, so " name " finds whole-word phrases
+    return " " + " ".join(_tokens(text)) + " "
+
+
+def issuer_variants(name: str) -> List[str]:
+    """
+    match keys for an issuer: the full name without trailing legal forms,
+    plus the name without its parenthetical when that still has 2+ tokens
+    ("Victoria Power Networks (Finance) Pty Ltd", but not "Paris (Ville de)").
+    """
+    variants = []
+    for text in (name, re.sub(r"\(.*?\)", " ", name)):
+        toks = _tokens(text)
+        while toks and toks[-1] in LEGAL_SUFFIXES:
+            toks.pop()
+        phrase = " ".join(toks)
+        if len(phrase) < MIN_NAME_CHARS or phrase in variants:
+            continue
+        if variants and len(toks) < 2:
+            continue
+        variants.append(phrase)
+    return variants
+
+
+def match_document(
+    doc_id: str, text: str, names: List[str], excluded: set
+) -> List[Tuple[str, str, int]]:
+    """(issuer variant, method, mentions) matched for one document."""
+    file_text = _phrase_text(doc_id)
+    head = _phrase_text(text[:HEAD_CHARS])
+    full = _phrase_text(text)
+
+    by_file, by_text = [], []
+    for name in names:
+        if name in excluded:
+            continue
+        key = f" {name} "
+        in_file = key in file_text
+        if not in_file and key not in head:
+            continue
+        mentions = full.count(key)
+        if in_file:
+            by_file.append((name, "filename", mentions))
+            continue
+        needed = MIN_TEXT_MENTIONS if " " in name else MIN_SINGLE_TOKEN_MENTIONS
+        if mentions >= needed:
+            by_text.append((name, "text", mentions))
+
+    if by_file:
+        return by_file
+    if not by_text:
+        return []
+    by_text.sort(key=lambda m: (-m[2] * len(m[0].split()), -len(m[0])))
+    best = by_text[0][0]
+    # keep multi-word spellings of the same issuer ("ferrovie dello stato" /
+    # "ferrovie dello stato italiane"), never a shorter one-word name
+    return [
+        m for m in by_text
+        if m[0] == best
+        or (" " in m[0] and (f" {m[0]} " in f" {best} " or f" {best} " in f" {m[0]} "))
+    ]
+
+
+def build_bond_disclosures(bonds: pd.DataFrame, docs: Dict[str, str]) -> pd.DataFrame:
+    linkable = bonds[~bonds["source_dataset"].isin(UNLINKED_SOURCES)]
+    linkable = linkable[linkable["issuer_name"].notna()]
+
+    bonds_by_variant: Dict[str, List[str]] = {}
+    for bond_id, issuer in zip(linkable["bond_id"].astype(str), linkable["issuer_name"].astype(str)):
+        for variant in issuer_variants(issuer):
+            bonds_by_variant.setdefault(variant, []).append(bond_id)
+    # a country name as issuer is never specific enough
+    excluded = {" ".join(_tokens(c)) for c in bonds["country"].dropna().unique()}
+    names = sorted(bonds_by_variant)
+
+    rows = []
+    for doc_id, text in sorted(docs.items()):
+        for name, method, mentions in match_document(doc_id, text, names, excluded):
+            for bond_id in dict.fromkeys(bonds_by_variant[name]):
+                rows.append((bond_id, doc_id, method, name, mentions))
+
+    df = pd.DataFrame(rows, columns=["bond_id", "doc_id", "method", "issuer_match", "mentions"])
+    if df.empty:
+        return pd.DataFrame(columns=["bond_id", "doc_id", "rank", "method", "issuer_match"])
+    df = df.drop_duplicates(["bond_id", "doc_id"])
+    df["_file_first"] = (df["method"] != "filename").astype(int)
+    df = df.sort_values(["bond_id", "_file_first", "mentions", "doc_id"], ascending=[True, True, False, True])
+    df["rank"] = df.groupby("bond_id").cumcount()
+    return df[["bond_id", "doc_id", "rank", "method", "issuer_match"]].reset_index(drop=True)
+
+
+# ------------------------------
+# feature store
+# ------------------------------
+
+def _encoders() -> Tuple[Optional[object], Optional[object], Dict[str, Optional[str]]]:
+    """embedding functions + encoder names; None where the ml stack is missing."""
+    transparency_fn = impact_fn = None
+    names: Dict[str, Optional[str]] = {"transparency_model": None, "impact_text_model": None}
+    try:
+        from app.ml.transparency_model_ml import encoder_name, transparency_embeddings
+
+        names["transparency_model"] = encoder_name()
+        if names["transparency_model"]:
+            transparency_fn = transparency_embeddings
+    except ImportError as e:
+        print(f"[features] transparency encoder unavailable ({e}) – skipping its embeddings")
+    try:
+        from app.services.impact_ml_service import impact_text_embeddings, impact_text_model_name
+
+        names["impact_text_model"] = impact_text_model_name()
+        if names["impact_text_model"]:
+            impact_fn = impact_text_embeddings
+    except ImportError as e:
+        print(f"[features] impact encoder unavailable ({e}) – skipping its embeddings")
+    return transparency_fn, impact_fn, names
+
+
+def update_feature_store(text_dir: Path = TEXT_DIR, force: bool = False) -> Dict[str, int]:
+    """
+    recompute features for new / changed texts and drop rows for removed
+    ones. when the keyword lists in app/ml/features.py changed since the store
+    was built, the term index (app/data/disclosure_terms.py) picks the
+    documents containing an added or removed keyword and only their rule
+    features are recomputed. returns counts of reused, computed, re-scored
+    and removed documents and of added / removed keywords.
+    """
+    texts = {p.stem: p.read_bytes() for p in sorted(text_dir.glob("*.txt"))}
+    hashes = {doc_id: hashlib.sha256(raw).hexdigest() for doc_id, raw in texts.items()}
+
+    transparency_fn, impact_fn, names = _encoders()
+    old = None if force else load_feature_store()
+    old_rows: Dict[str, int] = {}
+    if old is not None:
+        old_rows = {
+            d: i for d, i in old.row_of.items() if d in hashes and old.text_sha256[i] == hashes[d]
+        }
+    # embeddings are only reusable if they came from the same encoders
+    reuse_t = old is not None and old.transparency_emb is not None and (
+        old.meta.get("transparency_model") == names["transparency_model"]
+    )
+    reuse_i = old is not None and old.impact_emb is not None and (
+        old.meta.get("impact_text_model") == names["impact_text_model"]
+    )
+
+    doc_ids = list(texts)
+    todo = [d for d in doc_ids if d not in old_rows]
+    cleaned_cache: Dict[str, str] = {}
+
+    def cleaned(doc_id: str) -> str:
+        if doc_id not in cleaned_cache:
+            cleaned_cache[doc_id] = clean_text(texts[doc_id].decode("utf-8"))
+        return cleaned_cache[doc_id]
+
+    # rule changes: which unchanged documents need their rule features redone
+    rules = keyword_rules()
+    old_rules = old.meta.get("keyword_rules") if old is not None else None
+    index = TermIndex() if force else TermIndex.load()
+    index.remove_missing(doc_ids)
+    stale = index.stale_docs(hashes)
+    terms_added = terms_removed = 0
+    if old_rules is not None and old_rules != rules:
+        old_terms, new_terms = rule_terms(old_rules), rule_terms(rules)
+        terms_added, terms_removed = len(new_terms - old_terms), len(old_terms - new_terms)
+    if old is None or old_rules == rules:
+        touched = set()
+    elif old_rules is None:
+        touched = set(doc_ids)
+    elif index.rules == old_rules:
+        # documents the index saw with other text can't be trusted either
+        touched = index.affected_docs(rules)[0] | stale
+    else:
+        # no index matching the store's rules: everything is suspect
+        touched = set(doc_ids)
+    touched &= set(old_rows)
+    # handcrafted patterns are regexes, any change redoes them all (cheap)
+    patterns_changed = old is not None and old.meta.get("handcrafted_patterns") != PATTERNS
+
+    text_rows, hand_rows, evidence_rows = [], [], []
+    for d in doc_ids:
+        if d in old_rows and d not in touched:
+            text_rows.append(old.text_features[old_rows[d]])
+            evidence_rows.append(old.evidence_json(old_rows[d]))
+        else:
+            evidence = Evidence()
+            text_rows.append(text_features_to_row(extract_text_features(cleaned(d), evidence)))
+            evidence_rows.append(json.dumps(evidence.as_dict(), ensure_ascii=False))
+        if d in old_rows and not patterns_changed:
+            hand_rows.append(old.handcrafted[old_rows[d]])
+        else:
+            hand_rows.append(handcrafted_features(cleaned(d)))
+
+    # bring the term index up to date: new / changed texts, then the rules
+    if index.rules is not None and index.rules in (old_rules, rules):
+        for d in stale:
+            index.add_doc(d, hashes[d], cleaned(d), rules)
+        index.apply_rules(rules, {d: cleaned(d) for d in touched - stale})
+    else:
+        index = TermIndex(index.path)
+        for d in doc_ids:
+            index.add_doc(d, hashes[d], cleaned(d), rules)
+        index.rules = rules
+
+    def embeddings(fn, reuse: bool, old_emb: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        if fn is None or not doc_ids:
+            return None
+        need = [d for d in doc_ids if not (reuse and d in old_rows)]
+        fresh = dict(zip(need, fn([cleaned(d) for d in need]))) if need else {}
+        return np.stack([fresh[d] if d in fresh else old_emb[old_rows[d]] for d in doc_ids])
+
+    transparency_emb = embeddings(transparency_fn, reuse_t, old.transparency_emb if old else None)
+    impact_emb = embeddings(impact_fn, reuse_i, old.impact_emb if old else None)
+
+    save_feature_store(
+        FEATURES_PATH,
+        doc_ids=doc_ids,
+        text_sha256=[hashes[d] for d in doc_ids],
+        text_features=np.array(text_rows, dtype=np.float64).reshape(len(doc_ids), -1),
+        handcrafted=np.array(hand_rows, dtype=np.float32).reshape(len(doc_ids), -1),
+        evidence=evidence_rows,
+        transparency_emb=transparency_emb,
+        impact_emb=impact_emb,
+        meta={**names, "keyword_rules": rules, "handcrafted_patterns": PATTERNS},
+    )
+    index.save()
+    removed = len(set(old.row_of) - set(doc_ids)) if old is not None else 0
+    return {
+        "reused": len(old_rows) - len(touched),
+        "computed": len(todo),
+        "rescored": len(touched),
+        "removed": removed,
+        "terms_added": terms_added,
+        "terms_removed": terms_removed,
+    }
+
+
+def build_all(text_dir: Path = TEXT_DIR, force: bool = False) -> None:
+    t0 = time.perf_counter()
+    counts = update_feature_store(text_dir, force=force)
+    if counts["terms_added"] or counts["terms_removed"]:
+        print(
+            f"[features] keyword rules changed (+{counts['terms_added']} / "
+            f"-{counts['terms_removed']} terms): {counts['rescored']} of "
+            f"{counts['reused'] + counts['rescored']} unchanged documents re-scored"
+        )
+    print(
+        f"[features] {counts['computed']} computed, {counts['rescored']} re-scored, "
+        f"{counts['reused']} reused, {counts['removed']} removed -> {FEATURES_PATH}"
+    )
+
+    if not BONDS_CSV.exists():
+        print(f"[features] {BONDS_CSV} missing – skipping bond mapping")
+        return
+    bonds = pd.read_csv(BONDS_CSV, low_memory=False)
+    docs = {p.stem: p.read_text(encoding="utf-8") for p in sorted(text_dir.glob("*.txt"))}
+    mapping = build_bond_disclosures(bonds, docs)
+    mapping.to_csv(BOND_DISCLOSURES_CSV, index=False)
+    print(
+        f"[features] mapped {mapping['bond_id'].nunique()} bonds to "
+        f"{mapping['doc_id'].nunique()}/{len(docs)} disclosures -> {BOND_DISCLOSURES_CSV} "
+        f"({time.perf_counter() - t0:.2f} s)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the disclosure feature store and bond -> disclosure mapping."
+    )
+    parser.add_argument("--force", action="store_true", help="Recompute every document's features")
+    args = parser.parse_args()
+    build_all(force=args.force)
+
+
+if __name__ == "__main__":
+    main()
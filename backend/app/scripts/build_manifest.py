@@ -0,0 +1,130 @@
+# backend/app/scripts/build_manifest.py
+"""
+Content-hash build manifest shared by the offline build scripts.
+
+each build keeps a cache dir with a manifest.json and one normalized
+intermediate per source:
+
+    <cache_dir>/manifest.json
+    <cache_dir>/<source>.pkl
+
+a source's intermediate is reused when the input file's sha256 and the
+normalizer version recorded for it both match. file size + mtime are kept
+next to the hash so an untouched file is not re-hashed; a touched file with
+identical contents still hits the cache after hashing.
+
+intermediates are pickled frames so dtypes round-trip exactly and the final
+output is byte-identical to a cold build.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+MANIFEST_SCHEMA = 1
+HASH_BLOCK_BYTES = 1 << 20
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: Path, write) -> None:
+    """write via a temp file in the same dir + os.replace."""
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    os.close(fd)
+    tmp = Path(tmp_name)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+class BuildManifest:
+    """
+    per-source fingerprints + cached normalized frames for one build.
+
+        manifest = BuildManifest(cache_dir)
+        df = manifest.load(name, path, version)
+        if df is None:
+            df = normalize(path)
+            manifest.store(name, path, version, df)
+        manifest.save()
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.path = cache_dir / "manifest.json"
+        self.entries: Dict[str, dict] = {}
+        self._hashes: Dict[Path, str] = {}
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                data = {}
+            if data.get("schema") == MANIFEST_SCHEMA:
+                self.entries = data.get("sources", {})
+
+    def _intermediate(self, name: str) -> Path:
+        return self.cache_dir / f"{name}.pkl"
+
+    def _fingerprint(self, name: str, path: Path) -> dict:
+        stat = path.stat()
+        entry = self.entries.get(name, {})
+        if entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            sha = entry.get("sha256")
+        else:
+            sha = None
+        if not sha:
+            if path not in self._hashes:
+                self._hashes[path] = file_sha256(path)
+            sha = self._hashes[path]
+        return {"sha256": sha, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def load(self, name: str, path: Path, version: str) -> Optional[pd.DataFrame]:
+        """cached normalized frame for `name`, or None if the input or version changed."""
+        entry = self.entries.get(name)
+        if not entry or entry.get("version") != version:
+            return None
+        fingerprint = self._fingerprint(name, path)
+        if entry.get("sha256") != fingerprint["sha256"]:
+            return None
+        intermediate = self._intermediate(name)
+        if not intermediate.exists():
+            return None
+        try:
+            df = pd.read_pickle(intermediate)
+        except Exception:
+            return None
+        # content unchanged but the file was touched: refresh size/mtime so
+        # the next run skips hashing again
+        entry.update(fingerprint)
+        return df
+
+    def store(self, name: str, path: Path, version: str, df: pd.DataFrame) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self._intermediate(name), lambda tmp: df.to_pickle(tmp))
+        self.entries[name] = {
+            "input": str(path),
+            "version": version,
+            "rows": int(len(df)),
+            **self._fingerprint(name, path),
+        }
+
+    def save(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(
+            {"schema": MANIFEST_SCHEMA, "sources": self.entries}, indent=2, sort_keys=True
+        )
+        _write_atomic(self.path, lambda tmp: tmp.write_text(payload + "\n"))
@@ -10,18 +10,46 @@ cd green-prism/backend
         --ishares app/data/iShares_Green_Bond_Index_Fund_IE.csv \
         --output app/data/market_series.csv
 
+add --incremental to append only dates newer than what the existing output
+already holds for each symbol (daily ingestion):
+
+    python app/scripts/build_market_series.py \
+        --sp-index app/data/Green_Bond_Data.csv \
+        --ishares app/data/iShares_Green_Bond_Index_Fund_IE.csv \
+        --output app/data/market_series.csv \
+        --incremental
+
+normalized sources are cached under app/data/.build_cache/market keyed by
+input sha256 + normalizer version (see build_manifest.py); unchanged inputs
+are not re-parsed. pass --no-cache to always re-parse. with --incremental
+the date filter takes precedence over the cache: a changed input is
+normalized from `since` on only and that partial frame is not cached, so
+daily runs stay proportional to the new rows.
+
 the output schema is:
 
     symbol, date, price, yield_to_maturity, yield_to_worst, nav
 """
 
 import argparse
+import os
+import shutil
+import sys
+import tempfile
+from datetime import date
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional
 
 import numpy as np
 import pandas as pd
 
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.scripts.build_manifest import BuildManifest  # noqa: E402
+
+DEFAULT_CACHE_DIR = BACKEND_ROOT / "app" / "data" / ".build_cache" / "market"
 
 COMMON_COLS = [
     "symbol",
@@ -32,6 +60,15 @@ COMMON_COLS = [
     "nav",
 ]
 
+SP_INDEX_SYMBOL = "SP_GB_INDEX"
+ISHARES_SYMBOL = "ISHARES_GB_INDEX_IE"
+
+# bump when a normalizer's output changes so cached intermediates are rebuilt
+NORMALIZER_VERSIONS = {
+    "sp_index": "1",
+    "ishares": "1",
+}
+
 
 # ------------------------------
 # HELPERS
@@ -54,13 +91,61 @@ def parse_percent(s: str) -> Optional[float]:
         return None
 
 
+def _rows_after(dates: pd.Series, since: Optional[date]) -> pd.Series:
+    """
+    boolean mask of rows strictly newer than `since` (all rows when None).
+    used by --incremental so only new rows reach the per-row parsers.
+    """
+    if since is None:
+        return pd.Series(True, index=dates.index)
+    return dates > pd.Timestamp(since)
+
+
+def read_last_dates(path: Path) -> Dict[str, date]:
+    """
+    last date per symbol in an existing market_series.csv.
+    only the symbol/date columns are parsed.
+    """
+    existing = pd.read_csv(path, usecols=["symbol", "date"])
+    existing["date"] = pd.to_datetime(existing["date"], errors="coerce")
+    last = existing.dropna(subset=["date"]).groupby("symbol")["date"].max()
+    return {sym: ts.date() for sym, ts in last.items()}
+
+
+def append_rows_atomic(path: Path, rows: pd.DataFrame) -> None:
+    """
+    append rows to `path` without ever exposing a half-written file:
+    copy the current file next to it, append, then os.replace.
+    """
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent)
+    )
+    os.close(fd)
+    tmp = Path(tmp_name)
+    try:
+        shutil.copyfile(path, tmp)
+        with tmp.open("rb+") as f:
+            # make sure appended rows start on a fresh line
+            f.seek(0, os.SEEK_END)
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+        rows.to_csv(tmp, mode="a", header=False, index=False)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
 # ------------------------------
 # S&P GREEN BOND INDEX (Kaggle: "Green Bond Data.csv")
 # ------------------------------
 
-def normalize_sp_index(path: Path) -> pd.DataFrame:
+def normalize_sp_index(path: Path, since: Optional[date] = None) -> pd.DataFrame:
     """
     Normalize 'Green Bond Data.csv' to the common schema.
+    With `since`, only rows dated after it are normalized.
 
     expected columns:
         'Effective date '
@@ -84,15 +169,22 @@ def normalize_sp_index(path: Path) -> pd.DataFrame:
         )
         return pd.DataFrame(columns=COMMON_COLS)
 
+    # parse dates first so incremental runs can drop old rows before the
+    # per-row yield parsing below
+    dates = pd.to_datetime(df["Effective date "], errors="coerce")
+    keep = _rows_after(dates, since)
+    df = df[keep]
+    dates = dates[keep]
+
     # Create output frame with the same index as the source so scalar
     # assignments (like a constant `symbol`) broadcast to the full length.
     out = pd.DataFrame(index=df.index)
 
     # Symbol (broadcasted)
-    out["symbol"] = "SP_GB_INDEX"
+    out["symbol"] = SP_INDEX_SYMBOL
 
     # Dates
-    out["date"] = pd.to_datetime(df["Effective date "], errors="coerce").dt.date
+    out["date"] = dates.dt.date
 
     # Price (index level)
     out["price"] = pd.to_numeric(
@@ -118,9 +210,10 @@ def normalize_sp_index(path: Path) -> pd.DataFrame:
 # ISHARES GREEN BOND INDEX FUND (IE)
 # ------------------------------
 
-def normalize_ishares(path: Path) -> pd.DataFrame:
+def normalize_ishares(path: Path, since: Optional[date] = None) -> pd.DataFrame:
     """
     Normalize 'iShares Green Bond Index Fund (IE).csv' to the common schema.
+    With `since`, only rows dated after it are normalized.
 
     expected columns:
         'As Of'
@@ -139,14 +232,19 @@ def normalize_ishares(path: Path) -> pd.DataFrame:
         )
         return pd.DataFrame(columns=COMMON_COLS)
 
+    dates = pd.to_datetime(df["As Of"], errors="coerce")
+    keep = _rows_after(dates, since)
+    df = df[keep]
+    dates = dates[keep]
+
     # Create output frame with the same index as the source so scalar
     # assignments (like a constant `symbol`) broadcast to the full length.
     out = pd.DataFrame(index=df.index)
 
-    out["symbol"] = "ISHARES_GB_INDEX_IE"
+    out["symbol"] = ISHARES_SYMBOL
 
     # Date
-    out["date"] = pd.to_datetime(df["As Of"], errors="coerce").dt.date
+    out["date"] = dates.dt.date
 
     # For simplicity: price = NAV
     out["price"] = pd.to_numeric(df["NAV"], errors="coerce")
@@ -163,6 +261,42 @@ def normalize_ishares(path: Path) -> pd.DataFrame:
     return out[COMMON_COLS]
 
 
+# ------------------------------
+# CACHED LOADING
+# ------------------------------
+
+def load_source(
+    name: str,
+    path: Path,
+    normalize: Callable[..., pd.DataFrame],
+    since: Optional[date],
+    manifest: Optional[BuildManifest],
+) -> pd.DataFrame:
+    """
+    normalized rows for one source, newer than `since` when given.
+    with a manifest an unchanged input is answered from the cached full
+    frame (`since` applied to it). a changed input in incremental mode is
+    normalized from `since` on only and not stored: the cache holds full
+    frames, and re-parsing the whole history would defeat --incremental.
+    """
+    if manifest is None:
+        return normalize(path, since=since)
+
+    version = NORMALIZER_VERSIONS[name]
+    df = manifest.load(name, path, version)
+    if df is None:
+        if since is not None:
+            return normalize(path, since=since)
+        df = normalize(path)
+        manifest.store(name, path, version, df)
+    else:
+        print(f"  (unchanged since last build, using cached {name})")
+
+    if since is not None:
+        df = df[_rows_after(pd.to_datetime(df["date"]), since)]
+    return df
+
+
 # ------------------------------
 # MAIN
 # ------------------------------
@@ -187,20 +321,61 @@ def main():
         required=True,
         help="Output CSV path for the unified market series.",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Append only rows newer than the existing output's last date per symbol.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="Build manifest + per-source normalized intermediates.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse every input and leave the build cache untouched.",
+    )
 
     args = parser.parse_args()
 
+    incremental = args.incremental and args.output.exists()
+    last_dates: Dict[str, date] = {}
+    if incremental:
+        last_dates = read_last_dates(args.output)
+        print(f"[build_market_series] Incremental mode, last dates: {last_dates}")
+    elif args.incremental:
+        print("[build_market_series] No existing output; doing a full build.")
+
+    manifest = None if args.no_cache else BuildManifest(args.cache_dir)
     frames: List[pd.DataFrame] = []
 
     if args.sp_index and args.sp_index.exists():
         print(f"Loading S&P Green Bond Index from {args.sp_index}")
-        frames.append(normalize_sp_index(args.sp_index))
+        frames.append(
+            load_source(
+                "sp_index",
+                args.sp_index,
+                normalize_sp_index,
+                last_dates.get(SP_INDEX_SYMBOL),
+                manifest,
+            )
+        )
     else:
         print("[build_market_series] No --sp-index provided or file missing.")
 
     if args.ishares and args.ishares.exists():
         print(f"Loading iShares Green Bond Index Fund (IE) from {args.ishares}")
-        frames.append(normalize_ishares(args.ishares))
+        frames.append(
+            load_source(
+                "ishares",
+                args.ishares,
+                normalize_ishares,
+                last_dates.get(ISHARES_SYMBOL),
+                manifest,
+            )
+        )
     else:
         print("[build_market_series] No --ishares provided or file missing.")
 
@@ -209,6 +384,9 @@ def main():
             "No input datasets found. Provide at least one of --sp-index / --ishares."
         )
 
+    if manifest is not None:
+        manifest.save()
+
     combined = pd.concat(frames, ignore_index=True)
 
     # Remove rows missing date or price/nav (completely unusable)
@@ -222,6 +400,16 @@ def main():
             combined[col] = np.nan
     combined = combined[COMMON_COLS]
 
+    if incremental:
+        # later input rows win when the same (symbol, date) shows up twice
+        new_rows = combined.drop_duplicates(subset=["symbol", "date"], keep="last")
+        if new_rows.empty:
+            print(f"No new market rows; {args.output} is up to date")
+            return
+        append_rows_atomic(args.output, new_rows)
+        print(f"Appended {len(new_rows)} new market rows to {args.output}")
+        return
+
     args.output.parent.mkdir(parents=True, exist_ok=True)
     combined.to_csv(args.output, index=False)
     print(f"Wrote unified market series with {len(combined)} rows to {args.output}")
@@ -1,58 +1,575 @@
 #!/usr/bin/env python3
 # backend/scripts/extract_disclosure_text.py
+"""
+Extract plain text from the disclosure PDFs in app/data/disclosures_raw.
 
+every PDF is extracted in its own worker process (at most --jobs at a time),
+so a PDF that hangs or crashes the parser only takes its own worker down:
+
+    - --page-timeout: seconds allowed per page; a slow page is skipped and
+      counted as failed, the rest of the file is still extracted
+    - --file-timeout: seconds allowed per file; the worker is killed and the
+      file is reported as timed out (its previous .txt is left untouched)
+
+a summary with pages/s and failed pages per file is printed at the end.
+
+runs are incremental: a manifest keyed by each PDF's sha256 and the extractor
+version (EXTRACTOR_VERSION + the pypdf version, since pypdf upgrades change
+the text) records what was extracted. only new or changed PDFs are
+processed, a PDF whose bytes were already extracted under another name gets
+that text copied, and .txt outputs the manifest produced for PDFs that are
+gone are deleted. --force re-extracts everything.
+
+next to each .txt a page/section index is written to
+app/data/disclosures_index/<stem>.json (see app/data/disclosure_index.py).
+texts that are up to date but have no index yet are indexed from the .txt
+alone, without page offsets.
+
+finally the disclosure feature store and bond mapping are refreshed
+(scripts/build_disclosure_features.py; only changed texts are recomputed).
+--no-features skips that step.
+
+usage (run in backend dir):
+
+    python app/scripts/extract_disclosure_text.py
+    python app/scripts/extract_disclosure_text.py --jobs 4 --file-timeout 120
+    python app/scripts/extract_disclosure_text.py --force
+"""
+
+import argparse
+import json
+import multiprocessing
 import os
 import pathlib
-import json
+import shutil
+import sys
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing.connection import wait
+from typing import Dict, List, Optional, Tuple
+
+import pypdf
 from pypdf import PdfReader   # or use fitz for PyMuPDF if preferred
 
-# directories: raw PDFs -> extracted txt outputs
-RAW_DIR = (
-    pathlib.Path(__file__).resolve().parents[2] / "app" / "data" / "disclosures_raw"
-)
-OUT_DIR = (
-    pathlib.Path(__file__).resolve().parents[2] / "app" / "data" / "disclosures_texts"
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[2]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.data.disclosure_index import (  # noqa: E402
+    INDEX_DIR,
+    build_index,
+    index_path,
+    write_index,
 )
+from app.data.pdf_pages import PageTimeout, page_deadline  # noqa: E402
+from app.scripts.build_disclosure_features import build_all  # noqa: E402
+from app.scripts.build_manifest import _write_atomic, file_sha256  # noqa: E402
+
+# directories: raw PDFs -> extracted txt outputs
+RAW_DIR = BACKEND_ROOT / "app" / "data" / "disclosures_raw"
+OUT_DIR = BACKEND_ROOT / "app" / "data" / "disclosures_texts"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
+DEFAULT_MANIFEST = BACKEND_ROOT / "app" / "data" / ".build_cache" / "disclosures" / "manifest.json"
 
-def extract_from_pdf(pdf_path: pathlib.Path) -> str:
-    # read PDF and extract text from all pages, join with newlines
+DEFAULT_FILE_TIMEOUT_S = 300.0
+DEFAULT_PAGE_TIMEOUT_S = 30.0
+# extractions of the same bytes (and extractor version) that had timed-out
+# pages, before the partial text is accepted
+MAX_EXTRACT_ATTEMPTS = 3
+
+# bump when extract_from_pdf / clean_text change what ends up in the .txt
+EXTRACTOR_VERSION = "1"
+MANIFEST_SCHEMA = 1
+
+
+def extract_pages(
+    pdf_path: pathlib.Path,
+    page_timeout: Optional[float] = None,
+    stats: Optional[Dict[str, int]] = None,
+) -> List[str]:
+    # read PDF and extract text page by page ("" for empty / failed pages)
     reader = PdfReader(str(pdf_path))
     texts = []
+    pages = failed = timed_out = 0
     for page in reader.pages:
+        pages += 1
         try:
-            txt = page.extract_text()
+            with page_deadline(page_timeout):
+                txt = page.extract_text()
+        except PageTimeout:
+            print(f"Page {pages} of {pdf_path.name} timed out after {page_timeout}s")
+            timed_out += 1
+            txt = ""
         except Exception as e:
             # continue on page-level extraction errors
             print("Failed on page:", e)
+            failed += 1
             txt = ""
-        if txt:
-            texts.append(txt)
-    return "\n".join(texts)
+        texts.append(txt or "")
+    if stats is not None:
+        stats.update(pages=pages, failed_pages=failed, timed_out_pages=timed_out)
+    return texts
+
+
+def extract_from_pdf(
+    pdf_path: pathlib.Path,
+    page_timeout: Optional[float] = None,
+    stats: Optional[Dict[str, int]] = None,
+) -> str:
+    # read PDF and extract text from all pages, join with newlines
+    return "\n".join(t for t in extract_pages(pdf_path, page_timeout, stats) if t)
+
 
 def clean_text(text: str) -> str:
     # minimal cleaning: normalize windows CR, trim whitespace
     return text.replace("\r", "\n").strip()
 
-def main():
-    # walk the raw directory and process each PDF into a text file
-    for root, dirs, files in os.walk(RAW_DIR):
+
+def join_pages(pages: List[str]) -> Tuple[str, List[int]]:
+    """
+    the cleaned text extract_from_pdf + clean_text produce, plus the char
+    offset where each page (empty ones included) starts in it.
+    """
+    starts = []
+    pos = 0
+    for txt in pages:
+        starts.append(pos)
+        if txt:
+            pos += len(txt) + 1
+    raw = "\n".join(t for t in pages if t)
+    cleaned = clean_text(raw)
+    # clean_text only maps \r -> \n (same length) and strips the ends
+    lead = len(raw) - len(raw.lstrip())
+    return cleaned, [min(max(s - lead, 0), len(cleaned)) for s in starts]
+
+
+def output_path(pdf_path: pathlib.Path) -> pathlib.Path:
+    return OUT_DIR / (pdf_path.stem + ".txt")
+
+
+def index_from_text(doc_id: str) -> None:
+    # index an existing .txt whose page boundaries are no longer known
+    text = (OUT_DIR / f"{doc_id}.txt").read_bytes().decode("utf-8")
+    write_index(build_index(doc_id, text), INDEX_DIR)
+
+
+def copy_index(src_doc_id: str, doc_id: str) -> None:
+    src = index_path(src_doc_id, INDEX_DIR)
+    if not src.exists():
+        index_from_text(doc_id)
+        return
+    index = json.loads(src.read_text(encoding="utf-8"))
+    index["doc_id"] = doc_id
+    write_index(index, INDEX_DIR)
+
+
+def backfill_indexes() -> int:
+    # every .txt gets an index, including texts extracted before indexes
+    # existed and texts with no PDF in the raw dir
+    n = 0
+    for txt in sorted(OUT_DIR.glob("*.txt")):
+        if not index_path(txt.stem, INDEX_DIR).exists():
+            index_from_text(txt.stem)
+            n += 1
+    return n
+
+
+def write_text_atomic(path: pathlib.Path, text: str) -> None:
+    # a killed worker must never leave a half-written .txt behind. written as
+    # bytes so index byte offsets hold on every platform (no newline mapping)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(text.encode("utf-8"))
+        os.replace(tmp_name, path)
+    finally:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+
+
+def find_pdfs(raw_dir: pathlib.Path = RAW_DIR) -> List[pathlib.Path]:
+    # walk the raw directory and collect every PDF, in a stable order
+    pdfs = []
+    for root, dirs, files in os.walk(raw_dir):
         for fname in files:
             # skip non-pdf files
-            if not fname.lower().endswith(".pdf"):
+            if fname.lower().endswith(".pdf"):
+                pdfs.append(pathlib.Path(root) / fname)
+    return sorted(pdfs)
+
+
+# ------------------------------
+# incremental manifest
+# ------------------------------
+
+def extractor_version() -> str:
+    return f"{EXTRACTOR_VERSION}+pypdf-{pypdf.__version__}"
+
+
+def _complete(entry: Dict) -> bool:
+    # page exceptions are deterministic, so only timed-out pages (load / time
+    # dependent) are worth retrying, and only MAX_EXTRACT_ATTEMPTS times.
+    # older entries without the counts count as complete
+    return not entry.get("timed_out_pages") or entry.get("attempts", 1) >= MAX_EXTRACT_ATTEMPTS
+
+
+class ExtractionManifest:
+    """
+    pdf (path relative to the raw dir) -> sha256, size/mtime, extractor
+    version and the .txt it produced. only successful extractions are
+    recorded, so failed files are retried on the next run.
+    """
+
+    def __init__(self, path: pathlib.Path, raw_dir: pathlib.Path):
+        self.path = path
+        self.raw_dir = raw_dir
+        self.version = extractor_version()
+        self.entries: Dict[str, dict] = {}
+        self._hashes: Dict[pathlib.Path, str] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                data = {}
+            if data.get("schema") == MANIFEST_SCHEMA:
+                self.entries = data.get("files", {})
+
+    def key(self, pdf_path: pathlib.Path) -> str:
+        return pdf_path.relative_to(self.raw_dir).as_posix()
+
+    def sha256(self, pdf_path: pathlib.Path) -> str:
+        # untouched files (same size + mtime) are not re-hashed
+        stat = pdf_path.stat()
+        entry = self.entries.get(self.key(pdf_path), {})
+        if entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            return entry["sha256"]
+        if pdf_path not in self._hashes:
+            self._hashes[pdf_path] = file_sha256(pdf_path)
+        return self._hashes[pdf_path]
+
+    def plan(
+        self, pdfs: List[pathlib.Path], force: bool = False
+    ) -> Tuple[List[pathlib.Path], List[pathlib.Path], int]:
+        """
+        split `pdfs` into (to extract, reused from another entry, up to date).
+        reused PDFs have their text copied and are recorded right away.
+        entries with timed-out pages are extracted again (up to
+        MAX_EXTRACT_ATTEMPTS times) and never copied from; failed pages
+        would fail again, so those entries are kept.
+        """
+        by_hash = {
+            e["sha256"]: e
+            for e in self.entries.values()
+            if e.get("version") == self.version
+            and not e.get("timed_out_pages")
+            and (OUT_DIR / e["output"]).exists()
+        }
+        todo: List[pathlib.Path] = []
+        reused: List[pathlib.Path] = []
+        fresh = 0
+        for pdf_path in pdfs:
+            if force:
+                todo.append(pdf_path)
+                continue
+            sha = self.sha256(pdf_path)
+            out = output_path(pdf_path)
+            entry = self.entries.get(self.key(pdf_path))
+            if (
+                entry
+                and entry.get("sha256") == sha
+                and entry.get("version") == self.version
+                and _complete(entry)
+                and out.exists()
+            ):
+                # content unchanged; refresh size/mtime if it was touched
+                stat = pdf_path.stat()
+                entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                fresh += 1
                 continue
-            pdf_path = pathlib.Path(root) / fname
-            out_path = OUT_DIR / (pdf_path.stem + ".txt")
+            source = by_hash.get(sha)
+            if source is not None and source["output"] != out.name:
+                shutil.copyfile(OUT_DIR / source["output"], out)
+                copy_index(pathlib.Path(source["output"]).stem, out.stem)
+                self.record(
+                    pdf_path,
+                    {"pages": source.get("pages", 0), "failed_pages": source.get("failed_pages", 0)},
+                )
+                reused.append(pdf_path)
+                continue
+            todo.append(pdf_path)
+        return todo, reused, fresh
+
+    def record(self, pdf_path: pathlib.Path, stats: Dict[str, int]) -> None:
+        stat = pdf_path.stat()
+        sha = self.sha256(pdf_path)
+        # attempts count extractions of these bytes with this extractor version
+        previous = self.entries.get(self.key(pdf_path), {})
+        attempts = 1
+        if previous.get("sha256") == sha and previous.get("version") == self.version:
+            attempts = previous.get("attempts", 1) + 1
+        self.entries[self.key(pdf_path)] = {
+            "sha256": sha,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "version": self.version,
+            "output": output_path(pdf_path).name,
+            "pages": stats.get("pages", 0),
+            "failed_pages": stats.get("failed_pages", 0),
+            "timed_out_pages": stats.get("timed_out_pages", 0),
+            "attempts": attempts,
+        }
+
+    def prune(self, pdfs: List[pathlib.Path]) -> List[str]:
+        """
+        drop entries for PDFs that no longer exist and delete their .txt,
+        unless a remaining PDF still writes to the same file. texts the
+        manifest never produced are left alone.
+        """
+        present = {self.key(p) for p in pdfs}
+        kept_outputs = {output_path(p).name for p in pdfs}
+        removed = []
+        for key in sorted(set(self.entries) - present):
+            entry = self.entries.pop(key)
+            out = OUT_DIR / entry["output"]
+            if entry["output"] not in kept_outputs and out.exists():
+                out.unlink()
+                index_path(out.stem, INDEX_DIR).unlink(missing_ok=True)
+                removed.append(entry["output"])
+        return removed
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(
+            {"schema": MANIFEST_SCHEMA, "files": self.entries}, indent=2, sort_keys=True
+        )
+        _write_atomic(self.path, lambda tmp: tmp.write_text(payload + "\n"))
+
+
+# ------------------------------
+# supervised worker processes
+# ------------------------------
+
+@dataclass
+class FileResult:
+    path: pathlib.Path
+    status: str  # ok | error | timeout | crashed
+    seconds: float
+    pages: int = 0
+    failed_pages: int = 0
+    timed_out_pages: int = 0
+    error: str = ""
+
+    @property
+    def pages_per_s(self) -> float:
+        return self.pages / self.seconds if self.seconds > 0 else 0.0
+
+
+def _extract_worker(pdf_path: pathlib.Path, page_timeout: Optional[float], conn) -> None:
+    # runs in a child process: extract, write the .txt, report page stats
+    stats: Dict[str, int] = {}
+    try:
+        # extract raw text, do light cleaning, write to output + index
+        pages = extract_pages(pdf_path, page_timeout=page_timeout, stats=stats)
+        text, page_starts = join_pages(pages)
+        write_text_atomic(output_path(pdf_path), text)
+        write_index(build_index(pdf_path.stem, text, page_starts), INDEX_DIR)
+        conn.send(("ok", stats, ""))
+    except Exception as e:
+        conn.send(("error", stats, f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+@dataclass
+class _Running:
+    process: multiprocessing.Process
+    path: pathlib.Path
+    started: float
+
+
+def run_extraction(
+    pdfs: List[pathlib.Path],
+    jobs: int = 1,
+    file_timeout: Optional[float] = DEFAULT_FILE_TIMEOUT_S,
+    page_timeout: Optional[float] = DEFAULT_PAGE_TIMEOUT_S,
+) -> List[FileResult]:
+    """
+    extract `pdfs` with up to `jobs` worker processes, one process per file.
+    results come back in completion order.
+    """
+    ctx = multiprocessing.get_context()
+    pending = deque(pdfs)
+    running: Dict[object, _Running] = {}
+    results: List[FileResult] = []
+
+    def finish(conn, result: FileResult) -> None:
+        del running[conn]
+        conn.close()
+        results.append(result)
+        report(result)
+
+    while pending or running:
+        while pending and len(running) < max(jobs, 1):
+            pdf_path = pending.popleft()
+            parent_conn, child_conn = ctx.Pipe(duplex=False)
+            process = ctx.Process(
+                target=_extract_worker,
+                args=(pdf_path, page_timeout, child_conn),
+                daemon=True,
+            )
+            process.start()
+            # drop our copy of the write end so a dead worker shows up as EOF
+            child_conn.close()
+            running[parent_conn] = _Running(process, pdf_path, time.perf_counter())
+
+        wait_s = None
+        if file_timeout:
+            oldest = min(r.started for r in running.values())
+            wait_s = max(oldest + file_timeout - time.perf_counter(), 0.0)
+
+        for conn in wait(list(running), timeout=wait_s):
+            job = running[conn]
+            elapsed = time.perf_counter() - job.started
             try:
-                # extract raw text, do light cleaning, write to output
-                raw = extract_from_pdf(pdf_path)
-                cleaned = clean_text(raw)
-                with open(out_path, "w", encoding="utf-8") as f:
-                    f.write(cleaned)
-                print("Extracted:", pdf_path, "→", out_path)
-            except Exception as e:
-                # never fail the batch run for a single bad file
-                print("Error extracting", pdf_path, e)
+                status, stats, error = conn.recv()
+            except EOFError:
+                # the worker died without reporting (segfault, OOM kill, ...)
+                job.process.join()
+                status, stats = "crashed", {}
+                error = f"worker exited with code {job.process.exitcode}"
+            else:
+                job.process.join()
+            finish(conn, FileResult(job.path, status, elapsed, error=error, **stats))
+
+        if file_timeout:
+            now = time.perf_counter()
+            for conn, job in list(running.items()):
+                if now - job.started < file_timeout:
+                    continue
+                job.process.kill()
+                job.process.join()
+                finish(
+                    conn,
+                    FileResult(
+                        job.path,
+                        "timeout",
+                        now - job.started,
+                        error=f"killed after {file_timeout:g}s",
+                    ),
+                )
+
+    return results
+
+
+def report(result: FileResult) -> None:
+    if result.status == "ok":
+        print("Extracted:", result.path, "→", output_path(result.path))
+    else:
+        print("Error extracting", result.path, f"[{result.status}]", result.error)
+
+
+def print_summary(results: List[FileResult], wall_s: float) -> None:
+    print()
+    print(
+        f"{'file':<48} {'status':<8} {'pages':>6} {'failed':>6} "
+        f"{'seconds':>8} {'pages/s':>8}"
+    )
+    for r in sorted(results, key=lambda r: str(r.path)):
+        name = r.path.name if len(r.path.name) <= 48 else r.path.name[:45] + "..."
+        print(
+            f"{name:<48} {r.status:<8} {r.pages:>6} "
+            f"{r.failed_pages + r.timed_out_pages:>6} {r.seconds:>8.2f} {r.pages_per_s:>8.1f}"
+        )
+
+    pages = sum(r.pages for r in results)
+    failed_files = [r for r in results if r.status != "ok"]
+    failed_pages = sum(r.failed_pages + r.timed_out_pages for r in results)
+    print(
+        f"\n{len(results) - len(failed_files)}/{len(results)} files extracted, "
+        f"{pages} pages ({failed_pages} failed) in {wall_s:.2f} s "
+        f"({pages / wall_s if wall_s > 0 else 0.0:,.1f} pages/s)"
+    )
+    for r in failed_files:
+        print(f"  {r.status}: {r.path.name} – {r.error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract plain text from disclosure PDFs."
+    )
+    parser.add_argument("--raw-dir", type=pathlib.Path, default=RAW_DIR, help="Directory of PDFs")
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="Worker processes (one PDF per worker at a time)"
+    )
+    parser.add_argument(
+        "--file-timeout",
+        type=float,
+        default=DEFAULT_FILE_TIMEOUT_S,
+        help="Seconds before a file's worker is killed (0 disables)",
+    )
+    parser.add_argument(
+        "--page-timeout",
+        type=float,
+        default=DEFAULT_PAGE_TIMEOUT_S,
+        help="Seconds before a single page is skipped (0 disables)",
+    )
+    parser.add_argument(
+        "--manifest", type=pathlib.Path, default=DEFAULT_MANIFEST, help="Extraction manifest path"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Re-extract every PDF, ignoring the manifest"
+    )
+    parser.add_argument(
+        "--no-features",
+        action="store_true",
+        help="Don't refresh the disclosure feature store / bond mapping",
+    )
+    args = parser.parse_args()
+
+    raw_dir = args.raw_dir.resolve()
+    pdfs = find_pdfs(raw_dir)
+    manifest = ExtractionManifest(args.manifest, raw_dir)
+    # plan before pruning so a renamed PDF can still copy its old text
+    todo, reused, fresh = manifest.plan(pdfs, force=args.force)
+    removed = manifest.prune(pdfs)
+    print(
+        f"{len(pdfs)} PDFs: {len(todo)} to extract, {len(reused)} copied from identical "
+        f"PDFs, {fresh} up to date, {len(removed)} stale outputs removed"
+    )
+    for name in removed:
+        print("Removed:", OUT_DIR / name)
+
+    t0 = time.perf_counter()
+    # never fail the batch run for a single bad file
+    results = run_extraction(
+        todo,
+        jobs=args.jobs,
+        file_timeout=args.file_timeout or None,
+        page_timeout=args.page_timeout or None,
+    )
+    for result in results:
+        if result.status == "ok":
+            # timed-out page counts are kept so plan() retries those files
+            manifest.record(
+                result.path,
+                {
+                    "pages": result.pages,
+                    "failed_pages": result.failed_pages,
+                    "timed_out_pages": result.timed_out_pages,
+                },
+            )
+    manifest.save()
+    indexed = backfill_indexes()
+    if indexed:
+        print(f"Indexed {indexed} existing texts (no page offsets)")
+    if results:
+        print_summary(results, time.perf_counter() - t0)
+
+    if not args.no_features:
+        build_all(OUT_DIR)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,334 @@
+# backend/app/scripts/resolve_entities.py
+"""
+Cross-source entity resolution for the unified bonds table.
+
+the same bond often shows up in several sources (World Bank, CBI, Kaggle)
+under different synthetic ids. this stage links those rows and collapses
+each cluster into one row:
+
+    - issuer names are normalized (case, punctuation, legal suffixes,
+      a few known aliases) and blocked on their first significant token
+    - candidates come from sorted-neighbourhood passes inside each issuer
+      block: one ordered by issue date, one ordered by USD amount. each
+      record is compared with at most `window` neighbours per pass, so
+      comparisons grow linearly with the input instead of O(n^2)
+    - a candidate pair matches when the rows come from different sources,
+      USD amounts agree (relative or absolute tolerance), issue dates agree
+      when both are known, currencies agree when both are known, and the
+      issuer names overlap enough (idf-weighted, so shared generic words
+      like "city" or "bank" do not count for much)
+    - matched rows are grouped with union-find, strongest links first and
+      at most one row per source in a cluster; the canonical row is the
+      one from the highest-priority source (World Bank first, since it has
+      ISINs), with missing fields filled from the other members
+
+the canonical row keeps its bond_id, and `source_lineage` lists every
+merged "source:bond_id". KAPSARC rows are issuance aggregates rather than
+bonds and are never linked.
+"""
+
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# canonical row preference (lower wins); unknown sources go last
+SOURCE_PRIORITY = {
+    "world_bank": 0,
+    "cbi": 1,
+    "kaggle_global_sustainable": 2,
+    "adb": 3,
+}
+NEVER_LINKED_SOURCES = {"kapsarc"}
+
+# full normalized name -> canonical name
+ISSUER_ALIASES = {
+    "ibrd": "world bank",
+    "international bank for reconstruction and development": "world bank",
+    "ida": "world bank",
+    "international development association": "world bank",
+    "eib": "european investment bank",
+    "adb": "asian development bank",
+    "kfw": "kreditanstalt fuer wiederaufbau",
+}
+
+# tokens that carry no identity (legal forms, filler)
+NAME_STOPWORDS = {
+    "the", "of", "and", "for", "de", "des", "du", "la", "le",
+    "ltd", "limited", "plc", "inc", "incorporated", "corp", "corporation",
+    "co", "company", "sa", "ag", "nv", "bv", "spa", "s", "p", "a", "ab",
+    "asa", "oyj", "as", "se", "llc", "lp", "pty", "gmbh", "group",
+    "holdings", "holding", "finance", "financing",
+}
+
+DEFAULT_WINDOW = 8
+DEFAULT_DATE_TOL_DAYS = 7
+DEFAULT_AMOUNT_REL_TOL = 0.02
+# Kaggle amounts are rounded to 0.01bn, so allow half of that absolutely
+DEFAULT_AMOUNT_ABS_TOL_USD = 5e6
+DEFAULT_MIN_NAME_SIMILARITY = 0.8
+
+
+@dataclass
+class ResolutionStats:
+    records_in: int = 0
+    records_linkable: int = 0
+    blocks: int = 0
+    pairs_compared: int = 0
+    pairs_matched: int = 0
+    clusters_merged: int = 0
+    records_out: int = 0
+    seconds: float = 0.0
+
+    @property
+    def pairs_per_second(self) -> float:
+        return self.pairs_compared / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records_in / self.seconds if self.seconds > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        out = asdict(self)
+        out["pairs_per_second"] = self.pairs_per_second
+        out["records_per_second"] = self.records_per_second
+        return out
+
+
+def normalize_issuer(names: pd.Series) -> pd.Series:
+    """lower-case, strip punctuation / legal suffixes, apply aliases."""
+    # issuers repeat a lot, so normalize each distinct name once
+    codes, uniques = pd.factorize(names.astype(object).where(names.notna(), ""))
+    text = pd.Series(uniques, dtype=object).astype(str).str.lower()
+    text = text.str.replace("&", " and ", regex=False)
+    text = text.str.replace(r"\(.*?\)|/.*$", " ", regex=True)
+    text = text.str.replace(r"[^0-9a-z]+", " ", regex=True).str.strip()
+    text = text.map(lambda s: ISSUER_ALIASES.get(s, s))
+    text = text.map(lambda s: " ".join(t for t in s.split() if t not in NAME_STOPWORDS))
+    return pd.Series(text.to_numpy(dtype=object)[codes], index=names.index, dtype=object)
+
+
+def _token_weights(names: pd.Series) -> Dict[str, float]:
+    """idf weight per name token, so generic words (city, bank, energy) count little."""
+    counts = names.value_counts()
+    doc_freq: Dict[str, int] = {}
+    for name, count in counts.items():
+        for t in set(name.split()):
+            doc_freq[t] = doc_freq.get(t, 0) + int(count)
+    n = max(len(names), 1)
+    return {t: float(np.log((n + 1) / (c + 0.5))) for t, c in doc_freq.items()}
+
+
+def _name_similarity(a: str, b: str, weights: Dict[str, float]) -> float:
+    """
+    idf-weighted overlap coefficient of the two token sets: 1.0 when one
+    name's tokens are contained in the other's ("rumo" vs "rumo luxembourg").
+    """
+    ta, tb = set(a.split()), set(b.split())
+    if not ta or not tb:
+        return 0.0
+    wa = sum(weights.get(t, 0.0) for t in ta)
+    wb = sum(weights.get(t, 0.0) for t in tb)
+    if min(wa, wb) <= 0:
+        return 0.0
+    return sum(weights.get(t, 0.0) for t in ta & tb) / min(wa, wb)
+
+
+def _neighbour_pairs(
+    block: np.ndarray, value: np.ndarray, window: int, max_gap: Optional[float] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    sorted-neighbourhood candidates: rows sorted by (block, value), each
+    paired with the next `window` rows of the same block (and, with max_gap,
+    only while the value difference stays within it).
+    """
+    idx = np.flatnonzero((block >= 0) & np.isfinite(value))
+    order = idx[np.lexsort((value[idx], block[idx]))]
+    b, v = block[order], value[order]
+
+    left: List[np.ndarray] = []
+    right: List[np.ndarray] = []
+    for k in range(1, window + 1):
+        if k >= len(order):
+            break
+        ok = b[k:] == b[:-k]
+        if max_gap is not None:
+            ok &= (v[k:] - v[:-k]) <= max_gap
+        # blocks are contiguous and values sorted, so once no pair survives
+        # at offset k none can at k + 1
+        if not ok.any():
+            break
+        left.append(order[:-k][ok])
+        right.append(order[k:][ok])
+    if not left:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(left), np.concatenate(right)
+
+
+class _SourceDisjointUnion:
+    """
+    union-find where a cluster holds at most one row per source: two
+    clusters only merge when their source sets do not overlap.
+    """
+
+    def __init__(self, sources: np.ndarray):
+        self.parent = np.arange(len(sources))
+        self.row_sources = sources
+        # source sets of merged clusters only (singletons read row_sources)
+        self.sources: Dict[int, frozenset] = {}
+
+    def _sources(self, root: int) -> frozenset:
+        found = self.sources.get(root)
+        return found if found is not None else frozenset([self.row_sources[root]])
+
+    def find(self, i: int) -> int:
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, i: int, j: int) -> bool:
+        ri, rj = self.find(i), self.find(j)
+        if ri == rj or self._sources(ri) & self._sources(rj):
+            return False
+        keep, drop = min(ri, rj), max(ri, rj)
+        self.parent[drop] = keep
+        self.sources[keep] = self._sources(keep) | self._sources(drop)
+        self.sources.pop(drop, None)
+        return True
+
+    def roots(self) -> np.ndarray:
+        # only merged rows have a parent other than themselves
+        roots = self.parent.copy()
+        for i in np.flatnonzero(roots != np.arange(len(roots))):
+            roots[i] = self.find(int(i))
+        return roots
+
+
+def resolve_entities(
+    df: pd.DataFrame,
+    window: int = DEFAULT_WINDOW,
+    date_tol_days: int = DEFAULT_DATE_TOL_DAYS,
+    amount_rel_tol: float = DEFAULT_AMOUNT_REL_TOL,
+    amount_abs_tol_usd: float = DEFAULT_AMOUNT_ABS_TOL_USD,
+    min_name_similarity: float = DEFAULT_MIN_NAME_SIMILARITY,
+) -> Tuple[pd.DataFrame, ResolutionStats]:
+    """
+    collapse rows that describe the same bond across sources.
+    returns (resolved frame with a `source_lineage` column, stats).
+    """
+    t0 = time.perf_counter()
+    stats = ResolutionStats(records_in=len(df))
+    df = df.reset_index(drop=True)
+    n = len(df)
+
+    source = df["source_dataset"].astype(object).where(df["source_dataset"].notna(), "")
+    names = normalize_issuer(df["issuer_name"])
+    block_key = names.str.split().str[0]
+    linkable = (block_key.notna() & ~source.isin(NEVER_LINKED_SOURCES)).to_numpy()
+    block = np.where(linkable, pd.factorize(block_key)[0], -1)
+    stats.records_linkable = int(linkable.sum())
+    stats.blocks = int(np.count_nonzero(np.bincount(block[block >= 0]))) if linkable.any() else 0
+
+    dates = pd.to_datetime(df["issue_date"], errors="coerce")
+    day = (dates - pd.Timestamp("1970-01-01")).dt.days.to_numpy(dtype=float)
+    amount = pd.to_numeric(df["amount_issued_usd"], errors="coerce").to_numpy(dtype=float)
+    amount = np.where(amount > 0, amount, np.nan)
+
+    # candidate pairs from both passes, de-duplicated
+    a1, b1 = _neighbour_pairs(block, day, window, max_gap=date_tol_days)
+    a2, b2 = _neighbour_pairs(block, amount, window)
+    i = np.concatenate([a1, a2])
+    j = np.concatenate([b1, b2])
+    lo, hi = np.minimum(i, j), np.maximum(i, j)
+    pair_codes = np.sort(lo.astype(np.int64) * n + hi)
+    if len(pair_codes):
+        pair_codes = pair_codes[np.r_[True, pair_codes[1:] != pair_codes[:-1]]]
+    i, j = pair_codes // n, pair_codes % n
+    stats.pairs_compared = int(len(i))
+
+    # cheap vectorized checks first, token similarity only on survivors
+    src = source.to_numpy()
+    currency = df["currency"].astype(object).where(df["currency"].notna(), "").to_numpy()
+    amt_i, amt_j = amount[i], amount[j]
+    amt_tol = np.maximum(amount_rel_tol * np.fmax(amt_i, amt_j), amount_abs_tol_usd)
+    day_i, day_j = day[i], day[j]
+    ok = (
+        (src[i] != src[j])
+        & (np.abs(amt_i - amt_j) <= amt_tol)
+        & (np.isnan(day_i) | np.isnan(day_j) | (np.abs(day_i - day_j) <= date_tol_days))
+        & ((currency[i] == "") | (currency[j] == "") | (currency[i] == currency[j]))
+    )
+    i, j = i[ok], j[ok]
+
+    name_arr = names.to_numpy()
+    weights = _token_weights(names[linkable])
+    sim = np.fromiter(
+        (_name_similarity(name_arr[a], name_arr[b], weights) for a, b in zip(i, j)),
+        dtype=float,
+        count=len(i),
+    )
+    keep = sim >= min_name_similarity
+    i, j, sim = i[keep], j[keep], sim[keep]
+
+    # strongest links first (name, then closest amount), so a row that could
+    # join two clusters goes to the better one
+    rel_gap = np.abs(amount[i] - amount[j]) / np.fmax(amount[i], amount[j])
+    uf = _SourceDisjointUnion(src)
+    for k in np.lexsort((rel_gap, -sim)):
+        if uf.union(int(i[k]), int(j[k])):
+            stats.pairs_matched += 1
+    cluster = uf.roots()
+
+    # rows that stay on their own pass through untouched
+    src_label = df["source_dataset"].astype(object).fillna("unknown").astype(str)
+    lineage = src_label + ":" + df["bond_id"].astype(str)
+    sizes = np.bincount(cluster, minlength=n)
+    multi = np.flatnonzero(sizes[cluster] > 1)
+    keep = sizes[cluster] == 1
+
+    out = df.copy()
+    out["source_lineage"] = lineage
+    if len(multi):
+        # canonical row per cluster: best source, then earliest row
+        priority = source.map(SOURCE_PRIORITY).fillna(len(SOURCE_PRIORITY)).to_numpy()
+        ranked_rows = multi[np.lexsort((multi, priority[multi], cluster[multi]))]
+        ranked = df.iloc[ranked_rows]
+        groups = cluster[ranked_rows]
+
+        # first non-null value per column in priority order fills gaps in
+        # the canonical row; bond_id / source come from the canonical row
+        merged = ranked.groupby(groups, sort=False).first()
+        canonical = pd.Series(ranked_rows, index=groups).groupby(level=0, sort=False).first()
+        merged = merged.drop(columns=["bond_id", "source_dataset"])
+        rows = canonical.reindex(merged.index).to_numpy()
+        for col in merged.columns:
+            out.loc[rows, col] = merged[col].to_numpy()
+        out.loc[rows, "source_lineage"] = (
+            lineage.iloc[ranked_rows].groupby(groups, sort=False).agg("|".join)
+            .reindex(merged.index).to_numpy()
+        )
+        keep[rows] = True
+
+    out = out[keep].reset_index(drop=True)
+
+    stats.clusters_merged = int((pd.Series(cluster).value_counts() > 1).sum())
+    stats.records_out = len(out)
+    stats.seconds = time.perf_counter() - t0
+    return out, stats
+
+
+def format_stats(stats: ResolutionStats) -> str:
+    return (
+        f"entity resolution: {stats.records_in} rows "
+        f"({stats.records_linkable} linkable in {stats.blocks} issuer blocks), "
+        f"{stats.pairs_compared} pairs compared, {stats.pairs_matched} matched, "
+        f"{stats.clusters_merged} clusters merged -> {stats.records_out} rows "
+        f"in {stats.seconds:.2f} s "
+        f"({stats.pairs_per_second:,.0f} pairs/s, {stats.records_per_second:,.0f} rows/s)"
+    )
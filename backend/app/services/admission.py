@@ -0,0 +1,167 @@
+# backend/app/services/admission.py
+"""
+Admission control for routes that run the ML models.
+
+every ml-backed route has a RouteLimit: at most `max_concurrent` requests run
+the models at once, at most `max_queue` more wait (up to `queue_timeout_s`)
+for a slot. beyond that a request is either
+
+    - downgraded to rule scoring (`downgrade=True`): it runs right away
+      without touching the models; the response reports mode "rule",
+      `degraded: true` and the requested mode in `degraded_from`, or
+    - rejected with `Overloaded`: 429 when the queue is full, 503 when it
+      waited too long. both carry a Retry-After estimate.
+
+rule-only requests never enter a limiter. the limiter is thread based since
+the sync routes run in starlette's threadpool.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+from app.core.metrics import request_mode
+
+
+@dataclass(frozen=True)
+class RouteLimit:
+    max_concurrent: int
+    max_queue: int
+    queue_timeout_s: float
+    downgrade: bool = True
+
+
+# finbert / minilm inference is cpu bound: a couple of concurrent runs keep the
+# cores busy, more only adds latency for everyone
+ROUTE_LIMITS: Dict[str, RouteLimit] = {
+    "analyze_text": RouteLimit(max_concurrent=2, max_queue=8, queue_timeout_s=2.0),
+    "analyze_file": RouteLimit(max_concurrent=1, max_queue=4, queue_timeout_s=5.0),
+    "bond_detail": RouteLimit(max_concurrent=2, max_queue=16, queue_timeout_s=2.0),
+    "disclosure_score": RouteLimit(max_concurrent=2, max_queue=8, queue_timeout_s=2.0),
+    # pdf parsing of uploads (one worker process each); nothing to downgrade to
+    "pdf_parse": RouteLimit(max_concurrent=2, max_queue=4, queue_timeout_s=5.0, downgrade=False),
+}
+
+MAX_RETRY_AFTER_S = 60
+
+
+class Overloaded(Exception):
+    """request shed by admission control; mapped to 429 / 503 + Retry-After."""
+
+    def __init__(self, route: str, status_code: int, retry_after_s: int, reason: str):
+        super().__init__(f"{route}: {reason}")
+        self.route = route
+        self.status_code = status_code
+        self.retry_after_s = retry_after_s
+        self.reason = reason
+
+
+@dataclass
+class Admission:
+    mode: str  # mode to run with
+    degraded_from: Optional[str] = None  # requested mode when downgraded
+
+    @property
+    def degraded(self) -> bool:
+        # run without any ml model (transparency or impact)
+        return self.degraded_from is not None
+
+    def annotate(self, result: dict) -> dict:
+        # report a downgrade next to the `mode` the scoring service set
+        if self.degraded:
+            result["degraded"] = True
+            result["degraded_from"] = self.degraded_from
+        return result
+
+
+class AdmissionLimiter:
+    def __init__(self, route: str, limit: RouteLimit):
+        self.route = route
+        self.limit = limit
+        self._cond = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+        # ewma of time a slot is held, for Retry-After
+        self._service_s = 1.0
+        self.stats = {"admitted": 0, "queued": 0, "rejected": 0, "timed_out": 0, "degraded": 0}
+
+    def retry_after(self) -> int:
+        per_slot = self._service_s * (self.waiting + 1) / self.limit.max_concurrent
+        return max(1, min(MAX_RETRY_AFTER_S, math.ceil(per_slot)))
+
+    def _acquire(self) -> bool:
+        """take a slot; False when the request should be downgraded."""
+        limit = self.limit
+        with self._cond:
+            if self.active < limit.max_concurrent and self.waiting == 0:
+                self.active += 1
+                self.stats["admitted"] += 1
+                return True
+            if self.waiting >= limit.max_queue:
+                if limit.downgrade:
+                    self.stats["degraded"] += 1
+                    return False
+                self.stats["rejected"] += 1
+                raise Overloaded(self.route, 429, self.retry_after(), "queue full")
+
+            self.waiting += 1
+            self.stats["queued"] += 1
+            deadline = time.monotonic() + limit.queue_timeout_s
+            try:
+                while self.active >= limit.max_concurrent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        if limit.downgrade:
+                            self.stats["degraded"] += 1
+                            return False
+                        self.stats["timed_out"] += 1
+                        raise Overloaded(self.route, 503, self.retry_after(), "queue wait timed out")
+                    self._cond.wait(remaining)
+            finally:
+                self.waiting -= 1
+            self.active += 1
+            self.stats["admitted"] += 1
+            return True
+
+    def _release(self, held_s: float) -> None:
+        with self._cond:
+            self.active -= 1
+            self._service_s = 0.8 * self._service_s + 0.2 * held_s
+            self._cond.notify()
+
+    @contextmanager
+    def admit(self, mode: str, uses_ml: bool = True) -> Iterator[Admission]:
+        """
+        run the body with a model slot, or downgraded to "rule". `uses_ml`
+        False (rule mode, no artifacts) skips the limiter entirely. stage
+        metrics inside the body are labelled with the mode actually run.
+        """
+        if not uses_ml:
+            with request_mode(mode):
+                yield Admission(mode=mode)
+            return
+        if not self._acquire():
+            with request_mode("rule"):
+                yield Admission(mode="rule", degraded_from=mode)
+            return
+        t0 = time.perf_counter()
+        try:
+            with request_mode(mode):
+                yield Admission(mode=mode)
+        finally:
+            self._release(time.perf_counter() - t0)
+
+
+LIMITERS: Dict[str, AdmissionLimiter] = {
+    route: AdmissionLimiter(route, limit) for route, limit in ROUTE_LIMITS.items()
+}
+
+
+def admit(route: str, mode: str, uses_ml: bool = True):
+    """admission for one request to `route` (see AdmissionLimiter.admit)."""
+    return LIMITERS[route].admit(mode, uses_ml)
@@ -0,0 +1,110 @@
+# backend/app/services/disclosure_service.py
+"""
+Section-level views and scoring of stored disclosures, served from the
+page/section index in app/data/disclosure_index.py, and the precomputed
+features of a bond's mapped disclosure (app/data/disclosure_features.py).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.data.disclosure_features import (
+    DisclosureFeatures,
+    disclosures_for_bond,
+    get_doc_features,
+)
+from app.data.disclosure_index import get_index, read_sections
+from app.ml.sections import DEFAULT_SECTIONS
+from app.services.scoring_service import score_disclosure
+
+
+class NoSectionsError(ValueError):
+    """none of the requested sections were detected in the document (422)."""
+
+    def __init__(self, doc_id: str, requested: List[str], detected: List[str]):
+        if detected:
+            found = f"detected: {', '.join(detected)}"
+        else:
+            found = "no sections were detected in this document"
+        super().__init__(
+            f"None of the requested sections ({', '.join(requested)}) found in '{doc_id}'; {found}"
+        )
+        self.requested = requested
+        self.detected = detected
+
+
+def document_summary(doc_id: str) -> Optional[Dict[str, Any]]:
+    index = get_index(doc_id)
+    if index is None:
+        return None
+    sections: Dict[str, Dict[str, Any]] = {}
+    for name, start, end, page in index["sections"]:
+        entry = sections.setdefault(name, {"bytes": 0, "spans": 0, "pages": []})
+        entry["bytes"] += end - start
+        entry["spans"] += 1
+        if page is not None and page not in entry["pages"]:
+            entry["pages"].append(page)
+    return {
+        "doc_id": doc_id,
+        "bytes": index["bytes"],
+        "n_pages": len(index["pages"]) if index["pages"] is not None else None,
+        "sections": sections,
+    }
+
+
+def score_sections(
+    doc_id: str,
+    names: Optional[Iterable[str]] = None,
+    mode: str = "rule",
+    claimed_impact_co2_tons: Optional[float] = None,
+    amount_issued_usd: Optional[float] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    score only the selected sections of a stored disclosure (default: use of
+    proceeds, reporting, external review). returns None for unknown docs and
+    raises NoSectionsError when none of the sections were detected, rather
+    than scoring an empty text.
+    """
+    names = list(names) if names is not None else list(DEFAULT_SECTIONS)
+    texts = read_sections(doc_id, names)
+    if texts is None:
+        return None
+    if not texts:
+        detected = sorted({name for name, _, _, _ in get_index(doc_id)["sections"]})
+        raise NoSectionsError(doc_id, names, detected)
+
+    result = score_disclosure(
+        text="\n\n".join(texts.values()),
+        claimed_impact_co2_tons=claimed_impact_co2_tons,
+        amount_issued_usd=amount_issued_usd,
+        mode=mode,
+    )
+    result["doc_id"] = doc_id
+    result["sections_scored"] = list(texts)
+    result["sections_missing"] = [n for n in names if n not in texts]
+    result["chars_scored"] = sum(len(t) for t in texts.values())
+    return result
+
+
+@dataclass
+class BondDisclosure:
+    doc_id: str
+    method: str
+    issuer_match: str
+    features: DisclosureFeatures
+
+
+def bond_disclosure(bond_id: str) -> Optional[BondDisclosure]:
+    """the bond's highest-ranked mapped disclosure that has stored features."""
+    for entry in disclosures_for_bond(bond_id):
+        features = get_doc_features(entry["doc_id"])
+        if features is not None:
+            return BondDisclosure(
+                doc_id=entry["doc_id"],
+                method=entry["method"],
+                issuer_match=entry["issuer_match"],
+                features=features,
+            )
+    return None
@@ -0,0 +1,176 @@
+# backend/app/services/fast_json.py
+"""
+Fast response bodies for bulk endpoints (bond list, market series, portfolio
+scoring).
+
+routes return a pre-encoded Response instead of python objects, so FastAPI's
+response_model validation and jsonable_encoder walk are skipped:
+
+    - dumps: orjson when installed (numpy arrays / scalars serialized
+      natively, NaN and inf -> null), otherwise the stdlib encoder after a
+      NaN -> None pass
+    - records_body / columns_body: encode a DataFrame straight from its
+      column arrays
+    - encoded_response: gzip or zstd (needs `zstandard`) negotiated from
+      Accept-Encoding for bodies above MIN_COMPRESS_BYTES
+
+see scripts/bench_serialization.py for the comparison with the default path.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from fastapi import Request, Response
+
+from app.core.metrics import stage
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 5
+ZSTD_LEVEL = 3
+
+_ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def orjson_available() -> bool:
+    return orjson is not None
+
+
+def zstd_available() -> bool:
+    return zstandard is not None
+
+
+def _jsonable(obj: Any) -> Any:
+    # stdlib fallback: numpy -> python, NaN / inf -> None
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_jsonable(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return _jsonable(obj.tolist())
+    if isinstance(obj, np.generic):
+        return _jsonable(obj.item())
+    return obj
+
+
+def _encode(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+    return json.dumps(
+        _jsonable(obj), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps(obj: Any) -> bytes:
+    """compact utf-8 json, NaN / inf as null."""
+    with stage("serialize"):
+        return _encode(obj)
+
+
+def _column_values(series: pd.Series) -> List[Any]:
+    # python scalars per column; missing values come out as float nan / None
+    return series.tolist()
+
+
+def records_body(df: pd.DataFrame) -> bytes:
+    """json list of row objects, built column-wise (no per-row pandas access)."""
+    with stage("serialize"):
+        columns = [str(c) for c in df.columns]
+        values = [_column_values(df[c]) for c in df.columns]
+        return _encode([dict(zip(columns, row)) for row in zip(*values)])
+
+
+def columns_body(df: pd.DataFrame) -> bytes:
+    """{"columns": [...], "data": {column: [...]}} straight from the arrays."""
+    with stage("serialize"):
+        data: Dict[str, Any] = {}
+        for c in df.columns:
+            col = df[c]
+            if orjson is not None and col.dtype.kind in "fiub":
+                data[str(c)] = col.to_numpy()
+            else:
+                data[str(c)] = _column_values(col)
+        return _encode({"columns": [str(c) for c in df.columns], "data": data})
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """"zstd", "gzip" or None (identity) for an Accept-Encoding header."""
+    if not accept_encoding:
+        return None
+    offered: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        offered[token.strip().lower()] = q
+    wildcard = offered.get("*", 0.0)
+    candidates = []
+    if zstandard is not None:
+        candidates.append(("zstd", offered.get("zstd", wildcard)))
+    candidates.append(("gzip", offered.get("gzip", offered.get("x-gzip", wildcard))))
+    # highest q wins, zstd first on ties
+    best, q = max(candidates, key=lambda c: c[1])
+    return best if q > 0 else None
+
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """strong etag of the `encoding` representation of a body tagged `etag`."""
+    if encoding is None or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def response_encoding(body: bytes, request: Request) -> Optional[str]:
+    """content-coding encoded_response will use for `body`, None for identity."""
+    if len(body) < MIN_COMPRESS_BYTES:
+        return None
+    return negotiate_encoding(request.headers.get("accept-encoding"))
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    with stage("compress"):
+        if encoding == "zstd":
+            return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def encoded_response(
+    body: bytes,
+    request: Request,
+    media_type: str = "application/json",
+    headers: Optional[Dict[str, str]] = None,
+    status_code: int = 200,
+) -> Response:
+    """Response for an encoded body, compressed when the client accepts it."""
+    headers = dict(headers or {})
+    headers["Vary"] = "Accept-Encoding"
+    encoding = response_encoding(body, request)
+    if encoding is not None:
+        body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+        if "ETag" in headers:
+            # a different representation needs a different strong etag
+            headers["ETag"] = encoded_etag(headers["ETag"], encoding)
+    return Response(content=body, status_code=status_code, media_type=media_type, headers=headers)
@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 import numpy as np
 from joblib import load
 from sentence_transformers import SentenceTransformer
 
+from app.core.metrics import MODEL_LOADS, stage
 from app.ml.preprocessing import clean_text
 # compute BACKEND_ROOT relative to this file (avoid importing missing app.config)
 BACKEND_ROOT = Path(__file__).resolve().parents[2]
@@ -23,12 +24,20 @@ _impact_encoder = None
 def _load_artifact():
     global _impact_artifact, _impact_encoder
     if _impact_artifact is None:
-        _impact_artifact = load(MODEL_PATH)
+        with stage("model_load"):
+            _impact_artifact = load(MODEL_PATH)
+        MODEL_LOADS.inc(model="impact_xgboost")
         model_name = _impact_artifact["text_model_name"]
-        _impact_encoder = SentenceTransformer(model_name)
+        with stage("model_load"):
+            _impact_encoder = SentenceTransformer(model_name)
+        MODEL_LOADS.inc(model="minilm")
     return _impact_artifact, _impact_encoder
 
 
+def ml_impact_available() -> bool:
+    return MODEL_PATH.exists()
+
+
 def _encode_metadata(row: Dict[str, Any], artifact: Dict[str, Any]) -> np.ndarray:
     num_cols = artifact["num_cols"]
     cat_cols = artifact["cat_cols"]
@@ -55,8 +64,32 @@ def _encode_metadata(row: Dict[str, Any], artifact: Dict[str, Any]) -> np.ndarra
     return np.array(feats, dtype=np.float32).reshape(1, -1)
 
 
+def impact_text_model_name() -> Optional[str]:
+    if not ml_impact_available():
+        return None
+    artifact, _ = _load_artifact()
+    return artifact["text_model_name"]
+
+
+def impact_text_embeddings(texts: Sequence[str]) -> Optional[np.ndarray]:
+    """
+    sentence embeddings for `texts` (cleaned here), or None without the
+    artifact. used to precompute the disclosure feature store.
+    """
+    if not ml_impact_available():
+        return None
+    _, encoder = _load_artifact()
+    with stage("minilm_embed"):
+        return np.asarray(encoder.encode([clean_text(t) for t in texts]), dtype=np.float32)
+
+
 def predict_ml_impact_for_bond(
-    *, text: str, amount_issued_usd: Optional[float], project_category: Optional[str]
+    *,
+    text: str,
+    amount_issued_usd: Optional[float],
+    project_category: Optional[str],
+    embedding: Optional[np.ndarray] = None,
+    embedding_model: Optional[str] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     run the ml intensity model for a single bond.
@@ -65,7 +98,9 @@ def predict_ml_impact_for_bond(
         - predicted_impact_mean (tons/year)
         - predicted_impact_std  (tons/year)
         - predicted_intensity_tco2_per_musd
-    or None if something is missing
+    or None if something is missing. a precomputed `embedding` (feature
+    store) replaces encoding `text` when it was made by the artifact's
+    encoder (`embedding_model`).
     """
     # require amount to convert intensity -> total tons; return None if missing
     if amount_issued_usd is None or amount_issued_usd <= 0:
@@ -74,10 +109,15 @@ def predict_ml_impact_for_bond(
 
     artifact, encoder = _load_artifact()
 
-    # clean and embed text using sentence-transformers encoder
-    cleaned = clean_text(text)
-    emb = encoder.encode([cleaned])
-    emb = np.asarray(emb, dtype=np.float32)  # (1, H)
+    if embedding is not None and embedding_model == artifact["text_model_name"]:
+        # precomputed disclosure embedding (feature store), no text work
+        emb = np.asarray(embedding, dtype=np.float32).reshape(1, -1)
+    else:
+        # clean and embed text using sentence-transformers encoder
+        cleaned = clean_text(text)
+        with stage("minilm_embed"):
+            emb = encoder.encode([cleaned])
+        emb = np.asarray(emb, dtype=np.float32)  # (1, H)
 
     # build meta row
     # build metadata vector expected by the saved artifact
@@ -90,7 +130,8 @@ def predict_ml_impact_for_bond(
     feats = np.concatenate([emb, meta_vec], axis=1)  # (1, H+M)
 
     model = artifact["model"]
-    pred_log_intensity = float(model.predict(feats)[0])
+    with stage("xgboost_predict"):
+        pred_log_intensity = float(model.predict(feats)[0])
 
     # model predicts log1p(intensity); convert back to intensity (tCO2 per $1M)
     pred_intensity = float(np.expm1(pred_log_intensity))  # tCO2 per $1M
@@ -104,3 +145,72 @@ def predict_ml_impact_for_bond(
         "predicted_impact_std": pred_std_tons,
         "predicted_intensity_tco2_per_musd": pred_intensity,
     }
+
+
+def predict_ml_impact_batch(
+    *,
+    texts: Sequence[str],
+    amounts_issued_usd: np.ndarray,
+    project_categories: Optional[Sequence[Optional[str]]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    run the ml intensity model for many bonds at once.
+
+    unique cleaned texts are embedded in a single encoder call and all rows go
+    through one model.predict, so cost scales with distinct disclosures rather
+    than with the number of bonds. returns arrays aligned with the inputs:
+        - predicted_impact_mean
+        - predicted_impact_std
+        - predicted_intensity_tco2_per_musd
+    rows without a positive amount are NaN, matching the single-bond None.
+    """
+    amounts = np.asarray(amounts_issued_usd, dtype=np.float64)
+    n = len(amounts)
+    mean = np.full(n, np.nan)
+    std = np.full(n, np.nan)
+    intensity = np.full(n, np.nan)
+
+    valid = np.flatnonzero(np.isfinite(amounts) & (amounts > 0))
+    if valid.size == 0:
+        return {
+            "predicted_impact_mean": mean,
+            "predicted_impact_std": std,
+            "predicted_intensity_tco2_per_musd": intensity,
+        }
+
+    artifact, encoder = _load_artifact()
+
+    # embed each distinct cleaned text once and scatter back to rows
+    cleaned = [clean_text(texts[i]) for i in valid]
+    uniq: Dict[str, int] = {}
+    codes = np.fromiter(
+        (uniq.setdefault(t, len(uniq)) for t in cleaned), dtype=np.int64, count=len(cleaned)
+    )
+    uniq_texts: List[str] = list(uniq)
+    with stage("minilm_embed"):
+        emb = np.asarray(encoder.encode(uniq_texts), dtype=np.float32)[codes]  # (V, H)
+
+    meta_rows = []
+    for i in valid:
+        meta = {"amount_issued_usd": float(amounts[i])}
+        if project_categories is not None and project_categories[i] is not None:
+            meta["project_category"] = project_categories[i]
+        meta_rows.append(_encode_metadata(meta, artifact))
+    meta_vec = np.vstack(meta_rows)  # (V, M)
+
+    feats = np.concatenate([emb, meta_vec], axis=1)  # (V, H+M)
+    with stage("xgboost_predict"):
+        pred_log_intensity = np.asarray(artifact["model"].predict(feats), dtype=np.float64)
+
+    pred_intensity = np.expm1(pred_log_intensity)
+    pred_tons = pred_intensity * (amounts[valid] / 1_000_000.0)
+
+    mean[valid] = pred_tons
+    std[valid] = np.abs(pred_tons) * 0.15
+    intensity[valid] = pred_intensity
+
+    return {
+        "predicted_impact_mean": mean,
+        "predicted_impact_std": std,
+        "predicted_intensity_tco2_per_musd": intensity,
+    }
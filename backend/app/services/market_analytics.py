@@ -0,0 +1,366 @@
+# backend/app/services/market_analytics.py
+"""
+Precomputed market analytics over the per-symbol arrays in market_data_csv.
+
+for every symbol we keep prefix sums of log returns / squared log returns,
+prefix sums of the ytm - ytw spread and a segment tree for max drawdown, so
+any date window is answered in O(1) (returns, volatility, spread) or
+O(log n) (drawdown). when market_series.csv gains new dates the prefix
+arrays are extended with the new tail instead of being recomputed.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.market_data_csv import (
+    SymbolArrays,
+    data_version,
+    load_market_arrays,
+    window_bounds,
+)
+
+# observations per year used to annualize daily volatility
+PERIODS_PER_YEAR = 252
+DEFAULT_ROLLING_WINDOW = 21
+
+
+def _prefix(values: np.ndarray, start: float = 0.0) -> np.ndarray:
+    # prefix[k] = start + sum(values[:k])
+    out = np.empty(len(values) + 1)
+    out[0] = start
+    np.cumsum(values, out=out[1:])
+    out[1:] += start
+    return out
+
+
+class _DrawdownTree:
+    """
+    iterative segment tree over prices; each node stores (max, min, mdd) where
+    mdd is the largest peak-to-trough fraction inside the node. merging left
+    and right nodes: mdd = max(mdd_l, mdd_r, 1 - min_r / max_l).
+    """
+
+    def __init__(self, prices: np.ndarray):
+        n = len(prices)
+        size = 1
+        while size < max(n, 1):
+            size *= 2
+        self.n = n
+        self.size = size
+        self.hi = np.ones(2 * size)
+        self.lo = np.ones(2 * size)
+        self.mdd = np.zeros(2 * size)
+        self.hi[size : size + n] = prices
+        self.lo[size : size + n] = prices
+
+        # build one level at a time with vectorized merges
+        level = size
+        while level > 1:
+            parents = np.arange(level // 2, level)
+            left, right = 2 * parents, 2 * parents + 1
+            self.hi[parents] = np.maximum(self.hi[left], self.hi[right])
+            self.lo[parents] = np.minimum(self.lo[left], self.lo[right])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cross = 1.0 - self.lo[right] / self.hi[left]
+            self.mdd[parents] = np.nanmax(
+                np.vstack([self.mdd[left], self.mdd[right], cross]), axis=0
+            )
+            level //= 2
+
+    @staticmethod
+    def _merge(
+        a: Optional[Tuple[float, float, float]], b: Optional[Tuple[float, float, float]]
+    ) -> Optional[Tuple[float, float, float]]:
+        if a is None:
+            return b
+        if b is None:
+            return a
+        cross = 1.0 - b[1] / a[0] if a[0] > 0 else 0.0
+        return max(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2], cross)
+
+    def query(self, lo: int, hi: int) -> float:
+        """max drawdown (fraction, >= 0) over prices[lo:hi]."""
+        left_acc = right_acc = None
+        lo += self.size
+        hi += self.size
+        while lo < hi:
+            if lo & 1:
+                left_acc = self._merge(
+                    left_acc, (self.hi[lo], self.lo[lo], self.mdd[lo])
+                )
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                right_acc = self._merge(
+                    (self.hi[hi], self.lo[hi], self.mdd[hi]), right_acc
+                )
+            lo //= 2
+            hi //= 2
+        merged = self._merge(left_acc, right_acc)
+        return float(max(merged[2], 0.0)) if merged is not None else 0.0
+
+
+@dataclass
+class _SymbolAnalytics:
+    series_times: np.ndarray
+    series_values: np.ndarray
+    # prefix sums over log returns r[k] = ln(p[k] / p[k-1]), k >= 1
+    ret_sum: np.ndarray
+    ret_sq_sum: np.ndarray
+    drawdown: _DrawdownTree
+    # ytm - ytw spread over all dated rows (nan where either yield missing)
+    times: np.ndarray
+    spread: np.ndarray
+    spread_sum: np.ndarray
+    spread_count: np.ndarray
+    last_spread_idx: np.ndarray
+
+
+def _log_returns(values: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.log(values[1:] / values[:-1])
+
+
+def _last_valid_index(valid: np.ndarray) -> np.ndarray:
+    # last_valid[i] = greatest j <= i with valid[j], or -1
+    idx = np.where(valid, np.arange(len(valid)), -1)
+    return np.maximum.accumulate(idx) if len(idx) else idx
+
+
+def _build(arrays: SymbolArrays) -> _SymbolAnalytics:
+    returns = _log_returns(arrays.series_values)
+    spread = arrays.yield_to_maturity - arrays.yield_to_worst
+    valid = ~np.isnan(spread)
+    return _SymbolAnalytics(
+        series_times=arrays.series_times,
+        series_values=arrays.series_values,
+        ret_sum=_prefix(returns),
+        ret_sq_sum=_prefix(returns * returns),
+        drawdown=_DrawdownTree(arrays.series_values),
+        times=arrays.times,
+        spread=spread,
+        spread_sum=_prefix(np.where(valid, spread, 0.0)),
+        spread_count=_prefix(valid.astype(np.float64)),
+        last_spread_idx=_last_valid_index(valid),
+    )
+
+
+def _extends(old: np.ndarray, new: np.ndarray) -> bool:
+    n = len(old)
+    return len(new) >= n and np.array_equal(new[:n], old, equal_nan=True)
+
+
+def _extend(state: _SymbolAnalytics, arrays: SymbolArrays) -> _SymbolAnalytics:
+    """
+    append-only refresh: reuse existing prefix sums and only process the new
+    tail. falls back to a full build when history was rewritten.
+    """
+    if not (
+        _extends(state.series_times, arrays.series_times)
+        and _extends(state.series_values, arrays.series_values)
+        and _extends(state.times, arrays.times)
+        and _extends(state.spread, arrays.yield_to_maturity - arrays.yield_to_worst)
+    ):
+        return _build(arrays)
+
+    n_old = len(state.series_values)
+    if len(arrays.series_values) == n_old and len(arrays.times) == len(state.times):
+        return state
+
+    # returns for the new tail start at the last old price
+    tail_from = max(n_old - 1, 0)
+    tail_returns = _log_returns(arrays.series_values[tail_from:])
+
+    m_old = len(state.times)
+    spread = arrays.yield_to_maturity - arrays.yield_to_worst
+    tail_spread = spread[m_old:]
+    tail_valid = ~np.isnan(tail_spread)
+
+    last_idx = np.where(tail_valid, np.arange(m_old, len(spread)), -1)
+    prev_last = state.last_spread_idx[-1] if m_old else -1
+    last_idx = np.maximum.accumulate(np.maximum(last_idx, prev_last)) if len(
+        last_idx
+    ) else last_idx
+
+    return _SymbolAnalytics(
+        series_times=arrays.series_times,
+        series_values=arrays.series_values,
+        ret_sum=np.concatenate(
+            [state.ret_sum, _prefix(tail_returns, state.ret_sum[-1])[1:]]
+        ),
+        ret_sq_sum=np.concatenate(
+            [state.ret_sq_sum, _prefix(tail_returns * tail_returns, state.ret_sq_sum[-1])[1:]]
+        ),
+        # the tree is rebuilt level by level in vectorized passes (O(n))
+        drawdown=_DrawdownTree(arrays.series_values),
+        times=arrays.times,
+        spread=spread,
+        spread_sum=np.concatenate(
+            [
+                state.spread_sum,
+                _prefix(np.where(tail_valid, tail_spread, 0.0), state.spread_sum[-1])[1:],
+            ]
+        ),
+        spread_count=np.concatenate(
+            [
+                state.spread_count,
+                _prefix(tail_valid.astype(np.float64), state.spread_count[-1])[1:],
+            ]
+        ),
+        last_spread_idx=np.concatenate([state.last_spread_idx, last_idx]),
+    )
+
+
+_lock = threading.Lock()
+_state: Dict[str, _SymbolAnalytics] = {}
+_state_version: Optional[int] = None
+
+
+def _analytics_for(symbol: str) -> Optional[_SymbolAnalytics]:
+    """
+    return analytics for a symbol, precomputing every symbol when a new data
+    version is seen (extending previous state where possible).
+    """
+    global _state_version
+    version = data_version()
+    with _lock:
+        if version != _state_version:
+            arrays_by_symbol = load_market_arrays()
+            _state.update(
+                {
+                    sym: _extend(_state[sym], arrays)
+                    if sym in _state
+                    else _build(arrays)
+                    for sym, arrays in arrays_by_symbol.items()
+                }
+            )
+            for sym in set(_state) - set(arrays_by_symbol):
+                del _state[sym]
+            _state_version = version
+        return _state.get(symbol)
+
+
+def _window_volatility(
+    a: _SymbolAnalytics, first_ret: int, last_ret: int
+) -> Optional[float]:
+    """annualized std of returns r[first_ret:last_ret] from prefix sums."""
+    m = last_ret - first_ret
+    if m < 2:
+        return None
+    # ret_sum[k] = sum of r[1..k]; r indices are 1-based over prices
+    s1 = a.ret_sum[last_ret - 1] - a.ret_sum[first_ret - 1]
+    s2 = a.ret_sq_sum[last_ret - 1] - a.ret_sq_sum[first_ret - 1]
+    var = (s2 - s1 * s1 / m) / (m - 1)
+    return float(np.sqrt(max(var, 0.0) * PERIODS_PER_YEAR))
+
+
+def _opt(v: float) -> Optional[float]:
+    return None if v is None or not np.isfinite(v) else float(v)
+
+
+def get_series_analytics(
+    symbol: str,
+    days: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    rolling_window: int = DEFAULT_ROLLING_WINDOW,
+    include_rolling_series: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """
+    window analytics for a symbol:
+        - total and annualized return
+        - annualized volatility over the window and over the trailing
+          `rolling_window` observations at the window end
+        - max drawdown
+        - ytm - ytw spread (latest and window mean)
+
+    returns None for unknown symbols.
+    """
+    a = _analytics_for(symbol)
+    if a is None:
+        return None
+
+    arrays = SymbolArrays(
+        times=a.times,
+        price=np.empty(0),
+        yield_to_maturity=np.empty(0),
+        yield_to_worst=np.empty(0),
+        series_times=a.series_times,
+        series_values=a.series_values,
+    )
+    lo, hi = window_bounds(arrays, a.series_times, days, start, end)
+
+    result: Dict[str, Any] = {
+        "symbol": symbol,
+        "days": days,
+        "start": None,
+        "end": None,
+        "n_obs": hi - lo,
+        "total_return": None,
+        "annualized_return": None,
+        "volatility": None,
+        "rolling_window": rolling_window,
+        "rolling_volatility": None,
+        "max_drawdown": None,
+        "spread_ytm_ytw": {"latest": None, "mean": None},
+    }
+    if hi - lo < 1:
+        return result
+
+    def _iso(t: int) -> str:
+        return np.datetime64(int(t), "s").astype("datetime64[D]").item().isoformat()
+
+    result["start"] = _iso(a.series_times[lo])
+    result["end"] = _iso(a.series_times[hi - 1])
+
+    p0, p1 = a.series_values[lo], a.series_values[hi - 1]
+    total = p1 / p0 - 1.0 if p0 else np.nan
+    years = (a.series_times[hi - 1] - a.series_times[lo]) / (365.25 * 86_400)
+    result["total_return"] = _opt(total)
+    if years > 0 and np.isfinite(total) and total > -1:
+        result["annualized_return"] = _opt((1.0 + total) ** (1.0 / years) - 1.0)
+
+    # returns inside the window are r[lo+1 .. hi-1]
+    result["volatility"] = _window_volatility(a, lo + 1, hi)
+    result["rolling_volatility"] = _window_volatility(
+        a, max(lo + 1, hi - rolling_window), hi
+    )
+    result["max_drawdown"] = a.drawdown.query(lo, hi)
+
+    if include_rolling_series and hi - lo > rolling_window:
+        # vectorized rolling std from prefix-sum differences
+        ends = np.arange(lo + rolling_window, hi)  # last price index of each window
+        s1 = a.ret_sum[ends] - a.ret_sum[ends - rolling_window]
+        s2 = a.ret_sq_sum[ends] - a.ret_sq_sum[ends - rolling_window]
+        var = (s2 - s1 * s1 / rolling_window) / max(rolling_window - 1, 1)
+        vol = np.sqrt(np.clip(var, 0.0, None) * PERIODS_PER_YEAR)
+        result["rolling_volatility_series"] = [
+            {"time": t, "value": v}
+            for t, v in zip(a.series_times[ends].tolist(), vol.tolist())
+        ]
+
+    # spread uses all dated rows (yields can exist without a price)
+    s_lo, s_hi = window_bounds(arrays, a.times, days, start, end)
+    if s_hi > s_lo:
+        count = a.spread_count[s_hi] - a.spread_count[s_lo]
+        last = a.last_spread_idx[s_hi - 1]
+        result["spread_ytm_ytw"] = {
+            "latest": _opt(a.spread[last]) if last >= s_lo else None,
+            "mean": _opt((a.spread_sum[s_hi] - a.spread_sum[s_lo]) / count)
+            if count > 0
+            else None,
+        }
+
+    return result
+
+
+def warm_analytics() -> List[str]:
+    """precompute analytics for every symbol; returns the symbols loaded."""
+    _analytics_for("")
+    return sorted(_state)
@@ -1,68 +1,346 @@
+from dataclasses import dataclass
+from datetime import date
 from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
 
 import pandas as pd
 import numpy as np
 
+from app.core.metrics import DATA_ROWS
+
 DATA_PATH = Path(__file__).resolve().parents[2] / "app" / "data" / "market_series.csv"
 
+_SECONDS_PER_DAY = 86_400
+
+
+def data_version() -> int:
+    """modification time of market_series.csv; changes when new dates land."""
+    if not DATA_PATH.exists():
+        raise FileNotFoundError(f"Market data file not found: {DATA_PATH}")
+    return DATA_PATH.stat().st_mtime_ns
+
 
-@lru_cache(maxsize=1)
 def _load_market_df() -> pd.DataFrame:
     """
     load market_series.csv once and cache it in memory.
     expected columns:
         symbol, date, price, yield_to_maturity, yield_to_worst, nav
+
+    the cache is keyed by the file's mtime, so a rebuilt csv is picked up
+    on the next request.
     """
-    if not DATA_PATH.exists():
-        raise FileNotFoundError(f"Market data file not found: {DATA_PATH}")
+    return _load_market_df_version(data_version())
 
+
+@lru_cache(maxsize=1)
+def _load_market_df_version(version: int) -> pd.DataFrame:
     df = pd.read_csv(DATA_PATH)
     df["date"] = pd.to_datetime(df["date"], errors="coerce")
     return df
 
 
-def get_price_series(symbol: str, days: Optional[int] = None) -> List[Dict]:
+@dataclass(frozen=True)
+class SymbolArrays:
+    """
+    one symbol's rows as date-sorted numpy arrays.
+
+    `times` / `price` / yields cover every dated row (used by summaries);
+    `series_times` / `series_values` keep only rows with a price (price,
+    falling back to nav) and back the chart series.
+    """
+
+    times: np.ndarray  # int64 unix seconds
+    price: np.ndarray  # float64, price with nav fallback
+    yield_to_maturity: np.ndarray
+    yield_to_worst: np.ndarray
+    series_times: np.ndarray
+    series_values: np.ndarray
+
+
+def _column(df: pd.DataFrame, col: str) -> np.ndarray:
+    if col not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64)
+
+
+def load_market_arrays() -> Dict[str, SymbolArrays]:
+    """
+    partition the cached market frame by symbol into sorted arrays.
+
+    price/nav fallback and date -> unix seconds are resolved once here so
+    requests only slice arrays.
+    """
+    return load_market_arrays_at(data_version())
+
+
+@lru_cache(maxsize=1)
+def load_market_arrays_at(version: int) -> Dict[str, SymbolArrays]:
+    df = _load_market_df_version(version)
+    df = df[df["date"].notna()]
+    # stable sort keeps file order for equal dates within a symbol
+    df = df.sort_values(["symbol", "date"], kind="mergesort")
+
+    times_all = df["date"].to_numpy(dtype="datetime64[s]").astype(np.int64)
+    price_all = _column(df, "price")
+    price_all = np.where(np.isnan(price_all), _column(df, "nav"), price_all)
+    ytm_all = _column(df, "yield_to_maturity")
+    ytw_all = _column(df, "yield_to_worst")
+
+    symbols = df["symbol"].to_numpy()
+    DATA_ROWS.set(len(symbols), dataset="market_series")
+    out: Dict[str, SymbolArrays] = {}
+    if len(symbols) == 0:
+        return out
+
+    # contiguous runs of each symbol after the sort
+    bounds = np.flatnonzero(symbols[1:] != symbols[:-1]) + 1
+    starts = np.concatenate([[0], bounds])
+    ends = np.concatenate([bounds, [len(symbols)]])
+
+    for lo, hi in zip(starts, ends):
+        times = times_all[lo:hi]
+        price = price_all[lo:hi]
+        valid = ~np.isnan(price)
+        out[str(symbols[lo])] = SymbolArrays(
+            times=times,
+            price=price,
+            yield_to_maturity=ytm_all[lo:hi],
+            yield_to_worst=ytw_all[lo:hi],
+            series_times=times[valid],
+            series_values=price[valid],
+        )
+    DATA_ROWS.set(len(out), dataset="market_symbols")
+    return out
+
+
+def get_symbol_arrays(symbol: str) -> Optional[SymbolArrays]:
+    """return the pre-split arrays for a symbol, or None if unknown."""
+    return load_market_arrays().get(symbol)
+
+
+def _to_unix(d: date) -> int:
+    return int(np.datetime64(d, "D").astype("datetime64[s]").astype(np.int64))
+
+
+def window_bounds(
+    arrays: SymbolArrays,
+    times: np.ndarray,
+    days: Optional[int],
+    start: Optional[date],
+    end: Optional[date],
+) -> Tuple[int, int]:
+    """
+    binary-search [lo, hi) positions in `times` for the requested window.
+
+    `days` counts back from `end` (or from the symbol's latest date), and an
+    explicit `start` / `end` are inclusive calendar dates.
+    """
+    lo, hi = 0, len(times)
+    if end is not None:
+        hi = int(np.searchsorted(times, _to_unix(end) + _SECONDS_PER_DAY, side="left"))
+    if start is not None:
+        lo = int(np.searchsorted(times, _to_unix(start), side="left"))
+    if days is not None and len(arrays.times):
+        anchor = arrays.times[-1] if end is None else min(
+            arrays.times[-1], _to_unix(end)
+        )
+        cutoff = anchor - days * _SECONDS_PER_DAY
+        lo = max(lo, int(np.searchsorted(times, cutoff, side="left")))
+    return lo, max(lo, hi)
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    largest-triangle-three-buckets: keep first/last points and, per bucket,
+    the point forming the largest triangle with the previous pick and the
+    next bucket's mean. work per bucket is vectorized.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    xf = x.astype(np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0] = 0
+    picked[-1] = n - 1
+
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        nxt_lo, nxt_hi = hi, edges[b + 2] if b + 2 < len(edges) else n
+        avg_x = xf[nxt_lo:nxt_hi].mean()
+        avg_y = y[nxt_lo:nxt_hi].mean()
+        area = np.abs(
+            (xf[prev] - avg_x) * (y[lo:hi] - y[prev])
+            - (xf[prev] - xf[lo:hi]) * (avg_y - y[prev])
+        )
+        prev = lo + int(np.argmax(area))
+        picked[b + 1] = prev
+
+    return picked
+
+
+def _minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    min/max bucketing: split into (n_out - 2) // 2 equal buckets and keep
+    each bucket's min and max point, plus the first and last points.
+    """
+    n = len(y)
+    n_buckets = max(1, (n_out - 2) // 2)
+    if n_out >= n or n_buckets * 2 >= n:
+        return np.arange(n)
+
+    size = -(-n // n_buckets)  # ceil division
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(n_buckets, size)
+    keep = ~np.all(np.isnan(blocks), axis=1)
+    offsets = np.arange(n_buckets)[keep] * size
+    blocks = blocks[keep]
+
+    lo_idx = offsets + np.nanargmin(blocks, axis=1)
+    hi_idx = offsets + np.nanargmax(blocks, axis=1)
+    picked = np.unique(np.concatenate([[0], lo_idx, hi_idx, [n - 1]]))
+    return picked
+
+
+@lru_cache(maxsize=512)
+def downsampled_indices(
+    version: int, symbol: str, lo: int, hi: int, max_points: int, method: str
+) -> np.ndarray:
+    # cached per data version, symbol and resolved window; repeated zoom
+    # levels map to the same (lo, hi) so chart reloads hit the cache
+    arrays = load_market_arrays_at(version)[symbol]
+    times = arrays.series_times[lo:hi]
+    values = arrays.series_values[lo:hi]
+    if method == "minmax":
+        idx = _minmax_indices(values, max_points)
+    else:
+        idx = _lttb_indices(times, values, max_points)
+    idx = idx + lo
+    idx.setflags(write=False)
+    return idx
+
+
+def get_price_series(
+    symbol: str,
+    days: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    max_points: Optional[int] = None,
+    method: str = "lttb",
+) -> List[Dict]:
     """
     return price series for a given symbol in lightweight-charts format:
         [{ time: unix_timestamp, value: price }, ...]
     uses 'price' if available, otherwise 'nav'
-    """
-    df = _load_market_df()
-    # filter by requested symbol and sort by date
-    df = df[df["symbol"] == symbol].copy()
-    df = df.sort_values("date")
 
-    if df.empty:
+    with `max_points`, windows longer than that are downsampled with
+    largest-triangle-three-buckets (`method="lttb"`) or min/max buckets
+    (`method="minmax"`).
+    """
+    version = data_version()
+    arrays = load_market_arrays_at(version).get(symbol)
+    if arrays is None:
         return []
 
-    if days is not None:
-        max_date = df["date"].max()
-        cutoff = max_date - pd.Timedelta(days=days)
-        df = df[df["date"] >= cutoff]
+    times = arrays.series_times
+    lo, hi = window_bounds(arrays, times, days, start, end)
 
-    records: List[Dict] = []
-    # convert rows to frontend-friendly series
-    for _, row in df.iterrows():
-        date = row["date"]
-        if pd.isna(date):
-            continue
+    if max_points is not None and hi - lo > max_points:
+        idx = downsampled_indices(version, symbol, lo, hi, max_points, method)
+        t_out, v_out = times[idx], arrays.series_values[idx]
+    else:
+        t_out, v_out = times[lo:hi], arrays.series_values[lo:hi]
+
+    # build the response straight from the array slices
+    return [{"time": t, "value": v} for t, v in zip(t_out.tolist(), v_out.tolist())]
+
+
+def _forward_fill(values: np.ndarray) -> np.ndarray:
+    # carry the last non-nan value forward; leading gaps stay nan
+    idx = np.where(np.isnan(values), -1, np.arange(len(values)))
+    np.maximum.accumulate(idx, out=idx)
+    filled = values[np.maximum(idx, 0)]
+    filled[idx < 0] = np.nan
+    return filled
+
+
+def get_aligned_series(
+    symbols: List[str],
+    days: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    ffill: bool = True,
+    rebase: bool = False,
+    as_arrays: bool = False,
+) -> Dict:
+    """
+    align several symbols on one date axis in a single pass:
+
+    {
+        "symbols": ["A", "B"],
+        "missing": [],
+        "time": [unix_ts, ...],
+        "series": {"A": [v or null, ...], "B": [...]}
+    }
 
-        price = row.get("price", np.nan)
-        if pd.isna(price):
-            price = row.get("nav", np.nan)
-        if pd.isna(price):
+    the axis is the union of each symbol's windowed dates; values are placed
+    with searchsorted, optionally forward-filled and rebased to 100 at each
+    symbol's first value in the window. `as_arrays` keeps "time" and the
+    series as numpy arrays (NaN for gaps) for fast_json to encode directly.
+    """
+    found: List[str] = []
+    missing: List[str] = []
+    slices: List[Tuple[np.ndarray, np.ndarray]] = []
+
+    arrays_by_symbol = load_market_arrays()
+    for symbol in symbols:
+        arrays = arrays_by_symbol.get(symbol)
+        if arrays is None:
+            missing.append(symbol)
             continue
+        lo, hi = window_bounds(arrays, arrays.series_times, days, start, end)
+        found.append(symbol)
+        slices.append((arrays.series_times[lo:hi], arrays.series_values[lo:hi]))
+
+    if not slices:
+        return {"symbols": [], "missing": missing, "time": [], "series": {}}
 
-        # date -> unix timestamp in seconds
-        ts = int(date.timestamp())
-        records.append({"time": ts, "value": float(price)})
+    # inputs are already sorted, so the union is a merge + dedupe
+    axis = np.unique(np.concatenate([t for t, _ in slices]))
 
-    return records
+    series: Dict[str, Any] = {}
+    for symbol, (times, values) in zip(found, slices):
+        column = np.full(len(axis), np.nan)
+        column[np.searchsorted(axis, times)] = values
+        if ffill:
+            column = _forward_fill(column)
+        if rebase:
+            first = np.flatnonzero(~np.isnan(column))
+            if first.size and column[first[0]] != 0:
+                column = column * (100.0 / column[first[0]])
+        if as_arrays:
+            series[symbol] = column
+        else:
+            series[symbol] = np.where(np.isnan(column), None, column).tolist()
 
+    return {
+        "symbols": found,
+        "missing": missing,
+        "time": axis if as_arrays else axis.tolist(),
+        "series": series,
+    }
 
-def get_series_summary(symbol: str, days: Optional[int] = None) -> Dict:
+
+def get_series_summary(
+    symbol: str,
+    days: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> Dict:
     """
     return a small summary with the latest price and yields:
 
@@ -77,44 +355,31 @@ def get_series_summary(symbol: str, days: Optional[int] = None) -> Dict:
         }
     }
     """
-    df = _load_market_df()
-    # narrow to symbol and order by date
-    df = df[df["symbol"] == symbol].copy()
-    df = df.sort_values("date")
-
-    if df.empty:
+    arrays = get_symbol_arrays(symbol)
+    if arrays is None:
         return {"symbol": symbol, "days": days, "latest": None}
 
-    if days is not None:
-        max_date = df["date"].max()
-        cutoff = max_date - pd.Timedelta(days=days)
-        df = df[df["date"] >= cutoff]
-
-    if df.empty:
+    lo, hi = window_bounds(arrays, arrays.times, days, start, end)
+    if hi <= lo:
         return {"symbol": symbol, "days": days, "latest": None}
 
     # pick latest available row in the filtered timeframe
-    latest = df.iloc[-1]
+    i = hi - 1
 
-    # price or nav
-    price = latest.get("price", np.nan)
-    if pd.isna(price):
-        price = latest.get("nav", np.nan)
+    def _opt(values: np.ndarray) -> Optional[float]:
+        v = values[i]
+        return None if np.isnan(v) else float(v)
 
     latest_dict = {
-        "date": latest["date"].date().isoformat()
-        if not pd.isna(latest["date"])
-        else None,
-        "price": float(price) if not pd.isna(price) else None,
-        "yield_to_maturity": None,
-        "yield_to_worst": None,
+        "date": np.datetime64(int(arrays.times[i]), "s")
+        .astype("datetime64[D]")
+        .item()
+        .isoformat(),
+        "price": _opt(arrays.price),
+        "yield_to_maturity": _opt(arrays.yield_to_maturity),
+        "yield_to_worst": _opt(arrays.yield_to_worst),
     }
 
-    # copy yield fields if present and numeric
-    for col in ["yield_to_maturity", "yield_to_worst"]:
-        if col in latest and not pd.isna(latest[col]):
-            latest_dict[col] = float(latest[col])
-
     return {
         "symbol": symbol,
         "days": days,
@@ -0,0 +1,154 @@
+# backend/app/services/market_payloads.py
+"""
+Pre-serialized market series payloads.
+
+series responses are encoded to bytes once per (data version, symbol, window,
+format) and reused, with a content hash for ETag and the csv mtime for
+Last-Modified. common chart windows are encoded as soon as a data version is
+first served.
+
+formats:
+    - records:  [{"time": ts, "value": v}, ...]  (default, same as before)
+    - columnar: {"time": [...], "value": [...]}
+    - f64:      little-endian float64 times followed by float64 values
+    - arrow:    Arrow IPC stream with time (int64) / value (float64) columns,
+                only when pyarrow is installed
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import date
+from email.utils import formatdate
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+
+from app.services.market_data_csv import (
+    data_version,
+    downsampled_indices,
+    load_market_arrays_at,
+    window_bounds,
+)
+
+FORMATS = ("records", "columnar", "f64", "arrow")
+MEDIA_TYPES = {
+    "records": "application/json",
+    "columnar": "application/json",
+    "f64": "application/octet-stream",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# day windows the frontend asks for; encoded ahead of the first request
+COMMON_WINDOWS_DAYS = (30, 90, 180, 365, 1825, None)
+PRESERIALIZED_FORMATS = ("records", "columnar", "f64")
+
+
+@dataclass(frozen=True)
+class SeriesPayload:
+    body: bytes
+    media_type: str
+    etag: str
+    last_modified: str
+    n_points: int
+
+
+def arrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _dumps(obj) -> bytes:
+    # same encoding FastAPI's JSONResponse uses
+    return json.dumps(
+        obj, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _encode(times: np.ndarray, values: np.ndarray, fmt: str) -> bytes:
+    if fmt == "columnar":
+        return _dumps({"time": times.tolist(), "value": values.tolist()})
+    if fmt == "f64":
+        return times.astype("<f8").tobytes() + values.astype("<f8").tobytes()
+    if fmt == "arrow":
+        import pyarrow as pa
+
+        table = pa.table(
+            {"time": pa.array(times, pa.int64()), "value": pa.array(values, pa.float64())}
+        )
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    return _dumps(
+        [{"time": t, "value": v} for t, v in zip(times.tolist(), values.tolist())]
+    )
+
+
+@lru_cache(maxsize=512)
+def _series_payload(
+    version: int,
+    symbol: str,
+    days: Optional[int],
+    start: Optional[date],
+    end: Optional[date],
+    max_points: Optional[int],
+    method: str,
+    fmt: str,
+) -> Optional[SeriesPayload]:
+    arrays = load_market_arrays_at(version).get(symbol)
+    if arrays is None:
+        return None
+
+    times = arrays.series_times
+    lo, hi = window_bounds(arrays, times, days, start, end)
+    if hi <= lo:
+        return None
+
+    if max_points is not None and hi - lo > max_points:
+        idx = downsampled_indices(version, symbol, lo, hi, max_points, method)
+        t_out, v_out = times[idx], arrays.series_values[idx]
+    else:
+        t_out, v_out = times[lo:hi], arrays.series_values[lo:hi]
+
+    body = _encode(t_out, v_out, fmt)
+    return SeriesPayload(
+        body=body,
+        media_type=MEDIA_TYPES[fmt],
+        etag='"' + hashlib.sha1(body).hexdigest() + '"',
+        last_modified=formatdate(version / 1e9, usegmt=True),
+        n_points=int(len(t_out)),
+    )
+
+
+@lru_cache(maxsize=1)
+def _preserialize_common_windows(version: int) -> Tuple[int, ...]:
+    for symbol in load_market_arrays_at(version):
+        for days in COMMON_WINDOWS_DAYS:
+            for fmt in PRESERIALIZED_FORMATS:
+                _series_payload(version, symbol, days, None, None, None, "lttb", fmt)
+    return (version,)
+
+
+def get_series_payload(
+    symbol: str,
+    days: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    max_points: Optional[int] = None,
+    method: str = "lttb",
+    fmt: str = "records",
+) -> Optional[SeriesPayload]:
+    """
+    return the encoded series for a window, or None when there is no data.
+    bodies are cached, so repeated requests skip encoding entirely.
+    """
+    version = data_version()
+    _preserialize_common_windows(version)
+    return _series_payload(version, symbol, days, start, end, max_points, method, fmt)
@@ -0,0 +1,128 @@
+# backend/app/services/metrics_service.py
+"""
+Scrape-time metrics for GET /metrics, next to the hot-path histograms,
+counters and gauges in app/core/metrics.py:
+
+    - cache hits / misses of the lru-cached loaders (cache_info(), nothing
+      is counted on the request path)
+    - admission control per route: outcomes, active and queued requests
+    - single-flight: leaders, coalesced requests, computations in flight
+    - size and age of the data snapshots on disk
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
+
+from app.core.metrics import REGISTRY, Family, Samples
+from app.data import disclosure_features, disclosure_index
+from app.data.load_bonds import BONDS_CSV
+from app.services import market_data_csv, market_payloads, portfolio_service
+from app.services.admission import LIMITERS
+from app.services.single_flight import FLIGHTS
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# cache name -> lru_cache-wrapped function
+LRU_CACHES: Dict[str, Callable] = {
+    "market_frame": market_data_csv._load_market_df_version,
+    "market_arrays": market_data_csv.load_market_arrays_at,
+    "market_downsample": market_data_csv.downsampled_indices,
+    "market_payload": market_payloads._series_payload,
+    "portfolio_universe": portfolio_service._bond_universe,
+    "feature_store": disclosure_features._load_feature_store_at,
+    "bond_disclosures": disclosure_features._load_bond_disclosures_at,
+    "disclosure_index": disclosure_index._load_index_at,
+}
+
+DATA_FILES: Dict[str, Path] = {
+    "bonds": BONDS_CSV,
+    "market_series": market_data_csv.DATA_PATH,
+    "disclosure_features": disclosure_features.FEATURES_PATH,
+    "bond_disclosures": disclosure_features.BOND_DISCLOSURES_CSV,
+}
+
+
+def _cache_families() -> Iterator[Family]:
+    hits: Samples = []
+    misses: Samples = []
+    entries: Samples = []
+    for name, fn in LRU_CACHES.items():
+        info = fn.cache_info()
+        hits.append(({"cache": name}, info.hits))
+        misses.append(({"cache": name}, info.misses))
+        entries.append(({"cache": name}, info.currsize))
+    # coalesced single-flight requests are hits on the in-flight result
+    for name, flight in FLIGHTS.items():
+        hits.append(({"cache": f"single_flight_{name}"}, flight.stats["coalesced"]))
+        misses.append(({"cache": f"single_flight_{name}"}, flight.stats["leaders"]))
+    yield ("green_prism_cache_hits_total", "counter", "Cache lookups answered from the cache.", hits)
+    yield ("green_prism_cache_misses_total", "counter", "Cache lookups that computed the value.", misses)
+    yield ("green_prism_cache_entries", "gauge", "Entries currently held per cache.", entries)
+
+
+def _admission_families() -> Iterator[Family]:
+    outcomes: Samples = []
+    active: Samples = []
+    waiting: Samples = []
+    for route, limiter in LIMITERS.items():
+        for outcome, n in limiter.stats.items():
+            outcomes.append(({"route": route, "outcome": outcome}, n))
+        active.append(({"route": route}, limiter.active))
+        waiting.append(({"route": route}, limiter.waiting))
+    yield (
+        "green_prism_admission_total",
+        "counter",
+        "Admission control decisions per ml-backed route.",
+        outcomes,
+    )
+    yield ("green_prism_admission_active", "gauge", "Requests holding a model slot.", active)
+    yield ("green_prism_admission_waiting", "gauge", "Requests queued for a model slot.", waiting)
+
+
+def _single_flight_families() -> Iterator[Family]:
+    calls: Samples = []
+    in_flight: Samples = []
+    for name, flight in FLIGHTS.items():
+        for role, n in flight.stats.items():
+            calls.append(({"flight": name, "role": role}, n))
+        in_flight.append(({"flight": name}, flight.in_flight()))
+    yield (
+        "green_prism_single_flight_total",
+        "counter",
+        "Single-flight callers that computed (leaders) or waited (coalesced).",
+        calls,
+    )
+    yield ("green_prism_single_flight_in_flight", "gauge", "Computations running per key space.", in_flight)
+
+
+def _data_file_families() -> Iterator[Family]:
+    sizes: Samples = []
+    ages: Samples = []
+    now = time.time()
+    for name, path in DATA_FILES.items():
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        sizes.append(({"dataset": name}, st.st_size))
+        ages.append(({"dataset": name}, round(now - st.st_mtime, 3)))
+    yield ("green_prism_data_file_bytes", "gauge", "Size of the data snapshot on disk.", sizes)
+    yield ("green_prism_data_file_age_seconds", "gauge", "Seconds since the snapshot was written.", ages)
+
+
+_COLLECTORS: List[Callable[[], Iterator[Family]]] = [
+    _cache_families,
+    _admission_families,
+    _single_flight_families,
+    _data_file_families,
+]
+for _collector in _COLLECTORS:
+    REGISTRY.register_collector(_collector)
+
+
+def render_metrics() -> str:
+    """all metrics in the Prometheus text exposition format."""
+    return REGISTRY.render()
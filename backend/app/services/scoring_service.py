@@ -6,33 +6,59 @@ impact model, and explanation generation.
 
 from typing import Any, Dict, Optional
 
+from app.data.disclosure_features import DisclosureFeatures
+from app.ml.features import Evidence
 from app.ml.preprocessing import clean_text
 from app.ml.transparency_model import score_transparency
 from app.ml.impact_gap_model import predict_impact_gap
 from app.ml.explanations import build_explanations
 from app.ml.transparency_model_ml import (
+    encoder_name,
     predict_transparency_score_ml,
+    predict_transparency_score_ml_from_features,
     ml_model_available,
 )
 
 
+def uses_ml_model(mode: str) -> bool:
+    """whether scoring in `mode` runs the ml transparency model."""
+    return mode in ("ml", "blend") and ml_model_available()
+
+
 def score_disclosure(
     text: str,
     claimed_impact_co2_tons: Optional[float] = None,
     amount_issued_usd: Optional[float] = None,
     mode: str = "rule",  # "rule" | "ml" | "blend"
+    precomputed: Optional[DisclosureFeatures] = None,
 ) -> Dict[str, Any]:
-    cleaned = clean_text(text)
+    # with precomputed features (disclosure feature store) `text` is ignored
+    # and no text processing happens here; explanation evidence then comes
+    # from the spans captured when those features were computed
+    cleaned = clean_text(text) if precomputed is None else ""
+    evidence = Evidence() if precomputed is None else precomputed.evidence
 
     # clean input text and prepare features
     # rule-based teacher
-    transparency_components = score_transparency(cleaned)
+    transparency_components = score_transparency(
+        cleaned,
+        precomputed_features=precomputed.text_features if precomputed is not None else None,
+        evidence=evidence,
+    )
     rule_score = round(transparency_components.overall, 1)
 
     # optional ml score: compute if mode requests it and artifact exists
     ml_score: Optional[float] = None
     if mode in ("ml", "blend") and ml_model_available():
-        ml_score = predict_transparency_score_ml(cleaned)
+        if precomputed is None:
+            ml_score = predict_transparency_score_ml(cleaned)
+        elif (
+            precomputed.transparency_embedding is not None
+            and precomputed.transparency_model == encoder_name()
+        ):
+            ml_score = predict_transparency_score_ml_from_features(
+                precomputed.transparency_embedding, precomputed.handcrafted
+            )
 
     # decide final transparency_score using selected mode
     if mode == "ml" and ml_score is not None:
@@ -53,7 +79,7 @@ def score_disclosure(
     greenwashing_risk = "medium"
 
     # build human-readable explanations from model outputs
-    explanations = build_explanations(cleaned, transparency_components, impact_result)
+    explanations = build_explanations(cleaned, transparency_components, impact_result, evidence)
 
     return {
         "mode": source,
@@ -68,4 +94,5 @@ def score_disclosure(
         "impact_prediction": impact_result,
         "greenwashing_risk": greenwashing_risk,
         "explanations": explanations,
+        "evidence": evidence.as_dict() if evidence is not None else None,
     }
@@ -0,0 +1,84 @@
+# backend/app/services/single_flight.py
+"""
+Single-flight coalescing of identical concurrent computations.
+
+the first request for a key runs the computation; requests for the same key
+that arrive while it is running wait for that result (or exception) instead
+of recomputing. nothing is cached once the computation finishes, so keys
+only need to identify what is computed *right now*: callers put the inputs
+plus the versions of the data files read in the key (model artifacts are
+loaded once per process and never change underneath a computation).
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def file_versions(*paths: Path) -> Tuple[int, ...]:
+    """mtime_ns per path (0 when missing), for data / model versions in keys."""
+    out = []
+    for p in paths:
+        try:
+            out.append(p.stat().st_mtime_ns)
+        except OSError:
+            out.append(0)
+    return tuple(out)
+
+
+# every SingleFlight by name, for /metrics
+FLIGHTS: Dict[str, "SingleFlight"] = {}
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        # leaders ran the computation, coalesced waited for a leader's result
+        self.stats = {"leaders": 0, "coalesced": 0}
+        FLIGHTS[name] = self
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """result of fn(), shared with concurrent callers using the same key."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.stats["coalesced"] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.stats["leaders"] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
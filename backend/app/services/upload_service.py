@@ -0,0 +1,252 @@
+# backend/app/services/upload_service.py
+"""
+Streaming analysis of uploaded disclosures (plain text or PDF).
+
+the upload is consumed chunk by chunk and fed to StreamingFeatureExtractor,
+so the document is never held as one string:
+
+    - text: bytes are decoded incrementally (utf-8) and each chunk updates
+      the keyword / number counts
+    - pdf: pypdf needs random access, so the bytes go to a temporary file.
+      it is parsed in a spawned worker process (app/data/pdf_pages.py) with
+      a deadline per page and a wall-clock cap per file; page texts stream
+      back and are fed to the extractor one at a time. a parse over the cap
+      is killed and answered with 422. parses share the "pdf_parse"
+      admission limit (429 / 503 when it is saturated). without pypdf
+      installed pdf uploads get 415
+
+the result has the same shape as score_disclosure, plus an "upload" block.
+"""
+
+from __future__ import annotations
+
+import codecs
+import multiprocessing
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.data.disclosure_features import DisclosureFeatures
+from app.data.pdf_pages import pypdf_available, send_pages_worker
+from app.ml.features import Evidence, StreamingFeatureExtractor
+from app.ml.transparency_model_ml import encoder_name, transparency_embeddings
+from app.services.admission import admit
+from app.services.scoring_service import score_disclosure, uses_ml_model
+
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+# an upload's pdf parse: seconds per page, and for the whole file
+PDF_PAGE_TIMEOUT_S = 10.0
+PDF_PARSE_TIMEOUT_S = 60.0
+# the encoder truncates to 256 tokens, this is comfortably more text than that
+ENCODER_HEAD_CHARS = 8192
+
+PDF_MAGIC = b"%PDF-"
+
+
+class UploadError(ValueError):
+    """upload that can't be analyzed; `status_code` is the http status to use."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class UploadStats:
+    kind: str  # "text" | "pdf"
+    bytes: int = 0
+    pages: Optional[int] = None
+    failed_pages: int = 0
+    timed_out_pages: int = 0
+
+
+def _upload_kind(content_type: Optional[str], first_bytes: bytes) -> str:
+    ctype = (content_type or "").split(";")[0].strip().lower()
+    if ctype == "application/pdf" or first_bytes.startswith(PDF_MAGIC):
+        if not pypdf_available():
+            raise UploadError(
+                "PDF uploads are not supported on this server (pypdf is not installed)",
+                status_code=415,
+            )
+        return "pdf"
+    if ctype.startswith("multipart/"):
+        raise UploadError(
+            "Send the file as the raw request body (Content-Type: text/plain or application/pdf)",
+            status_code=415,
+        )
+    if ctype in ("", "application/octet-stream") or ctype.startswith("text/"):
+        return "text"
+    raise UploadError(f"Unsupported content type: {ctype}", status_code=415)
+
+
+def _check_size(stats: UploadStats, n: int) -> None:
+    stats.bytes += n
+    if stats.bytes > MAX_UPLOAD_BYTES:
+        raise UploadError(
+            f"Upload exceeds {MAX_UPLOAD_BYTES // (1024 * 1024)} MB", status_code=413
+        )
+
+
+def _extract_pdf_pages(
+    pdf_path: str, extractor: StreamingFeatureExtractor, stats: UploadStats, mode: str
+) -> None:
+    # runs in the threadpool, waiting on a killable worker process
+    with admit("pdf_parse", mode):
+        ctx = multiprocessing.get_context("spawn")
+        conn, child_conn = ctx.Pipe(duplex=False)
+        process = ctx.Process(
+            target=send_pages_worker,
+            args=(pdf_path, PDF_PAGE_TIMEOUT_S, child_conn),
+            daemon=True,
+        )
+        process.start()
+        # drop our copy of the write end so a dead worker shows up as EOF
+        child_conn.close()
+        deadline = time.monotonic() + PDF_PARSE_TIMEOUT_S
+        stats.pages = 0
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not conn.poll(remaining):
+                    raise UploadError(
+                        f"PDF parsing timed out after {PDF_PARSE_TIMEOUT_S:g}s", status_code=422
+                    )
+                try:
+                    msg = conn.recv()
+                except EOFError:
+                    raise UploadError("PDF parser crashed on this file", status_code=422)
+                if msg[0] == "error":
+                    raise UploadError(f"Could not read PDF: {msg[1]}", status_code=422)
+                if msg[0] == "done":
+                    _, _, stats.failed_pages, stats.timed_out_pages = msg
+                    return
+                stats.pages += 1
+                if msg[1]:
+                    extractor.update(msg[1])
+                    extractor.update("\n")
+        finally:
+            if process.is_alive():
+                process.kill()
+            process.join()
+            conn.close()
+
+
+async def stream_features(
+    chunks: AsyncIterator[bytes],
+    content_type: Optional[str],
+    extractor: StreamingFeatureExtractor,
+    mode: str = "rule",
+) -> UploadStats:
+    """feed an uploaded body to `extractor`; returns what was read."""
+    stats: Optional[UploadStats] = None
+    head = b""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    # named, so the parse worker process can open it
+    spool = tempfile.NamedTemporaryFile(suffix=".pdf")
+    try:
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            if stats is None:
+                # decide text vs pdf once the magic bytes are in
+                head += chunk
+                if len(head) < len(PDF_MAGIC) and not content_type:
+                    continue
+                stats = UploadStats(kind=_upload_kind(content_type, head))
+                chunk, head = head, b""
+            _check_size(stats, len(chunk))
+            if stats.kind == "pdf":
+                spool.write(chunk)
+            else:
+                extractor.update(decoder.decode(chunk))
+
+        if stats is None:
+            if not head:
+                raise UploadError("Empty upload")
+            stats = UploadStats(kind=_upload_kind(content_type, head))
+            _check_size(stats, len(head))
+            extractor.update(decoder.decode(head))
+
+        if stats.kind == "pdf":
+            spool.flush()
+            await run_in_threadpool(_extract_pdf_pages, spool.name, extractor, stats, mode)
+        else:
+            extractor.update(decoder.decode(b"", final=True))
+    finally:
+        spool.close()
+    return stats
+
+
+def _score_streamed(
+    extractor: StreamingFeatureExtractor,
+    claimed_impact_co2_tons: Optional[float],
+    amount_issued_usd: Optional[float],
+    mode: str,
+) -> Dict[str, Any]:
+    # only the model work is admission controlled, not reading the upload
+    with admit("analyze_file", mode, uses_ml_model(mode)) as admission:
+        return admission.annotate(
+            _score_features(extractor, claimed_impact_co2_tons, amount_issued_usd, admission.mode)
+        )
+
+
+def _score_features(
+    extractor: StreamingFeatureExtractor,
+    claimed_impact_co2_tons: Optional[float],
+    amount_issued_usd: Optional[float],
+    mode: str,
+) -> Dict[str, Any]:
+    embedding = None
+    model_name = None
+    if uses_ml_model(mode):
+        embs = transparency_embeddings([extractor.head])
+        if embs is not None:
+            embedding, model_name = embs[0], encoder_name()
+
+    features = DisclosureFeatures(
+        doc_id="upload",
+        text_features=extractor.features(),
+        handcrafted=extractor.handcrafted(),
+        transparency_embedding=embedding,
+        impact_embedding=None,
+        transparency_model=model_name,
+        impact_text_model=None,
+        evidence=extractor.evidence,
+    )
+    return score_disclosure(
+        text="",
+        claimed_impact_co2_tons=claimed_impact_co2_tons,
+        amount_issued_usd=amount_issued_usd,
+        mode=mode,
+        precomputed=features,
+    )
+
+
+async def analyze_upload(
+    chunks: AsyncIterator[bytes],
+    content_type: Optional[str],
+    claimed_impact_co2_tons: Optional[float] = None,
+    amount_issued_usd: Optional[float] = None,
+    mode: str = "rule",
+) -> Dict[str, Any]:
+    """score an uploaded disclosure read from `chunks` (the raw request body)."""
+    extractor = StreamingFeatureExtractor(head_chars=ENCODER_HEAD_CHARS, evidence=Evidence())
+    stats = await stream_features(chunks, content_type, extractor, mode)
+    if extractor.length_chars == 0:
+        raise UploadError("No text could be extracted from the upload", status_code=422)
+
+    result = await run_in_threadpool(
+        _score_streamed, extractor, claimed_impact_co2_tons, amount_issued_usd, mode
+    )
+    result["upload"] = {
+        "kind": stats.kind,
+        "bytes": stats.bytes,
+        "pages": stats.pages,
+        "failed_pages": stats.failed_pages,
+        "timed_out_pages": stats.timed_out_pages,
+        "chars": extractor.length_chars,
+    }
+    return result
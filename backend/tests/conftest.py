@@ -0,0 +1,8 @@
+# backend/tests/conftest.py
+# make `app` importable when pytest is run from the repo root or backend/
+import sys
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
@@ -0,0 +1,51 @@
+# backend/tests/test_build_bonds_unified.py
+# streaming and parallel builds of bonds.csv must match the batch build byte
+# for byte (same rows, same order, same formatting)
+import filecmp
+from pathlib import Path
+
+import pytest
+
+from app.scripts.build_bonds_unified import build_batch, build_streaming
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "app" / "data"
+
+# the bundled inputs, as in the script's usage example
+SOURCES = [
+    ("world_bank", DATA_DIR / "green_bonds_since_2008_11-28-2025.csv"),
+    ("kapsarc", DATA_DIR / "green-bond-issuances.csv"),
+    ("cbi", DATA_DIR / "bonds_export.csv"),
+    ("kaggle", DATA_DIR / "Global_Sustainable_Bonds_Data.csv"),
+]
+
+# small enough that every source is read in several chunks / split parts
+CHUNKSIZE = 200
+SPLIT_MB = 0.01
+
+
+@pytest.fixture(scope="module")
+def sources():
+    missing = [str(p) for _, p in SOURCES if not p.exists()]
+    if missing:
+        pytest.skip(f"bundled sources missing: {missing}")
+    return SOURCES
+
+
+@pytest.fixture(scope="module")
+def batch_csv(sources, tmp_path_factory):
+    out = tmp_path_factory.mktemp("batch") / "bonds.csv"
+    build_batch(sources, out)
+    return out
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_stream_matches_batch(sources, batch_csv, tmp_path, jobs):
+    out = tmp_path / "bonds.csv"
+    build_streaming(sources, out, chunksize=CHUNKSIZE, jobs=jobs)
+    assert filecmp.cmp(batch_csv, out, shallow=False)
+
+
+def test_parallel_split_batch_matches_batch(sources, batch_csv, tmp_path):
+    out = tmp_path / "bonds.csv"
+    build_batch(sources, out, jobs=2, chunksize=CHUNKSIZE, split_mb=SPLIT_MB)
+    assert filecmp.cmp(batch_csv, out, shallow=False)